@@ -0,0 +1,118 @@
+"""
+Refresh time of every analog point with several ADS1115 chips: sequential
+single-shot reads (one chip and one input after the other, as AnalogIn does)
+versus one Ads1115_AI acquisition thread per chip in continuous mode.
+
+The chips are SimAds1115 registers. Each register transaction holds its bus for
+`--transaction` microseconds (~100 us for a 3-byte transfer at 400 kHz), so chips
+on the same bus serialize their transactions but not their conversions.
+
+Run from the project root:
+    python -m benchmarks.ads1115_parallel_benchmark [--chips N] [--buses N] [--data-rate SPS] [--duration S]
+"""
+import argparse
+import importlib
+
+from services.io.modules.ads1x.ads1115_ai import Ads1115_AI
+from services.io.modules.ads1x.ads1115_channel_config import Ads1115ChannelConfig
+from services.io.modules.ads1x.ads1115_constants import (
+    REG_CONFIG, REG_CONVERSION, CONFIG_OS_SINGLE, CONFIG_MUX_SINGLE_ENDED, CONFIG_MUX_OFFSET, CONFIG_MODE_SINGLE,
+)
+from services.io.modules.ads1x.ads1115_registers_protocol import Ads1115RegistersProtocol
+from services.io.modules.sim.hydraulic_model import HydraulicModel
+from services.io.modules.sim.sim_ads1115 import SimAds1115
+
+try:
+    from eventlet.patcher import original as _original
+except ImportError:
+    _original = importlib.import_module
+
+_threading = _original("threading")
+_time = _original("time")
+
+
+class TimedBusRegisters(Ads1115RegistersProtocol):
+    """Registers whose transactions hold a shared bus lock for a fixed time."""
+    def __init__(self, registers: Ads1115RegistersProtocol, bus_lock, transaction_time: float):
+        self.__registers = registers
+        self.__bus_lock = bus_lock
+        self.__transaction_time = transaction_time
+
+    def write_register(self, register: int, value: int) -> None:
+        with self.__bus_lock:
+            _time.sleep(self.__transaction_time)
+            self.__registers.write_register(register, value)
+
+    def read_register(self, register: int) -> int:
+        with self.__bus_lock:
+            _time.sleep(self.__transaction_time)
+            return self.__registers.read_register(register)
+
+
+def _chips(args: argparse.Namespace, model: HydraulicModel) -> list[TimedBusRegisters]:
+    bus_locks = [_threading.Lock() for _ in range(args.buses)]
+    return [
+        TimedBusRegisters(SimAds1115(model, pressure_input=0 if chip == 0 else None), bus_locks[chip % args.buses], args.transaction / 1e6)
+        for chip in range(args.chips)
+    ]
+
+
+def _sequential(chips: list[TimedBusRegisters], data_rate: int, duration: float) -> float:
+    """Seconds to refresh every point with single-shot reads."""
+    conversion = 1.0 / data_rate * 1.1
+    refreshes = 0
+    start = _time.perf_counter()
+    while _time.perf_counter() - start < duration:
+        for registers in chips:
+            for pos in range(4):
+                registers.write_register(REG_CONFIG, CONFIG_OS_SINGLE | CONFIG_MUX_SINGLE_ENDED | (pos << CONFIG_MUX_OFFSET) | CONFIG_MODE_SINGLE)
+                _time.sleep(conversion)
+                registers.read_register(REG_CONVERSION)
+        refreshes += 1
+    return (_time.perf_counter() - start) / refreshes
+
+
+def _parallel(chips: list[TimedBusRegisters], data_rate: int, duration: float) -> tuple[float, float]:
+    """Seconds between two samples of the slowest point, and samples/s of all chips."""
+    channels = {pos: Ads1115ChannelConfig(data_rate=data_rate) for pos in range(4)}
+    modules = [Ads1115_AI(channels=channels, address=0x48 + index % 4, bus=index, registers=registers) for index, registers in enumerate(chips)]
+    for module in modules:
+        module.initialize()
+    # Drop what was acquired while starting
+    for module in modules:
+        module.get_all_samples()
+    # Collected like the IO scan does, well before the ring buffers wrap
+    per_point = [0] * (4 * len(modules))
+    deadline = _time.perf_counter() + duration
+    while _time.perf_counter() < deadline:
+        _time.sleep(0.05)
+        batches = [samples for module in modules for samples in module.get_all_samples()]
+        per_point = [count + len(samples) for count, samples in zip(per_point, batches)]
+    total = sum(module.samples_per_second for module in modules)
+    for module in modules:
+        module.cleanup()
+    return duration / min(per_point), total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chips", type=int, default=4)
+    parser.add_argument("--buses", type=int, default=1, help="chips are spread round-robin over this many buses")
+    parser.add_argument("--data-rate", type=int, default=860)
+    parser.add_argument("--transaction", type=float, default=100.0, help="bus time of one register transaction in microseconds")
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    model = HydraulicModel()
+    sequential = _sequential(_chips(args, model), args.data_rate, args.duration)
+    parallel, samples_per_second = _parallel(_chips(args, model), args.data_rate, args.duration)
+
+    print(f"{args.chips} chips x 4 inputs on {args.buses} bus(es), {args.data_rate} SPS")
+    print(f"{'':24}{'refresh ms':>12}")
+    print(f"{'sequential single-shot':24}{sequential * 1000:12.1f}")
+    print(f"{'parallel continuous':24}{parallel * 1000:12.1f}   ({samples_per_second:.0f} samples/s)")
+    print(f"speed-up               : {sequential / parallel:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Cost of delivering an event to a coroutine subscriber: asyncio.run per call (a new
+event loop each time) versus scheduling on the dispatcher's long-lived AsyncLoop.
+
+Run from the project root:
+    python -m benchmarks.async_subscriber_benchmark [--events N]
+"""
+import argparse
+import asyncio
+import time
+
+from core.dispatcher.async_loop import AsyncLoop
+
+
+async def _subscriber(done: list[int], value: int) -> None:
+    await asyncio.sleep(0)
+    done.append(value)
+
+
+def _asyncio_run(events: int) -> float:
+    done: list[int] = []
+    start = time.perf_counter()
+    for value in range(events):
+        asyncio.run(_subscriber(done, value))
+    return (time.perf_counter() - start) / events
+
+
+def _async_loop(events: int) -> tuple[float, float]:
+    """(time to schedule, time until all completed) per event."""
+    loop = AsyncLoop()
+    loop.start()
+    done: list[int] = []
+    start = time.perf_counter()
+    futures = [loop.submit(_subscriber(done, value)) for value in range(events)]
+    scheduled = time.perf_counter()
+    for future in futures:
+        future.result()
+    completed = time.perf_counter()
+    loop.stop()
+    return (scheduled - start) / events, (completed - start) / events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+
+    per_run = _asyncio_run(args.events)
+    per_submit, per_event = _async_loop(args.events)
+
+    print(f"{args.events} coroutine deliveries")
+    print(f"{'':28}{'us/event':>10}")
+    print(f"{'asyncio.run per event':28}{per_run * 1e6:10.1f}")
+    print(f"{'AsyncLoop.submit':28}{per_submit * 1e6:10.1f}")
+    print(f"{'AsyncLoop until completed':28}{per_event * 1e6:10.1f}")
+    print(f"speed-up                    : {per_run / per_event:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
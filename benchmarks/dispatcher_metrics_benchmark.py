@@ -0,0 +1,80 @@
+"""
+Cost of DispatcherMetrics on EventDispatcher.emit(): the same DI events delivered
+to keyed subscribers without metrics, with metrics disabled and with metrics on.
+
+Each subscriber busy-waits `--work` microseconds. In the simulated station the
+contactor and sensor handlers take about 20 us and the station update handler
+about 350 us, so the default is the cheapest real callback; --work 0 gives the
+cost of the metrics against an empty callback.
+
+Run from the project root:
+    python -m benchmarks.dispatcher_metrics_benchmark [--work US] [--points N] [--subscribers N] [--events N]
+"""
+import argparse
+import time
+
+from core.dispatcher.dispatcher_metrics import DispatcherMetrics
+from core.dispatcher.event_dispatcher import EventDispatcher
+from services.io.events.di_event import DIEvent
+
+
+class _Device:
+    def __init__(self, device_id: int, work: float):
+        self.device_name = f"device_{device_id}"
+        self.running = False
+        self.__work = work
+
+    def handle_di_change(self, event: DIEvent):
+        end = time.perf_counter() + self.__work
+        while time.perf_counter() < end:
+            pass
+        self.running = bool(event.value_new)
+
+
+def _dispatcher(metrics, points: int, subscribers: int, work: float) -> EventDispatcher:
+    dispatcher = EventDispatcher(thread_manager=None, metrics=metrics)
+    for device_id in range(subscribers):
+        dispatcher.subscribe(DIEvent, _Device(device_id, work).handle_di_change, key=device_id % points)
+    return dispatcher
+
+
+def _run(dispatcher: EventDispatcher, events: list[DIEvent]) -> float:
+    start = time.perf_counter()
+    for event in events:
+        dispatcher.emit(event)
+    return (time.perf_counter() - start) / len(events)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=16)
+    parser.add_argument("--subscribers", type=int, default=32)
+    parser.add_argument("--work", type=float, default=20.0, help="microseconds spent in each callback")
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    events = [DIEvent(io_id=i % args.points, value_old=bool(i % 2), value_new=not (i % 2)) for i in range(args.events)]
+    disabled = DispatcherMetrics()
+    disabled.enabled = False
+    cases = [
+        ("no metrics", _dispatcher(None, args.points, args.subscribers, args.work / 1e6)),
+        ("metrics disabled", _dispatcher(disabled, args.points, args.subscribers, args.work / 1e6)),
+        ("metrics enabled", _dispatcher(DispatcherMetrics(), args.points, args.subscribers, args.work / 1e6)),
+    ]
+
+    # Best of several rounds, interleaved so they see the same machine state
+    results = {name: float("inf") for name, _ in cases}
+    for _ in range(args.rounds):
+        for name, dispatcher in cases:
+            results[name] = min(results[name], _run(dispatcher, events))
+
+    base = results["no metrics"]
+    print(f"{args.events} DI events, {args.subscribers} subscribers on {args.points} points, {args.work:g} us per callback")
+    print(f"{'':20}{'us/emit':>10}{'overhead':>10}")
+    for name, _ in cases:
+        print(f"{name:20}{results[name] * 1e6:10.2f}{(results[name] / base - 1) * 100:9.1f}%")
+
+
+if __name__ == "__main__":
+    main()
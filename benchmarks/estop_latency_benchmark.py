@@ -0,0 +1,137 @@
+"""
+E-stop edge to contactor output latency on the simulated station, under dispatcher
+load, with the safety lane (synchronous delivery on the edge thread) and without it
+(edge queue, then the dispatcher's worker pool).
+
+The station is built as main.py --sim builds it, in a temporary directory. While
+it runs, bursts of load events keep every dispatcher lane busy with subscribers that
+sleep and serialize like a station update. Each trial presses the e-stop, records
+when the last contactor output was written, then releases it.
+
+Exits with status 1 if the p99 with the safety lane exceeds --budget-ms.
+
+Run from the project root:
+    python -m benchmarks.estop_latency_benchmark [--trials N] [--budget-ms MS] [--load N]
+"""
+import eventlet
+eventlet.monkey_patch()
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import tempfile
+import time
+
+import di_config
+from core.di.di_container import container
+from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
+from device.system.system_mode import ESystemMode
+from services.io.io_service_protocol import IOServiceProtocol
+from services.io.safety_latency import SafetyLatency
+
+
+@dataclasses.dataclass
+class LoadEvent:
+    seq: int
+
+    @property
+    def routing_key(self) -> int:
+        return self.seq
+
+
+def _load_subscriber(event: LoadEvent) -> None:
+    time.sleep(0.002)
+    json.dumps({"seq": event.seq, "values": list(range(200))})
+
+
+def _trials(io_service: IOServiceProtocol, dispatcher: EventDispatcherProtocol, trials: int, load: int, settle: float) -> list[float]:
+    estop = io_service.registry.find("station.estop")
+    di_module = estop.module
+    do_module = io_service.registry.points("do")[0].module
+
+    # Timestamp of the last output write, taken inside the DO module
+    last_write = [0.0]
+    set_values = do_module.set_values
+
+    def timed_set_values(values):
+        set_values(values)
+        last_write[0] = time.perf_counter()
+
+    do_module.set_values = timed_set_values
+
+    latencies = []
+    seq = 0
+    for _ in range(trials):
+        for _ in range(load):
+            seq += 1
+            dispatcher.emit_async(LoadEvent(seq))
+        eventlet.sleep(0.005)
+
+        pressed_at = time.perf_counter()
+        last_write[0] = 0.0
+        di_module.set_input("station.estop", True)
+        eventlet.sleep(settle)
+        if last_write[0] >= pressed_at:
+            latencies.append(last_write[0] - pressed_at)
+
+        di_module.set_input("station.estop", False)
+        eventlet.sleep(settle)
+
+    do_module.set_values = set_values
+    return latencies
+
+
+def _summary(latencies: list[float]) -> tuple[float, float, float]:
+    samples = sorted(latency * 1000.0 for latency in latencies)
+    return SafetyLatency.percentile(samples, 50.0), SafetyLatency.percentile(samples, 99.0), max(samples, default=0.0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trials", type=int, default=100)
+    parser.add_argument("--load", type=int, default=40, help="load events emitted before each trial")
+    parser.add_argument("--settle", type=float, default=0.1, help="seconds to wait after each press and release")
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="p99 budget of the safety lane")
+    args = parser.parse_args()
+
+    # The station writes its settings, run times and SOE files to the working directory
+    os.chdir(tempfile.mkdtemp(prefix="pdws-estop-"))
+    station = di_config.create_di(simulated=True)
+    station.start()
+    eventlet.sleep(1.0)
+    for system in station.systems:
+        station.set_system_mode(system.device_id, ESystemMode.AUTO)
+    eventlet.sleep(2.0)
+
+    io_service = container.resolve(IOServiceProtocol)
+    dispatcher = container.resolve(EventDispatcherProtocol)
+    dispatcher.subscribe(LoadEvent, _load_subscriber)
+    estop = io_service.registry.find("station.estop")
+
+    io_service.set_safety(estop.kind, estop.pos, False)
+    queued = _trials(io_service, dispatcher, args.trials, args.load, args.settle)
+    io_service.set_safety(estop.kind, estop.pos, True)
+    safety = _trials(io_service, dispatcher, args.trials, args.load, args.settle)
+    stats = io_service.get_safety_stats()
+
+    station.stop()
+    dispatcher.stop()
+
+    print(f"{args.trials} e-stops, {args.load} load events before each")
+    print(f"{'':26}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, latencies in (("edge queue + pool", queued), ("safety lane", safety)):
+        p50, p99, worst = _summary(latencies)
+        print(f"{name:26}{p50:10.3f}{p99:10.3f}{worst:10.3f}   ({len(latencies)} samples)")
+    print(f"{'IOService safety stats':26}{stats.p50_ms:10.3f}{stats.p99_ms:10.3f}{stats.max_ms:10.3f}   ({stats.samples} samples)")
+
+    _, p99, _ = _summary(safety)
+    if p99 > args.budget_ms:
+        print(f"FAIL: safety lane p99 {p99:.3f} ms over the {args.budget_ms:g} ms budget")
+        sys.exit(1)
+    print(f"OK: safety lane p99 {p99:.3f} ms within the {args.budget_ms:g} ms budget")
+
+
+if __name__ == "__main__":
+    main()
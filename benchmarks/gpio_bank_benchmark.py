@@ -0,0 +1,97 @@
+"""
+pigpio round trips per scan of GPIO_DI/GPIO_DO: per-pin read()/write() versus
+one read_bank_1() and grouped set_bank_1()/clear_bank_1().
+
+The stub pi counts calls and sleeps `--latency` microseconds per call to stand in
+for the socket round trip to the pigpio daemon (~50-150 us on a Pi 4).
+
+Run from the project root:
+    python -m benchmarks.gpio_bank_benchmark [--scans N] [--latency US]
+"""
+import argparse
+import time
+
+from services.io.modules.gpio.gpio_di import GPIO_DI
+from services.io.modules.gpio.gpio_do import GPIO_DO
+
+
+class StubPi:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.levels = 0
+
+    def __round_trip(self) -> None:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def read(self, gpio: int) -> int:
+        self.__round_trip()
+        return (self.levels >> gpio) & 1
+
+    def write(self, gpio: int, level: int) -> None:
+        self.__round_trip()
+        if level:
+            self.levels |= 1 << gpio
+        else:
+            self.levels &= ~(1 << gpio)
+
+    def read_bank_1(self) -> int:
+        self.__round_trip()
+        return self.levels
+
+    def set_bank_1(self, bits: int) -> None:
+        self.__round_trip()
+        self.levels |= bits
+
+    def clear_bank_1(self, bits: int) -> None:
+        self.__round_trip()
+        self.levels &= ~bits
+
+
+def _per_pin_scan(pi: StubPi, di_map: dict[int, int], do_map: dict[int, int], outputs: dict[int, bool]) -> None:
+    # What the modules did before: one read()/write() per mapped pin
+    [not bool(pi.read(gpio)) for gpio in di_map]
+    [bool(pi.read(gpio)) for gpio in do_map]
+    for gpio, pos in do_map.items():
+        pi.write(gpio, outputs[pos])
+
+
+def _bank_scan(di: GPIO_DI, do: GPIO_DO, outputs: dict[int, bool]) -> None:
+    di.get_all_values()
+    do.get_all_values()
+    do.set_values(outputs)
+
+
+def _run(scan, pi: StubPi, scans: int) -> tuple[float, float]:
+    pi.calls = 0
+    start = time.perf_counter()
+    for i in range(scans):
+        scan(i)
+    elapsed = time.perf_counter() - start
+    return pi.calls / scans, elapsed / scans * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scans", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=100.0, help="simulated round trip in microseconds")
+    args = parser.parse_args()
+
+    pi = StubPi(args.latency / 1e6)
+    di = GPIO_DI(pi)
+    do = GPIO_DO(pi)
+    outputs = [{pos: bool((i >> pos) & 1) for pos in do.dio_map.values()} for i in range(8)]
+
+    per_pin = _run(lambda i: _per_pin_scan(pi, di.dio_map, do.dio_map, outputs[i % 8]), pi, args.scans)
+    bank = _run(lambda i: _bank_scan(di, do, outputs[i % 8]), pi, args.scans)
+
+    print(f"{'':18}{'calls/scan':>12}{'us/scan':>12}")
+    print(f"{'per pin':18}{per_pin[0]:12.1f}{per_pin[1]:12.1f}")
+    print(f"{'bank':18}{bank[0]:12.1f}{bank[1]:12.1f}")
+    print(f"round trips saved : {per_pin[0] / bank[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Reads per second of KVConfig with and without the in-memory snapshot.
+
+Run from the project root:
+    python -m benchmarks.kv_config_benchmark [--reads N]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from common.kv_config import KVConfig
+
+SECTIONS = ("app", "contactor_1", "contactor_2", "contactor_3", "sensor_1")
+
+
+def _populate(path: Path) -> None:
+    for section in SECTIONS:
+        config = KVConfig(section=section, path=path)
+        for i in range(20):
+            config.set(f"key_{i}", i * 1.5)
+
+
+def _reads_per_second(path: Path, cache: bool, reads: int) -> float:
+    config = KVConfig(section="app", path=path, cache=cache)
+    start = time.perf_counter()
+    for i in range(reads):
+        config.get_float(f"key_{i % 20}", 0.0)
+    return reads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reads", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "settings.ini"
+        _populate(path)
+
+        uncached = _reads_per_second(path, cache=False, reads=args.reads)
+        cached = _reads_per_second(path, cache=True, reads=args.reads)
+
+    print(f"re-parse per read : {uncached:12,.0f} reads/s")
+    print(f"snapshot cache    : {cached:12,.0f} reads/s")
+    print(f"speed-up          : {cached / uncached:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,25 +2,42 @@ import configparser
 import os
 import tempfile
 import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Optional, Mapping, Iterator, Callable, Any
 
 from filelock import FileLock, Timeout  # pip install filelock
 
-class KVConfig:
+from common.storage.kv_store_protocol import KVStoreProtocol
+
+# (inode, size, mtime_ns) of the backing file, None when it does not exist
+StatSignature = Optional[tuple[int, int, int]]
+
+class KVConfig(KVStoreProtocol):
     """
     Thread-safe and process-safe key/value config backed by an INI file.
 
     - Namespaces via INI sections (default: "app").
     - Atomic writes to avoid corruption.
     - File-level lock to coordinate across processes.
+    - Reads are served from an in-memory snapshot that is only re-parsed when the
+      file's stat signature (inode, size, mtime) changes, e.g. after another process
+      replaced it. Pass cache=False to re-parse on every read.
+    - fsync runs through `run_blocking` when given (e.g. ThreadManager.run_blocking),
+      so a slow SD card does not stall the event loop.
     """
-    def __init__(self, section: str, path: str | os.PathLike = "settings.ini", lock_timeout: float = 5.0):
+    def __init__(self, section: str, path: str | os.PathLike = "settings.ini", lock_timeout: float = 5.0, cache: bool = True, run_blocking: Optional[Callable[..., Any]] = None):
         self.path = Path(path)
         self.section = section
         self._mem = configparser.ConfigParser()
         self._lock = threading.RLock()
         self._filelock = FileLock(str(self.path) + ".lock")
         self._lock_timeout = lock_timeout
+        self._cache = cache
+        self._signature: StatSignature = None
+        self._txn_depth = 0
+        self._txn_dirty = False
+        self._run_blocking = run_blocking
 
         # Ensure file exists with the section
         if not self.path.exists():
@@ -32,8 +49,8 @@ class KVConfig:
     # ---------- public API ----------
 
     def get(self, key: str, fallback: str | None = None) -> str | None:
-        with self._lock, self._acquire_filelock():
-            self._load()
+        with self._lock:
+            self._refresh()
             sect = self._mem[self.section] if self._mem.has_section(self.section) else {}
             return sect.get(key, fallback)
 
@@ -56,8 +73,8 @@ class KVConfig:
             return fallback
 
     def get_bool(self, key: str, fallback: bool | None = None) -> bool | None:
-        with self._lock, self._acquire_filelock():
-            self._load()
+        with self._lock:
+            self._refresh()
             try:
                 return self._mem.getboolean(self.section, key, fallback=fallback)
             except (ValueError, configparser.NoOptionError, configparser.NoSectionError):
@@ -66,44 +83,123 @@ class KVConfig:
     def set(self, key: str, value: str | int | float | bool | None) -> None:
         """
         Sets a value and persists immediately (atomic write).
+        Inside a transaction() the write is deferred until the transaction commits.
         """
         if value is None:
             self.delete(key)
-        with self._lock, self._acquire_filelock():
-            self._load()
-            if self.section not in self._mem:
-                self._mem[self.section] = {}
+            return
+        with self.transaction():
             self._mem[self.section][key] = str(value)
-            self._atomic_write()
+            self._txn_dirty = True
+
+    def set_many(self, values: Mapping[str, str | int | float | bool | None]) -> None:
+        """
+        Sets several values with a single atomic write. None values delete the key.
+        """
+        with self.transaction():
+            for key, value in values.items():
+                if value is None:
+                    self.delete(key)
+                else:
+                    self._mem[self.section][key] = str(value)
+                    self._txn_dirty = True
 
     def delete(self, key: str) -> bool:
         """
         Removes a key. Returns True if it existed.
         """
-        with self._lock, self._acquire_filelock():
-            self._load()
-            if self.section in self._mem and key in self._mem[self.section]:
+        with self.transaction():
+            if key in self._mem[self.section]:
                 del self._mem[self.section][key]
-                self._atomic_write()
+                self._txn_dirty = True
                 return True
             return False
 
+    @contextmanager
+    def transaction(self) -> Iterator["KVConfig"]:
+        """
+        Groups set/set_many/delete calls into one atomic write and fsync.
+
+        Holds the thread and file locks for the whole block, so other writers wait
+        instead of interleaving. If the block raises, pending changes are discarded
+        and the snapshot is reloaded from disk. Transactions may be nested; only the
+        outermost one writes.
+        """
+        with self._lock, self._acquire_filelock():
+            if self._txn_depth == 0:
+                if self._is_stale():
+                    self._load()
+                self._txn_dirty = False
+            self._txn_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._txn_depth == 1:
+                    self._txn_dirty = False
+                    self._load()
+                raise
+            else:
+                if self._txn_depth == 1 and self._txn_dirty:
+                    self._atomic_write()
+                    self._txn_dirty = False
+            finally:
+                self._txn_depth -= 1
+
     def items(self) -> dict[str, str]:
         """
         Snapshot of all key/values in the section.
         """
-        with self._lock, self._acquire_filelock():
-            self._load()
+        with self._lock:
+            self._refresh()
             return dict(self._mem[self.section]) if self.section in self._mem else {}
 
+    def reload_if_changed(self) -> list[str]:
+        """
+        Re-parses the file if it changed on disk and returns the sections whose
+        contents differ from the previous snapshot (any section of the file, not
+        only this instance's).
+        """
+        with self._lock:
+            if self._txn_depth > 0 or not self._is_stale():
+                return []
+            before = {name: dict(self._mem[name]) for name in self._mem.sections()}
+            with self._acquire_filelock():
+                self._load()
+            after = {name: dict(self._mem[name]) for name in self._mem.sections()}
+            return sorted(name for name in before.keys() | after.keys() if before.get(name, {}) != after.get(name, {}))
+
     # ---------- internals ----------
 
+    def _stat_signature(self) -> StatSignature:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def _refresh(self) -> None:
+        """
+        Re-parses the file only if it changed on disk since the last load/write.
+        Writers always replace the file, so a new inode/mtime is a reliable change marker.
+        """
+        if self._txn_depth > 0:
+            return  # serve the transaction's own pending view
+        if not self._is_stale():
+            return
+        with self._acquire_filelock():
+            self._load()
+
+    def _is_stale(self) -> bool:
+        return not self._cache or self._signature is None or self._stat_signature() != self._signature
+
     def _load(self) -> None:
+        signature = self._stat_signature()
         self._mem.clear()
         # configparser can read empty file gracefully
         self._mem.read(self.path, encoding="utf-8")
         if self.section not in self._mem:
             self._mem[self.section] = {}
+        self._signature = signature
 
     def _atomic_write(self) -> None:
         tmp_dir = self.path.parent
@@ -112,9 +208,10 @@ class KVConfig:
             with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
                 self._mem.write(f)
                 f.flush()
-                os.fsync(f.fileno())  # ensure bytes hit disk
+                self._fsync(f.fileno())  # ensure bytes hit disk
             # Atomic replace on all major OSes (Windows 10+, Linux, macOS)
             os.replace(tmp_name, self.path)
+            self._signature = self._stat_signature()
         finally:
             # If os.replace raised, try to clean up tmp file
             try:
@@ -123,7 +220,12 @@ class KVConfig:
             except OSError:
                 pass
 
-    from contextlib import contextmanager
+    def _fsync(self, fd: int) -> None:
+        if self._run_blocking is None:
+            os.fsync(fd)
+        else:
+            self._run_blocking(os.fsync, fd)
+
     @contextmanager
     def _acquire_filelock(self):
         try:
@@ -0,0 +1,61 @@
+from array import array
+from typing import Optional
+
+
+class RingBuffer:
+    """
+    Fixed-size buffer of the last `capacity` integer samples.
+
+    Storage is allocated once; append() overwrites the oldest sample and never
+    allocates. A single writer and any number of readers may use it without a lock:
+    readers see either the previous or the new latest sample.
+    """
+    def __init__(self, capacity: int, typecode: str = "l"):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.__data = array(typecode, [0]) * capacity
+        self.__capacity = capacity
+        # Total number of samples ever appended; the next slot is count % capacity
+        self.__count = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def count(self) -> int:
+        """Samples appended since creation (keeps growing after the buffer wrapped)."""
+        return self.__count
+
+    def __len__(self) -> int:
+        return min(self.__count, self.__capacity)
+
+    def append(self, value: int) -> None:
+        self.__data[self.__count % self.__capacity] = value
+        self.__count += 1
+
+    def latest(self) -> Optional[int]:
+        count = self.__count
+        if count == 0:
+            return None
+        return self.__data[(count - 1) % self.__capacity]
+
+    def values(self, n: Optional[int] = None) -> list[int]:
+        """The last n samples (default: all held), oldest first."""
+        count = self.__count
+        size = min(count, self.__capacity)
+        n = size if n is None else min(n, size)
+        start = count - n
+        return [self.__data[i % self.__capacity] for i in range(start, count)]
+
+    def values_since(self, count: int) -> tuple[list[int], int]:
+        """
+        Samples appended after the buffer had `count` samples (as far as they are
+        still held), oldest first, and the current count to pass next time.
+        """
+        current = self.__count
+        start = max(count, current - self.__capacity)
+        return [self.__data[i % self.__capacity] for i in range(start, current)], current
+
+    def clear(self) -> None:
+        self.__count = 0
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class SettingsChangedEvent:
+    """A settings section was changed by another process."""
+    section: str
+
+    @property
+    def routing_key(self) -> str:
+        return self.section
@@ -0,0 +1,44 @@
+import configparser
+import os
+from pathlib import Path
+from typing import Optional, Callable, Any
+
+from common.kv_config import KVConfig
+from common.storage.kv_backend_protocol import KVBackendProtocol
+from common.storage.kv_store_protocol import KVStoreProtocol
+from common.storage.watchable_protocol import WatchableProtocol
+
+
+class IniKVBackend(KVBackendProtocol, WatchableProtocol):
+    """
+    Legacy layout: every section lives in the same settings.ini.
+    Any write rewrites the whole file, including the other sections.
+    """
+    def __init__(self, path: str | os.PathLike = "settings.ini", run_blocking: Optional[Callable[..., Any]] = None):
+        self.__path = Path(path)
+        self.__run_blocking = run_blocking
+        self.__stores: dict[str, KVConfig] = {}
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    def get_store(self, section: str) -> KVStoreProtocol:
+        if section not in self.__stores:
+            self.__stores[section] = KVConfig(section=section, path=self.__path, run_blocking=self.__run_blocking)
+        return self.__stores[section]
+
+    def sections(self) -> list[str]:
+        parser = configparser.ConfigParser()
+        parser.read(self.__path, encoding="utf-8")
+        return parser.sections()
+
+    def watch_paths(self) -> list[Path]:
+        return [self.__path]
+
+    def refresh(self) -> list[str]:
+        # Each store keeps its own copy of the file; only its own section is authoritative
+        return sorted(section for section, store in list(self.__stores.items()) if section in store.reload_if_changed())
+
+    def close(self) -> None:
+        self.__stores.clear()
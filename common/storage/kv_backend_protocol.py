@@ -0,0 +1,14 @@
+from typing import Protocol, runtime_checkable
+
+from common.storage.kv_store_protocol import KVStoreProtocol
+
+
+@runtime_checkable
+class KVBackendProtocol(Protocol):
+    """Creates and owns the per-section stores of one storage medium."""
+
+    def get_store(self, section: str) -> KVStoreProtocol: ...
+
+    def sections(self) -> list[str]: ...
+
+    def close(self) -> None: ...
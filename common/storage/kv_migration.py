@@ -0,0 +1,45 @@
+import configparser
+import os
+import time
+from pathlib import Path
+
+from common.storage.kv_backend_protocol import KVBackendProtocol
+
+# Section of the target that records which sources were migrated, and when
+MIGRATION_SECTION = "kv_migration"
+
+
+def migrate_ini(source: str | os.PathLike, target: KVBackendProtocol, overwrite: bool = False) -> list[str]:
+    """
+    Copies every section of a legacy settings.ini into target, one transaction per section.
+
+    The migration runs once per source: target records it in MIGRATION_SECTION and
+    later calls return [] without reading the file, unless overwrite is True.
+    Sections that already exist in target are left alone unless overwrite is True.
+    The source file is not modified.
+
+    Returns:
+        The names of the migrated sections.
+    """
+    path = Path(source)
+    if not path.exists():
+        return []
+    journal = target.get_store(MIGRATION_SECTION)
+    if not overwrite and journal.get(path.name) is not None:
+        return []
+
+    parser = configparser.ConfigParser()
+    parser.read(path, encoding="utf-8")
+
+    existing = set(target.sections())
+    migrated: list[str] = []
+    for section in parser.sections():
+        if section in existing and not overwrite:
+            continue
+        target.get_store(section).set_many(dict(parser[section]))
+        migrated.append(section)
+
+    journal.set(path.name, f"{time.time():.0f}")
+    if migrated:
+        print(f"[KV] Migrated sections {migrated} from {path}")
+    return migrated
@@ -0,0 +1,28 @@
+from typing import Protocol, Mapping, ContextManager, runtime_checkable
+
+KVValue = str | int | float | bool | None
+
+
+@runtime_checkable
+class KVStoreProtocol(Protocol):
+    """Key/value settings of one section (device, "app", ...)."""
+
+    section: str
+
+    def get(self, key: str, fallback: str | None = None) -> str | None: ...
+
+    def get_int(self, key: str, fallback: int | None = None) -> int | None: ...
+
+    def get_float(self, key: str, fallback: float | None = None) -> float | None: ...
+
+    def get_bool(self, key: str, fallback: bool | None = None) -> bool | None: ...
+
+    def set(self, key: str, value: KVValue) -> None: ...
+
+    def set_many(self, values: Mapping[str, KVValue]) -> None: ...
+
+    def delete(self, key: str) -> bool: ...
+
+    def items(self) -> dict[str, str]: ...
+
+    def transaction(self) -> ContextManager["KVStoreProtocol"]: ...
@@ -0,0 +1,165 @@
+import dataclasses
+import threading
+import time
+from typing import Mapping, Optional
+
+from common.storage.kv_store_protocol import KVStoreProtocol, KVValue
+from core.thread_manager_protocol import ThreadManagerProtocol
+
+
+@dataclasses.dataclass(frozen=True)
+class PersistenceWriterStats:
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    submitted: int = 0
+    coalesced: int = 0
+    batches: int = 0
+    failures: int = 0
+    last_write_ms: float = 0.0
+    max_write_ms: float = 0.0
+    avg_write_ms: float = 0.0
+
+
+class PersistenceWriter:
+    """
+    Writes settings in the background so callers only update memory.
+
+    submit() queues key/values for a store and returns immediately. Pending writes
+    are coalesced per (store, key): a value submitted again before it was written
+    replaces the queued one. The writer task takes everything pending at once and
+    writes it with one set_many() (one transaction) per store.
+
+    The queue is bounded by `max_pending` keys; submit() waits for the writer when it
+    is full. flush() waits until everything submitted before the call is on disk.
+    Without a started writer, submit() writes synchronously.
+    """
+    def __init__(self, thread_manager: ThreadManagerProtocol, max_pending: int = 1024, retry_delay: float = 1.0):
+        self.__thread_manager = thread_manager
+        self.__max_pending = max_pending
+        self.__retry_delay = retry_delay
+
+        self.__cond = threading.Condition()
+        self.__pending: dict[int, tuple[KVStoreProtocol, dict[str, KVValue]]] = {}
+        self.__depth = 0
+        self.__submitted_seq = 0
+        self.__written_seq = 0
+        self.__running = False
+
+        self.__stats = PersistenceWriterStats()
+        self.__write_ms_total = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.__running
+
+    @property
+    def stats(self) -> PersistenceWriterStats:
+        return self.__stats
+
+    def start(self) -> None:
+        with self.__cond:
+            if self.__running:
+                return
+            self.__running = True
+        self.__thread_manager.start_background_task(self.__worker)
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Writes what is pending and stops the writer. Returns False on timeout."""
+        flushed = self.flush(timeout)
+        with self.__cond:
+            self.__running = False
+            self.__cond.notify_all()
+        return flushed
+
+    def submit(self, store: KVStoreProtocol, values: Mapping[str, KVValue], timeout: Optional[float] = None) -> None:
+        """
+        Queues values for store. Raises TimeoutError if the queue stays full for
+        longer than timeout.
+        """
+        if not self.__running:
+            self.__write(store, dict(values))
+            return
+
+        with self.__cond:
+            if not self.__cond.wait_for(lambda: self.__depth < self.__max_pending or not self.__running, timeout):
+                raise TimeoutError(f"Persistence queue full ({self.__depth} keys pending)")
+
+            _, queued = self.__pending.setdefault(id(store), (store, {}))
+            coalesced = 0
+            for key, value in values.items():
+                if key in queued:
+                    coalesced += 1
+                queued[key] = value
+            self.__depth += len(values) - coalesced
+            self.__submitted_seq += 1
+            self.__update_stats(submitted=self.__stats.submitted + len(values), coalesced=self.__stats.coalesced + coalesced)
+            self.__cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until everything submitted so far has been written. Returns False on timeout."""
+        with self.__cond:
+            target = self.__submitted_seq
+            return self.__cond.wait_for(lambda: self.__written_seq >= target or not self.__running, timeout)
+
+    # ---------- internals ----------
+
+    def __worker(self) -> None:
+        while True:
+            with self.__cond:
+                self.__cond.wait_for(lambda: self.__pending or not self.__running)
+                if not self.__pending:
+                    return
+                batch, self.__pending, self.__depth = self.__pending, {}, 0
+                seq = self.__submitted_seq
+                # Room in the queue again
+                self.__cond.notify_all()
+
+            start = time.perf_counter()
+            failed = {}
+            for key, (store, values) in batch.items():
+                try:
+                    self.__write(store, values)
+                except Exception as e:
+                    print(f"[PersistenceWriter] Error writing section {store.section}: {e}")
+                    failed[key] = (store, values)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+            with self.__cond:
+                self.__write_ms_total += elapsed_ms
+                batches = self.__stats.batches + 1
+                self.__update_stats(
+                    batches=batches,
+                    failures=self.__stats.failures + len(failed),
+                    last_write_ms=elapsed_ms,
+                    max_write_ms=max(self.__stats.max_write_ms, elapsed_ms),
+                    avg_write_ms=self.__write_ms_total / batches,
+                )
+                if failed:
+                    self.__requeue(failed)
+                else:
+                    self.__written_seq = seq
+                self.__cond.notify_all()
+
+            if failed:
+                time.sleep(self.__retry_delay)
+
+    def __requeue(self, failed: dict[int, tuple[KVStoreProtocol, dict[str, KVValue]]]) -> None:
+        # Values submitted while the batch was being written are newer, keep them
+        for key, (store, values) in failed.items():
+            _, queued = self.__pending.setdefault(key, (store, {}))
+            for name, value in values.items():
+                if name not in queued:
+                    queued[name] = value
+                    self.__depth += 1
+
+    def __update_stats(self, **changes) -> None:
+        self.__stats = dataclasses.replace(
+            self.__stats,
+            **changes,
+            queue_depth=self.__depth,
+            max_queue_depth=max(self.__stats.max_queue_depth, self.__depth),
+        )
+
+    @staticmethod
+    def __write(store: KVStoreProtocol, values: dict[str, KVValue]) -> None:
+        store.set_many(values)
@@ -0,0 +1,164 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Optional
+
+from common.storage.events.settings_changed_event import SettingsChangedEvent
+from common.storage.watchable_protocol import WatchableProtocol
+from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
+from core.thread_manager_protocol import ThreadManagerProtocol
+
+# <linux/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class _Inotify:
+    """Minimal inotify binding through libc (no third-party dependency)."""
+    def __init__(self):
+        self.__libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.__libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, directory: Path) -> int:
+        """Returns the watch descriptor (the same one again for a directory already watched)."""
+        wd = self.__libc.inotify_add_watch(self.fd, os.fsencode(directory), _IN_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        return wd
+
+    def read_events(self) -> list[tuple[int, str]]:
+        """(watch descriptor, file name) of every pending event."""
+        events: list[tuple[int, str]] = []
+        # Polled with select: eventlet's green os.read waits instead of raising BlockingIOError
+        while select.select([self.fd], [], [], 0)[0]:
+            data = os.read(self.fd, 4096)
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                events.append((wd, data[offset:offset + length].rstrip(b"\0").decode(errors="replace")))
+                offset += length
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class SettingsWatcher:
+    """
+    Notices settings written by other processes (maintenance scripts, a second
+    instance, ...) and pushes them into the in-memory caches.
+
+    Watches the directories of the registered storages with inotify, or polls them
+    every `poll_interval` seconds when inotify is not available. In a directory
+    watched for a file path, only events of the watched file names count, so other
+    files written next to the settings (run time journal, SOE windows) do not
+    refresh every storage. On a change each
+    storage reloads what differs from its snapshot and a SettingsChangedEvent is
+    emitted for every changed section. Writes made by this process do not produce
+    events because the storages already hold them.
+    """
+    __SETTLE_DELAY = 0.1
+
+    def __init__(self, event_dispatcher: EventDispatcherProtocol, thread_manager: ThreadManagerProtocol, poll_interval: float = 2.0, use_inotify: bool = True):
+        self.__event_dispatcher = event_dispatcher
+        self.__thread_manager = thread_manager
+        self.__poll_interval = poll_interval
+        self.__use_inotify = use_inotify
+        self.__targets: list[WatchableProtocol] = []
+        self.__inotify: Optional[_Inotify] = None
+        # Watch descriptor -> file names whose events count (None: every name)
+        self.__names: dict[int, Optional[set[str]]] = {}
+        self.__running = False
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self.__inotify is not None
+
+    def watch(self, target: WatchableProtocol) -> None:
+        self.__targets.append(target)
+        if self.__inotify is not None:
+            self.__add_watches(target)
+
+    def start(self) -> None:
+        if self.__running:
+            return
+        if self.__use_inotify:
+            try:
+                self.__inotify = _Inotify()
+                for target in self.__targets:
+                    self.__add_watches(target)
+            except (OSError, AttributeError) as e:
+                print(f"[SettingsWatcher] inotify unavailable ({e}), polling every {self.__poll_interval}s")
+                self.__close_inotify()
+        self.__running = True
+        self.__thread_manager.start_background_task(self.__worker)
+
+    def stop(self) -> None:
+        self.__running = False
+
+    def check(self) -> list[str]:
+        """Refreshes every target once and emits events; returns the changed sections."""
+        changed: set[str] = set()
+        for target in list(self.__targets):
+            try:
+                changed.update(target.refresh())
+            except Exception as e:
+                print(f"[SettingsWatcher] Error refreshing {target}: {e}")
+        for section in sorted(changed):
+            self.__event_dispatcher.emit_async(SettingsChangedEvent(section=section))
+        return sorted(changed)
+
+    def __worker(self) -> None:
+        while self.__running:
+            if self.__inotify is None:
+                time.sleep(self.__poll_interval)
+                self.check()
+                continue
+
+            readable, _, _ = select.select([self.__inotify.fd], [], [], self.__poll_interval)
+            if not readable:
+                # Safety net for changes inotify cannot see (e.g. network filesystems)
+                self.check()
+                continue
+            # The first event arrives while the writer is still busy (SQLite
+            # touches the -wal file before the commit is visible): let it settle
+            time.sleep(self.__SETTLE_DELAY)
+            if any(self.__counts(wd, name) for wd, name in self.__inotify.read_events()):
+                self.check()
+        self.__close_inotify()
+
+    def __add_watches(self, target: WatchableProtocol) -> None:
+        for path in target.watch_paths():
+            is_dir = path.is_dir()
+            wd = self.__inotify.add_watch(path if is_dir else path.parent)
+            names = self.__names.get(wd, set())
+            if is_dir or names is None:
+                self.__names[wd] = None
+            else:
+                self.__names[wd] = names | {path.name}
+
+    def __counts(self, wd: int, name: str) -> bool:
+        if name.endswith(".lock"):
+            return False
+        names = self.__names.get(wd)
+        return names is None or name in names
+
+    def __close_inotify(self) -> None:
+        if self.__inotify is not None:
+            self.__inotify.close()
+            self.__inotify = None
+        self.__names.clear()
@@ -0,0 +1,44 @@
+import os
+from pathlib import Path
+from typing import Optional, Callable, Any
+
+from common.kv_config import KVConfig
+from common.storage.kv_backend_protocol import KVBackendProtocol
+from common.storage.kv_store_protocol import KVStoreProtocol
+from common.storage.watchable_protocol import WatchableProtocol
+
+
+class ShardedIniKVBackend(KVBackendProtocol, WatchableProtocol):
+    """
+    One INI file (and one lock file) per section: <directory>/<section>.ini.
+    Writes for one device never lock or rewrite another device's file.
+    """
+    SUFFIX = ".ini"
+
+    def __init__(self, directory: str | os.PathLike = "settings.d", run_blocking: Optional[Callable[..., Any]] = None):
+        self.__directory = Path(directory)
+        self.__run_blocking = run_blocking
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.__stores: dict[str, KVConfig] = {}
+
+    @property
+    def directory(self) -> Path:
+        return self.__directory
+
+    def get_store(self, section: str) -> KVStoreProtocol:
+        if section not in self.__stores:
+            self.__stores[section] = KVConfig(section=section, path=self.__directory / f"{section}{self.SUFFIX}", run_blocking=self.__run_blocking)
+        return self.__stores[section]
+
+    def sections(self) -> list[str]:
+        return sorted(p.stem for p in self.__directory.glob(f"*{self.SUFFIX}"))
+
+    def watch_paths(self) -> list[Path]:
+        return [self.__directory]
+
+    def refresh(self) -> list[str]:
+        # Each file holds exactly one section
+        return sorted(section for section, store in list(self.__stores.items()) if section in store.reload_if_changed())
+
+    def close(self) -> None:
+        self.__stores.clear()
@@ -0,0 +1,219 @@
+import configparser
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Mapping, Iterator, Optional, Callable, Any
+
+from common.storage.kv_backend_protocol import KVBackendProtocol
+from common.storage.kv_store_protocol import KVStoreProtocol, KVValue
+from common.storage.watchable_protocol import WatchableProtocol
+
+
+class SqliteKVBackend(KVBackendProtocol, WatchableProtocol):
+    """
+    All sections in one SQLite database in WAL mode, one row per key.
+
+    A write only touches the rows of its own section. WAL keeps readers in other
+    processes unblocked while a write commits, and each commit costs a single WAL
+    append + fsync instead of rewriting the whole settings file. BEGIN IMMEDIATE,
+    which can wait up to `timeout` for another process's write lock, and COMMIT,
+    which waits for the fsync, run through `run_blocking` when given.
+    """
+    def __init__(self, path: str | os.PathLike = "settings.db", timeout: float = 5.0, run_blocking: Optional[Callable[..., Any]] = None):
+        self.__path = Path(path)
+        self.__run_blocking = run_blocking
+        self.__lock = threading.RLock()
+        self.__conn = sqlite3.connect(str(self.__path), timeout=timeout, isolation_level=None, check_same_thread=False)
+        self.__conn.execute("PRAGMA journal_mode=WAL")
+        self.__conn.execute("PRAGMA synchronous=FULL")
+        self.__conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            " section TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " PRIMARY KEY (section, key)"
+            ") WITHOUT ROWID"
+        )
+        self.__stores: dict[str, SqliteKVStore] = {}
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self.__lock
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self.__conn
+
+    def begin(self) -> None:
+        if self.__run_blocking is None:
+            self.__conn.execute("BEGIN IMMEDIATE")
+        else:
+            self.__run_blocking(self.__conn.execute, "BEGIN IMMEDIATE")
+
+    def commit(self) -> None:
+        if self.__run_blocking is None:
+            self.__conn.execute("COMMIT")
+        else:
+            self.__run_blocking(self.__conn.execute, "COMMIT")
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the database."""
+        with self.__lock:
+            return self.__conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get_store(self, section: str) -> KVStoreProtocol:
+        with self.__lock:
+            if section not in self.__stores:
+                self.__stores[section] = SqliteKVStore(self, section)
+            return self.__stores[section]
+
+    def sections(self) -> list[str]:
+        with self.__lock:
+            return [row[0] for row in self.__conn.execute("SELECT DISTINCT section FROM kv ORDER BY section")]
+
+    def watch_paths(self) -> list[Path]:
+        # Other processes commit into the -wal file next to the database
+        return [self.__path, self.__path.with_name(self.__path.name + "-wal"), self.__path.with_name(self.__path.name + "-shm")]
+
+    def refresh(self) -> list[str]:
+        with self.__lock:
+            return sorted(section for section, store in list(self.__stores.items()) if store.reload_if_changed())
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__stores.clear()
+            self.__conn.close()
+
+
+class SqliteKVStore(KVStoreProtocol):
+    """
+    One section of a SqliteKVBackend. Reads are served from an in-memory copy of
+    the section that is reloaded only when another connection has committed.
+    """
+    def __init__(self, backend: SqliteKVBackend, section: str):
+        self.section = section
+        self.__backend = backend
+        self.__values: dict[str, str] = {}
+        self.__data_version: Optional[int] = None
+        self.__txn_depth = 0
+
+    # ---------- public API ----------
+
+    def get(self, key: str, fallback: str | None = None) -> str | None:
+        with self.__backend.lock:
+            self.__refresh()
+            return self.__values.get(key, fallback)
+
+    def get_int(self, key: str, fallback: int | None = None) -> int | None:
+        val = self.get(key, None)
+        if val is None:
+            return fallback
+        try:
+            return int(val)
+        except ValueError:
+            return fallback
+
+    def get_float(self, key: str, fallback: float | None = None) -> float | None:
+        val = self.get(key, None)
+        if val is None:
+            return fallback
+        try:
+            return float(val)
+        except ValueError:
+            return fallback
+
+    def get_bool(self, key: str, fallback: bool | None = None) -> bool | None:
+        val = self.get(key, None)
+        if val is None:
+            return fallback
+        return configparser.ConfigParser.BOOLEAN_STATES.get(val.lower(), fallback)
+
+    def set(self, key: str, value: KVValue) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, values: Mapping[str, KVValue]) -> None:
+        """
+        Sets several values in one commit. None values delete the key.
+        """
+        with self.transaction():
+            conn = self.__backend.connection
+            for key, value in values.items():
+                key = SqliteKVStore.__key(key)
+                if value is None:
+                    conn.execute("DELETE FROM kv WHERE section = ? AND key = ?", (self.section, key))
+                    self.__values.pop(key, None)
+                else:
+                    conn.execute(
+                        "INSERT INTO kv (section, key, value) VALUES (?, ?, ?) "
+                        "ON CONFLICT (section, key) DO UPDATE SET value = excluded.value",
+                        (self.section, key, str(value)),
+                    )
+                    self.__values[key] = str(value)
+
+    def delete(self, key: str) -> bool:
+        with self.transaction():
+            existed = key in self.__values
+            if existed:
+                self.set_many({key: None})
+            return existed
+
+    def items(self) -> dict[str, str]:
+        with self.__backend.lock:
+            self.__refresh()
+            return dict(self.__values)
+
+    @contextmanager
+    def transaction(self) -> Iterator["SqliteKVStore"]:
+        """
+        Groups writes into one SQLite transaction (BEGIN IMMEDIATE ... COMMIT).
+        On error the transaction is rolled back and the section reloaded.
+        """
+        with self.__backend.lock:
+            conn = self.__backend.connection
+            if self.__txn_depth == 0:
+                self.__backend.begin()
+                self.__refresh(force=self.__data_version is None)
+            self.__txn_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self.__txn_depth == 1:
+                    conn.execute("ROLLBACK")
+                    self.__data_version = None
+                raise
+            else:
+                if self.__txn_depth == 1:
+                    self.__backend.commit()
+            finally:
+                self.__txn_depth -= 1
+
+    def reload_if_changed(self) -> bool:
+        """Reloads the section if another connection committed; True if its contents changed."""
+        with self.__backend.lock:
+            before = dict(self.__values)
+            self.__refresh()
+            return before != self.__values
+
+    # ---------- internals ----------
+
+    @staticmethod
+    def __key(key: str) -> str:
+        # str() of a (str, Enum) member such as EConfigKey is "EConfigKey.NAME", not its value
+        return key.value if isinstance(key, Enum) else str(key)
+
+    def __refresh(self, force: bool = False) -> None:
+        if self.__txn_depth > 0:
+            return
+        version = self.__backend.data_version()
+        if not force and version == self.__data_version:
+            return
+        rows = self.__backend.connection.execute("SELECT key, value FROM kv WHERE section = ?", (self.section,))
+        self.__values = {key: value for key, value in rows}
+        self.__data_version = version
@@ -0,0 +1,15 @@
+from pathlib import Path
+from typing import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class WatchableProtocol(Protocol):
+    """Storage whose files can be watched for changes made by other processes."""
+
+    def watch_paths(self) -> list[Path]:
+        """Files (only changes to them count) or directories (any change counts) to watch."""
+        ...
+
+    def refresh(self) -> list[str]:
+        """Reloads changed data and returns the names of the sections that changed."""
+        ...
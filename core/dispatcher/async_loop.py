@@ -0,0 +1,102 @@
+import asyncio
+import concurrent.futures
+import importlib
+import traceback
+from typing import Any, Coroutine, Optional
+
+try:
+    # The loop blocks in its selector, so it needs a real OS thread even when eventlet patched threading
+    from eventlet.patcher import original as _original
+except ImportError:
+    _original = importlib.import_module
+
+_threading = _original("threading")
+
+
+class AsyncLoop:
+    """
+    One long-lived asyncio event loop on a native thread, for coroutine subscribers.
+
+    submit() schedules a coroutine with run_coroutine_threadsafe (a few microseconds,
+    against a millisecond or more for asyncio.run creating and closing a loop per
+    call) and returns its concurrent Future. Exceptions of coroutines nobody waits
+    for are printed. Under eventlet, do not block on Future.result() from a green
+    thread; use add_done_callback() or poll done().
+
+    stop() cancels whatever is still pending, then stops and closes the loop.
+    """
+    def __init__(self, name: str = "dispatcher-asyncio"):
+        self.__name = name
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__thread = None
+        self.__ready = _threading.Event()
+        self.__pending: set[concurrent.futures.Future] = set()
+        self.__lock = _threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self.__loop is not None and self.__loop.is_running()
+
+    @property
+    def pending(self) -> int:
+        with self.__lock:
+            return len(self.__pending)
+
+    def start(self) -> None:
+        if self.__thread is not None:
+            return
+        self.__ready.clear()
+        self.__thread = _threading.Thread(target=self.__run, name=self.__name, daemon=True)
+        self.__thread.start()
+        self.__ready.wait(5.0)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        loop, thread = self.__loop, self.__thread
+        if loop is None or thread is None:
+            return
+        with self.__lock:
+            pending = list(self.__pending)
+        for future in pending:
+            future.cancel()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        self.__thread = None
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        if not self.running:
+            coro.close()
+            raise RuntimeError(f"{self.__name} is not running")
+        future = asyncio.run_coroutine_threadsafe(coro, self.__loop)
+        with self.__lock:
+            self.__pending.add(future)
+        future.add_done_callback(self.__done)
+        return future
+
+    # ---------- internals ----------
+
+    def __run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self.__loop = loop
+        loop.call_soon(self.__ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            # Let cancelled tasks unwind before closing
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+            self.__loop = None
+
+    def __done(self, future: concurrent.futures.Future) -> None:
+        with self.__lock:
+            self.__pending.discard(future)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"[AsyncLoop] coroutine subscriber error: {error}")
+            traceback.print_exception(error)
@@ -0,0 +1,268 @@
+import collections
+import dataclasses
+import threading
+import time
+import traceback
+from enum import Enum
+from typing import Callable, Any, Hashable, Optional
+
+from core.thread_manager_protocol import ThreadManagerProtocol
+
+
+class EOverflowPolicy(str, Enum):
+    BLOCK = "block"              # wait up to block_timeout for room, then drop the new task (from a worker: queue over the bound)
+    DROP_OLDEST = "drop_oldest"  # evict the oldest queued task of the same event type
+    DROP_NEWEST = "drop_newest"  # drop the new task
+
+
+@dataclasses.dataclass(frozen=True)
+class DispatchPoolStats:
+    workers: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    lane_depths: tuple[int, ...] = ()
+    lane_lag_ms: tuple[float, ...] = ()   # age of the oldest task waiting in each lane
+    max_lag_ms: float = 0.0
+    submitted: int = 0
+    completed: int = 0
+    blocked: int = 0             # submits that had to wait for room
+    over_limit: int = 0          # BLOCK submits from a worker queued past max_queue
+    dropped: int = 0
+    dropped_by_event: dict[str, int] = dataclasses.field(default_factory=dict)
+    last_wait_ms: float = 0.0    # time from submit to start
+    max_wait_ms: float = 0.0
+    avg_wait_ms: float = 0.0
+    max_run_ms: float = 0.0
+    avg_run_ms: float = 0.0
+
+
+class _Task:
+    __slots__ = ("fn", "args", "event_name", "submitted_at", "lane")
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, event_name: str, submitted_at: float, lane: int):
+        self.fn = fn
+        self.args = args
+        self.event_name = event_name
+        self.submitted_at = submitted_at
+        self.lane = lane
+
+
+class DispatchPool:
+    """
+    Fixed number of serial lanes, each a FIFO run by its own worker task.
+
+    Tasks submitted with the same key always go to the same lane, so they run one
+    at a time in submit order; different keys spread over the lanes and run in
+    parallel. Tasks without a key go to the shortest lane.
+
+    Workers are started through the ThreadManager, so they are green threads with
+    eventlet and OS threads in threading mode. When the lanes hold `max_queue`
+    tasks together, the overflow policy of the new task's event type decides what
+    happens (see EOverflowPolicy); event types without a policy use `default_policy`.
+
+    A BLOCK submit made by a worker (a subscriber that emits) is queued past the
+    bound instead of waiting: its own lane cannot drain while it waits, so it would
+    stall for block_timeout and then drop the task.
+
+    stop() lets the workers finish their lanes and exit. A start() before they are
+    gone starts a new generation of workers; the old ones exit after the task they
+    are running, and a lane never runs two tasks at once.
+    """
+    def __init__(
+            self,
+            thread_manager: ThreadManagerProtocol,
+            workers: int = 4,
+            max_queue: int = 256,
+            default_policy: EOverflowPolicy = EOverflowPolicy.BLOCK,
+            block_timeout: float = 1.0,
+    ):
+        self.__thread_manager = thread_manager
+        self.__workers = workers
+        self.__max_queue = max_queue
+        self.__default_policy = default_policy
+        self.__block_timeout = block_timeout
+        self.__policies: dict[str, EOverflowPolicy] = {}
+
+        self.__lock = threading.Lock()
+        # One "not empty" condition per lane and a shared "not full", all on the same lock
+        self.__not_empty = [threading.Condition(self.__lock) for _ in range(workers)]
+        self.__not_full = threading.Condition(self.__lock)
+        self.__lanes: list[collections.deque[_Task]] = [collections.deque() for _ in range(workers)]
+        self.__queued = 0
+        self.__running = False
+        self.__active_workers = 0
+        # Bumped by start(); workers of an older generation exit
+        self.__generation = 0
+        # Lanes whose task is running, so a new worker waits for the old one's task
+        self.__lane_busy = [False] * workers
+        # Set on the worker tasks (green-thread local under eventlet)
+        self.__worker_local = threading.local()
+
+        self.__submitted = 0
+        self.__completed = 0
+        self.__blocked = 0
+        self.__over_limit = 0
+        self.__dropped: collections.Counter[str] = collections.Counter()
+        self.__max_depth = 0
+        self.__last_wait = 0.0
+        self.__max_wait = 0.0
+        self.__total_wait = 0.0
+        self.__max_run = 0.0
+        self.__total_run = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.__running
+
+    @property
+    def lanes(self) -> int:
+        return self.__workers
+
+    def lane_of(self, key: Hashable) -> int:
+        return hash(key) % self.__workers
+
+    @property
+    def stats(self) -> DispatchPoolStats:
+        now = time.monotonic()
+        with self.__lock:
+            completed = self.__completed
+            lags = tuple((now - lane[0].submitted_at) * 1000.0 if lane else 0.0 for lane in self.__lanes)
+            return DispatchPoolStats(
+                workers=self.__active_workers,
+                queue_depth=self.__queued,
+                max_queue_depth=self.__max_depth,
+                lane_depths=tuple(len(lane) for lane in self.__lanes),
+                lane_lag_ms=lags,
+                max_lag_ms=max(lags, default=0.0),
+                submitted=self.__submitted,
+                completed=completed,
+                blocked=self.__blocked,
+                over_limit=self.__over_limit,
+                dropped=sum(self.__dropped.values()),
+                dropped_by_event=dict(self.__dropped),
+                last_wait_ms=self.__last_wait * 1000.0,
+                max_wait_ms=self.__max_wait * 1000.0,
+                avg_wait_ms=self.__total_wait / completed * 1000.0 if completed else 0.0,
+                max_run_ms=self.__max_run * 1000.0,
+                avg_run_ms=self.__total_run / completed * 1000.0 if completed else 0.0,
+            )
+
+    def set_policy(self, event_name: str, policy: EOverflowPolicy) -> None:
+        self.__policies[event_name] = policy
+
+    def get_policy(self, event_name: str) -> EOverflowPolicy:
+        return self.__policies.get(event_name, self.__default_policy)
+
+    def start(self) -> None:
+        with self.__lock:
+            if self.__running:
+                return
+            self.__running = True
+            self.__generation += 1
+            generation = self.__generation
+            # Idle workers of a previous generation wake up and exit
+            for not_empty in self.__not_empty:
+                not_empty.notify_all()
+        for lane in range(self.__workers):
+            self.__thread_manager.start_background_task(self.__worker, lane, generation)
+
+    def stop(self) -> None:
+        """Stops the workers once their lanes are empty."""
+        with self.__lock:
+            self.__running = False
+            for not_empty in self.__not_empty:
+                not_empty.notify_all()
+            self.__not_full.notify_all()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, event_name: str = "", key: Optional[Hashable] = None) -> bool:
+        """Queues fn(*args) on the lane of key. Returns False if the task was dropped."""
+        with self.__lock:
+            lane = self.lane_of(key) if key is not None else min(range(self.__workers), key=lambda i: len(self.__lanes[i]))
+            task = _Task(fn, args, event_name, time.monotonic(), lane)
+            self.__submitted += 1
+            if self.__queued >= self.__max_queue and not self.__make_room(task):
+                self.__dropped[event_name] += 1
+                return False
+            self.__lanes[lane].append(task)
+            self.__queued += 1
+            self.__max_depth = max(self.__max_depth, self.__queued)
+            self.__not_empty[lane].notify()
+        return True
+
+    # ---------- internals ----------
+
+    def __make_room(self, task: _Task) -> bool:
+        """Applies the overflow policy of task with the lock held. True if task may be queued."""
+        policy = self.get_policy(task.event_name)
+        if policy == EOverflowPolicy.DROP_OLDEST:
+            oldest = min(
+                (queued for lane in self.__lanes for queued in lane if queued.event_name == task.event_name),
+                key=lambda queued: queued.submitted_at,
+                default=None,
+            )
+            if oldest is None:
+                return False
+            self.__lanes[oldest.lane].remove(oldest)
+            self.__queued -= 1
+            self.__dropped[task.event_name] += 1
+            return True
+        if policy == EOverflowPolicy.BLOCK and getattr(self.__worker_local, "worker", False):
+            self.__over_limit += 1
+            return True
+        if policy == EOverflowPolicy.BLOCK and self.__running:
+            self.__blocked += 1
+            return self.__not_full.wait_for(lambda: self.__queued < self.__max_queue or not self.__running, self.__block_timeout) \
+                and self.__queued < self.__max_queue
+        return False
+
+    def __worker(self, lane: int, generation: int) -> None:
+        tasks = self.__lanes[lane]
+        not_empty = self.__not_empty[lane]
+        self.__worker_local.worker = True
+        with self.__lock:
+            self.__active_workers += 1
+        try:
+            while True:
+                with self.__lock:
+                    while True:
+                        if generation != self.__generation:
+                            return
+                        if tasks and not self.__lane_busy[lane]:
+                            break
+                        if not tasks and not self.__running:
+                            return
+                        not_empty.wait()
+                    task = tasks.popleft()
+                    self.__queued -= 1
+                    self.__lane_busy[lane] = True
+                    # Room for a blocked submit
+                    self.__not_full.notify()
+                try:
+                    self.__run(task)
+                finally:
+                    with self.__lock:
+                        self.__lane_busy[lane] = False
+        finally:
+            with self.__lock:
+                self.__active_workers -= 1
+                # The lane's worker of a newer generation may be waiting for this one
+                not_empty.notify_all()
+
+    def __run(self, task: _Task) -> None:
+        start = time.monotonic()
+        try:
+            task.fn(*task.args)
+        except Exception as e:
+            print(f"[DispatchPool] Task for {task.event_name or task.fn} failed: {e}")
+            traceback.print_exc()
+        end = time.monotonic()
+
+        wait = start - task.submitted_at
+        run = end - start
+        with self.__lock:
+            self.__completed += 1
+            self.__last_wait = wait
+            self.__max_wait = max(self.__max_wait, wait)
+            self.__total_wait += wait
+            self.__max_run = max(self.__max_run, run)
+            self.__total_run += run
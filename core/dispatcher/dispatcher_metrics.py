@@ -0,0 +1,289 @@
+import bisect
+import collections
+import dataclasses
+import threading
+from typing import Callable, Any, Optional
+
+# Upper bounds of the latency histogram buckets, in milliseconds (the last one is +Inf)
+LATENCY_BUCKETS_MS: tuple[float, ...] = (0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0, 500.0, 1000.0, float("inf"))
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS_MS)
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+
+@dataclasses.dataclass(frozen=True)
+class HistogramSnapshot:
+    buckets: tuple[float, ...]
+    counts: tuple[int, ...]      # per bucket, not cumulative
+    count: int
+    sum_ms: float
+    max_ms: float
+
+    @property
+    def avg_ms(self) -> float:
+        return self.sum_ms / self.count if self.count else 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class EventMetrics:
+    event_name: str
+    emitted: int
+    errors: int
+    wait: HistogramSnapshot      # emit to start of delivery (async, sampled tasks only)
+
+
+@dataclasses.dataclass(frozen=True)
+class SubscriberMetrics:
+    event_name: str
+    subscriber: str
+    samples: int                 # timed calls (one delivery task in sample_every)
+    errors: int
+    slow_calls: int              # calls longer than the slow threshold
+    slow: bool                   # the last timed call was slow
+    run: HistogramSnapshot       # of the sampled calls
+
+
+@dataclasses.dataclass(frozen=True)
+class DispatcherMetricsSnapshot:
+    enabled: bool
+    slow_threshold_ms: float
+    sample_every: int
+    events: tuple[EventMetrics, ...]
+    subscribers: tuple[SubscriberMetrics, ...]
+
+
+class _EventEntry:
+    __slots__ = ("errors", "wait")
+
+    def __init__(self):
+        self.errors = 0
+        self.wait = _Histogram()
+
+
+class _SubscriberEntry:
+    __slots__ = ("event", "samples", "errors", "slow_calls", "slow", "run")
+
+    def __init__(self, event: _EventEntry):
+        self.event = event
+        self.samples = 0
+        self.errors = 0
+        self.slow_calls = 0
+        self.slow = False
+        self.run = _Histogram()
+
+
+class DispatcherMetrics:
+    """
+    Per event type and per subscriber counters and latency histograms of the EventDispatcher.
+
+    Emits are counted exactly. Every callback is timed (two perf_counter calls) so
+    slow calls and errors are exact too, but only one delivery task in `sample_every`
+    goes into the wait and run histograms: recording costs about as much as a small
+    callback, so sampling is what keeps the overhead at a few percent. Nothing is
+    recorded while `enabled` is off, which can be switched at runtime.
+
+    Counters written outside the lock (emits, samples) can lose an increment when
+    two native threads race; they are diagnostics, not accounting.
+    """
+    def __init__(self, slow_threshold: float = 0.05, sample_every: int = 8, enabled: bool = True):
+        self.__slow_threshold = slow_threshold
+        self.__sample_every = max(1, sample_every)
+        self.__enabled = enabled
+        self.__lock = threading.Lock()
+        self.__emitted: collections.Counter[type] = collections.Counter()
+        self.__tasks = 0
+        self.__events: dict[str, _EventEntry] = {}
+        self.__subscribers: dict[tuple[str, str], _SubscriberEntry] = {}
+        # (event type, callback) -> its entry, so the hot path never builds a name
+        self.__by_callback: dict[tuple[type, Callable[..., Any]], _SubscriberEntry] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self.__enabled = value
+
+    @property
+    def slow_threshold(self) -> float:
+        """Seconds above which a callback run is counted as slow."""
+        return self.__slow_threshold
+
+    @slow_threshold.setter
+    def slow_threshold(self, value: float) -> None:
+        self.__slow_threshold = value
+
+    @property
+    def sample_every(self) -> int:
+        return self.__sample_every
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__emitted.clear()
+            self.__events.clear()
+            self.__subscribers.clear()
+            self.__by_callback.clear()
+
+    def count_emit(self, event: Any) -> None:
+        self.__emitted[type(event)] += 1
+
+    def sample(self) -> bool:
+        """True for the delivery tasks that go into the histograms."""
+        self.__tasks += 1
+        return self.__tasks % self.__sample_every == 0
+
+    def record_deliveries(
+            self,
+            deliveries: list[tuple[Callable[..., Any], Any, float, float, bool]],
+            emitted_at: Optional[float] = None,
+            sampled: bool = True,
+    ) -> None:
+        """
+        Records callback runs of one delivery task as (callback, event, start, end, ok), with
+        perf_counter times. An unsampled task only passes its slow and failed runs.
+        emitted_at is when the task was queued (None for a sync emit).
+        """
+        slow_threshold_ms = self.__slow_threshold * 1000.0
+        with self.__lock:
+            previous = None
+            for callback, event, start, end, ok in deliveries:
+                event_type = type(event)
+                entry = self.__by_callback.get((event_type, callback))
+                if entry is None:
+                    entry = self.__subscriber(event_type.__name__, callback)
+                    self.__by_callback[(event_type, callback)] = entry
+                ms = (end - start) * 1000.0
+                slow = ms > slow_threshold_ms
+                if sampled:
+                    if emitted_at is not None and event is not previous:
+                        entry.event.wait.add((start - emitted_at) * 1000.0)
+                    entry.samples += 1
+                    entry.run.add(ms)
+                    entry.slow = slow
+                elif slow:
+                    entry.slow = True
+                if slow:
+                    entry.slow_calls += 1
+                if not ok:
+                    entry.errors += 1
+                    entry.event.errors += 1
+                previous = event
+
+    def snapshot(self) -> DispatcherMetricsSnapshot:
+        with self.__lock:
+            emitted = {event_type.__name__: count for event_type, count in list(self.__emitted.items())}
+            for event_name in emitted:
+                self.__event(event_name)
+            events = tuple(
+                EventMetrics(event_name=name, emitted=emitted.get(name, 0), errors=entry.errors, wait=self.__histogram(entry.wait))
+                for name, entry in self.__events.items()
+            )
+            subscribers = tuple(
+                SubscriberMetrics(
+                    event_name=event_name,
+                    subscriber=name,
+                    samples=entry.samples,
+                    errors=entry.errors,
+                    slow_calls=entry.slow_calls,
+                    slow=entry.slow,
+                    run=self.__histogram(entry.run),
+                )
+                for (event_name, name), entry in self.__subscribers.items()
+            )
+        return DispatcherMetricsSnapshot(
+            enabled=self.__enabled,
+            slow_threshold_ms=self.__slow_threshold * 1000.0,
+            sample_every=self.__sample_every,
+            events=events,
+            subscribers=subscribers,
+        )
+
+    def to_text(self) -> str:
+        """Prometheus text exposition of the snapshot."""
+        snapshot = self.snapshot()
+        lines = [
+            "# TYPE pdws_dispatcher_enabled gauge",
+            f"pdws_dispatcher_enabled {int(snapshot.enabled)}",
+            "# TYPE pdws_dispatcher_sample_every gauge",
+            f"pdws_dispatcher_sample_every {snapshot.sample_every}",
+            "# TYPE pdws_dispatcher_events_total counter",
+        ]
+        lines += [f'pdws_dispatcher_events_total{{event="{e.event_name}"}} {e.emitted}' for e in snapshot.events]
+        lines.append("# TYPE pdws_dispatcher_event_errors_total counter")
+        lines += [f'pdws_dispatcher_event_errors_total{{event="{e.event_name}"}} {e.errors}' for e in snapshot.events]
+        lines.append("# TYPE pdws_dispatcher_wait_ms histogram")
+        for e in snapshot.events:
+            lines += self.__histogram_lines("pdws_dispatcher_wait_ms", f'event="{e.event_name}"', e.wait)
+        lines.append("# TYPE pdws_dispatcher_subscriber_errors_total counter")
+        lines += [f'pdws_dispatcher_subscriber_errors_total{{{self.__labels(s)}}} {s.errors}' for s in snapshot.subscribers]
+        lines.append("# TYPE pdws_dispatcher_subscriber_slow_total counter")
+        lines += [f'pdws_dispatcher_subscriber_slow_total{{{self.__labels(s)}}} {s.slow_calls}' for s in snapshot.subscribers]
+        lines.append("# TYPE pdws_dispatcher_subscriber_slow gauge")
+        lines += [f'pdws_dispatcher_subscriber_slow{{{self.__labels(s)}}} {int(s.slow)}' for s in snapshot.subscribers]
+        lines.append("# TYPE pdws_dispatcher_run_ms histogram")
+        for s in snapshot.subscribers:
+            lines += self.__histogram_lines("pdws_dispatcher_run_ms", self.__labels(s), s.run)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def subscriber_name(callback: Callable[..., Any]) -> str:
+        """Qualified name of the callback, plus the device name for a device method (e.g. "Sensor.__handle_ai_change[sensor_1]")."""
+        name = getattr(callback, "__qualname__", None) or repr(callback)
+        owner = getattr(callback, "__self__", None)
+        device_name = getattr(owner, "device_name", None) if owner is not None else None
+        return f"{name}[{device_name}]" if isinstance(device_name, str) else name
+
+    # ---------- internals ----------
+
+    def __event(self, event_name: str) -> _EventEntry:
+        entry = self.__events.get(event_name)
+        if entry is None:
+            entry = self.__events[event_name] = _EventEntry()
+        return entry
+
+    def __subscriber(self, event_name: str, callback: Callable[..., Any]) -> _SubscriberEntry:
+        key = (event_name, self.subscriber_name(callback))
+        entry = self.__subscribers.get(key)
+        if entry is None:
+            entry = self.__subscribers[key] = _SubscriberEntry(self.__event(event_name))
+        return entry
+
+    @staticmethod
+    def __histogram(histogram: _Histogram) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            buckets=LATENCY_BUCKETS_MS,
+            counts=tuple(histogram.counts),
+            count=sum(histogram.counts),
+            sum_ms=histogram.total,
+            max_ms=histogram.max,
+        )
+
+    @staticmethod
+    def __labels(subscriber: SubscriberMetrics) -> str:
+        name = subscriber.subscriber.replace("\\", "\\\\").replace('"', '\\"')
+        return f'event="{subscriber.event_name}",subscriber="{name}"'
+
+    @staticmethod
+    def __histogram_lines(metric: str, labels: str, histogram: HistogramSnapshot) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{metric}_sum{{{labels}}} {histogram.sum_ms:.3f}")
+        lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return lines
@@ -1,15 +1,56 @@
 from threading import Lock
-from typing import Callable, Any, Type, Union
+from typing import Callable, Any, Type, Union, Sequence, Optional, Hashable, NamedTuple
+import asyncio
 import inspect
+import time
 
+from core.dispatcher.async_loop import AsyncLoop
+from core.dispatcher.dispatch_pool import DispatchPool, DispatchPoolStats
+from core.dispatcher.dispatcher_metrics import DispatcherMetrics
 from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol, E
 from core.thread_manager_protocol import ThreadManagerProtocol
 
+class _Subscription(NamedTuple):
+    callback: Callable[[Any], Any]
+    is_coroutine: bool       # checked once, at subscribe
+
+
 class EventDispatcher(EventDispatcherProtocol):
-    def __init__(self, thread_manager: ThreadManagerProtocol):
-        self._subscribers = {}
+    """
+    Subscribers registered with a key only receive events whose `routing_key` equals
+    it (e.g. the io_id of an IOEvent), so a device listening to its own points is not
+    called for every point of the station.
+
+    With a started DispatchPool, emit_async queues one task per call on the pool
+    (callbacks of an event run in subscription order). The task goes to the lane of
+    the event's ordering key, so events of the same type and routing_key (e.g. the
+    edges of one input) are handled in emit order. emit_batch splits the batch by
+    ordering key and queues one task per key, so the per-point events of an IO scan
+    spread over the lanes while each point keeps its order. Without a pool every
+    callback gets its own background task (emit_batch: one for the whole batch).
+
+    With DispatcherMetrics, emits, queue waits, run times and errors are recorded per
+    event type and subscriber while the metrics are enabled.
+
+    Coroutine subscribers are scheduled on the AsyncLoop when one is running (their
+    run time is then the scheduling only); without it each call gets asyncio.run.
+    """
+    def __init__(
+            self,
+            thread_manager: ThreadManagerProtocol,
+            pool: Optional[DispatchPool] = None,
+            metrics: Optional[DispatcherMetrics] = None,
+            async_loop: Optional[AsyncLoop] = None,
+    ):
+        # Copy-on-write: subscribe/unsubscribe swap in new tuples under the lock,
+        # emits read them without locking.
+        self._subscribers: dict[str, tuple[_Subscription, ...]] = {}
+        self._keyed_subscribers: dict[tuple[str, Hashable], tuple[_Subscription, ...]] = {}
         self._lock = Lock()
         self._thread_manager = thread_manager
+        self._pool = pool
+        self._metrics = metrics
+        self._async_loop = async_loop
 
     @staticmethod
     def resolve_event_name(event: Union[Type[E] | str]) -> str:
@@ -17,50 +58,155 @@ class EventDispatcher(EventDispatcherProtocol):
             return event
         return event.__name__
 
-    def subscribe(self, event: Union[Type[E] | str], callback: Callable[[E], None]):
+    @staticmethod
+    def resolve_ordering_key(event: E) -> Hashable:
+        """Events with the same ordering key are delivered in order by emit_async."""
+        event_name = type(event).__name__
+        key = getattr(event, "routing_key", None)
+        return event_name if key is None else (event_name, key)
+
+    def subscribe(self, event: Union[Type[E] | str], callback: Callable[[E], None], key: Optional[Hashable] = None):
         event_name = EventDispatcher.resolve_event_name(event)
+        subscription = _Subscription(callback, inspect.iscoroutinefunction(callback))
         with self._lock:
-            self._subscribers.setdefault(event_name, []).append(callback)
+            if key is None:
+                self._subscribers = {**self._subscribers, event_name: self._subscribers.get(event_name, ()) + (subscription,)}
+            else:
+                index = (event_name, key)
+                self._keyed_subscribers = {**self._keyed_subscribers, index: self._keyed_subscribers.get(index, ()) + (subscription,)}
 
-    def unsubscribe(self, event: Union[Type[E] | str], callback: Callable[[E], None]):
+    def unsubscribe(self, event: Union[Type[E] | str], callback: Callable[[E], None], key: Optional[Hashable] = None):
         event_name = EventDispatcher.resolve_event_name(event)
         with self._lock:
-            if event_name in self._subscribers and callback in self._subscribers[event_name]:
-                self._subscribers[event_name].remove(callback)
-            # else:
-            #     print(f"[dispatcher.unsubscribe] no such subscriber: {callback} for event: {event_name}")
+            if key is None:
+                self._subscribers = EventDispatcher._without(self._subscribers, event_name, callback)
+            else:
+                self._keyed_subscribers = EventDispatcher._without(self._keyed_subscribers, (event_name, key), callback)
 
-    def _collect_callbacks(self, event: E):
-        with self._lock:
-            event_name = EventDispatcher.resolve_event_name(type(event))
-            callbacks = list(self._subscribers.get(event_name, []))
-            # if not callbacks:
-            #     callbacks = list(self._subscribers.get(event.key, []))
+    @staticmethod
+    def _without(subscribers: dict, index: Hashable, callback: Callable[[Any], None]) -> dict:
+        subscriptions = subscribers.get(index, ())
+        position = next((i for i, subscription in enumerate(subscriptions) if subscription.callback == callback), None)
+        if position is None:
+            return subscribers
+        remaining = subscriptions[:position] + subscriptions[position + 1:]
+        subscribers = dict(subscribers)
+        if remaining:
+            subscribers[index] = remaining
+        else:
+            del subscribers[index]
+        return subscribers
+
+    def _collect_callbacks(self, event: E) -> tuple[_Subscription, ...]:
+        """Subscribers of the event type, then those of its routing_key (if it has one)."""
+        event_name = type(event).__name__
+        callbacks = self._subscribers.get(event_name, ())
+        key = getattr(event, "routing_key", None)
+        if key is not None:
+            keyed = self._keyed_subscribers.get((event_name, key))
+            if keyed:
+                callbacks = callbacks + keyed if callbacks else keyed
         return callbacks
 
     def emit(self, event: E):
         callbacks = self._collect_callbacks(event)
+        if self._record_emits((event,)) is not None:
+            self._run_batch([(cb, event) for cb in callbacks], None)
+            return
 
         for cb in callbacks:
-            EventDispatcher._run_cb_safely(cb, event)
+            self._run_cb_safely(cb, event)
 
     def emit_async(self, event: E):
         callbacks = self._collect_callbacks(event)
+        emitted_at = self._record_emits((event,))
         # print("Emitting event: ", "".join(traceback.format_stack()))
+        if not callbacks:
+            return
+        if self._pool is not None and self._pool.running:
+            deliveries = [(cb, event) for cb in callbacks]
+            self._pool.submit(
+                self._run_batch, deliveries, emitted_at,
+                event_name=type(event).__name__,
+                key=EventDispatcher.resolve_ordering_key(event),
+            )
+            return
         for cb in callbacks:
-            self._thread_manager.start_background_task(EventDispatcher._run_cb_safely, cb, event)
+            self._thread_manager.start_background_task(self._run_batch, [(cb, event)], emitted_at)
 
-    @staticmethod
-    def _run_cb_safely(cb: Callable[[Any], Any], event: Any):
+    def emit_batch(self, events: Sequence[E]):
+        deliveries = [(cb, event) for event in events for cb in self._collect_callbacks(event)]
+        emitted_at = self._record_emits(events)
+        if not deliveries:
+            return
+        if self._pool is not None and self._pool.running:
+            # One task per ordering key, in order of first appearance; each is accounted
+            # under the type of its first event
+            by_key: dict[Hashable, list[tuple[_Subscription, Any]]] = {}
+            for delivery in deliveries:
+                by_key.setdefault(EventDispatcher.resolve_ordering_key(delivery[1]), []).append(delivery)
+            for key, key_deliveries in by_key.items():
+                self._pool.submit(
+                    self._run_batch, key_deliveries, emitted_at,
+                    event_name=type(key_deliveries[0][1]).__name__,
+                    key=key,
+                )
+            return
+        self._thread_manager.start_background_task(self._run_batch, deliveries, emitted_at)
+
+    def get_dispatch_stats(self) -> Optional[DispatchPoolStats]:
+        return self._pool.stats if self._pool is not None else None
+
+    def get_metrics(self) -> Optional[DispatcherMetrics]:
+        return self._metrics
+
+    def stop(self) -> None:
+        if self._pool is not None:
+            self._pool.stop()
+        if self._async_loop is not None:
+            self._async_loop.stop()
+
+    def _record_emits(self, events: Sequence[Any]) -> Optional[float]:
+        """Counts the emits; returns the emit time to measure the queue wait against (None if disabled)."""
+        metrics = self._metrics
+        if metrics is None or not metrics.enabled:
+            return None
+        for event in events:
+            metrics.count_emit(event)
+        return time.perf_counter()
+
+    def _run_batch(self, deliveries: list[tuple[_Subscription, Any]], emitted_at: Optional[float]):
+        metrics = self._metrics
+        if metrics is None or not metrics.enabled:
+            for cb, event in deliveries:
+                self._run_cb_safely(cb, event)
+            return
+
+        sampled = metrics.sample()
+        slow_threshold = metrics.slow_threshold
+        timed = []
+        for cb, event in deliveries:
+            start = time.perf_counter()
+            ok = self._run_cb_safely(cb, event)
+            end = time.perf_counter()
+            if sampled or not ok or end - start > slow_threshold:
+                timed.append((cb.callback, event, start, end, ok))
+        if timed:
+            metrics.record_deliveries(timed, emitted_at, sampled)
+
+    def _run_cb_safely(self, subscription: _Subscription, event: Any) -> bool:
+        callback = subscription.callback
         try:
-            # In eventlet mode, prefer sync callbacks.
-            if inspect.iscoroutinefunction(cb):
-                # Strongly recommended to avoid async defs in eventlet mode,
-                # but if present, run to completion in a temporary loop:
-                import asyncio
-                asyncio.run(cb(event))
+            if subscription.is_coroutine:
+                if self._async_loop is not None and self._async_loop.running:
+                    # Scheduled on the dispatcher's loop; its errors are reported there
+                    self._async_loop.submit(callback(event))
+                else:
+                    # No loop: run to completion in a temporary one (slow)
+                    asyncio.run(callback(event))
             else:
-                cb(event)
+                callback(event)
+            return True
         except Exception as e:
-            print(f"[dispatcher.emit_async] subscriber error in {cb}: {e}")
-
+            print(f"[dispatcher.emit_async] subscriber error in {callback}: {e}")
+            return False
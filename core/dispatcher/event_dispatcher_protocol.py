@@ -1,12 +1,33 @@
-from typing import Callable, TypeVar, Type, Union, Protocol
+from typing import Callable, TypeVar, Type, Union, Protocol, Sequence, Optional, Hashable
+
+from core.dispatcher.dispatch_pool import DispatchPoolStats
+from core.dispatcher.dispatcher_metrics import DispatcherMetrics
 
 E = TypeVar("E")
 
 class EventDispatcherProtocol(Protocol):
-    def subscribe(self, event: Union[Type[E] | str], callback: Callable[[E], None]):...
+    def subscribe(self, event: Union[Type[E] | str], callback: Callable[[E], None], key: Optional[Hashable] = None):
+        """With a key, callback only receives events whose routing_key equals it."""
+        ...
 
-    def unsubscribe(self, event: Union[Type[E] | str], callback: Callable[[E], None]):...
+    def unsubscribe(self, event: Union[Type[E] | str], callback: Callable[[E], None], key: Optional[Hashable] = None):...
 
     def emit(self, event: E):...
 
-    def emit_async(self, event: E):...
\ No newline at end of file
+    def emit_async(self, event: E):...
+
+    def emit_batch(self, events: Sequence[E]):
+        """Delivers several events asynchronously; events with the same ordering key are delivered in order."""
+        ...
+
+    def get_dispatch_stats(self) -> Optional[DispatchPoolStats]:
+        """Worker pool statistics, None without a pool."""
+        return None
+
+    def get_metrics(self) -> Optional[DispatcherMetrics]:
+        """Per event and subscriber metrics, None if not instrumented."""
+        return None
+
+    def stop(self) -> None:
+        """Stops background delivery (worker pool, asyncio loop) and cancels pending coroutines."""
+        pass
@@ -23,6 +23,17 @@ class ThreadManagerProtocol(Protocol):
         """
         pass
 
+    def run_blocking(self, target, *args, **kwargs) -> Any:
+        """Run a blocking call (fsync, sqlite COMMIT, ...) without stalling the
+        other tasks.
+
+        With eventlet the call runs in a native worker thread while the calling
+        green thread yields; in other async modes it is called directly.
+
+        Returns the result of ``target(*args, **kwargs)`` and re-raises its errors.
+        """
+        pass
+
 class ThreadManager(ThreadManagerProtocol):
     def __init__(self, socketio: SocketIO):
         self.__socketio = socketio
@@ -33,4 +44,10 @@ class ThreadManager(ThreadManagerProtocol):
         except Exception as e:
             traceback.print_exc()
             print(f"Error starting background task: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def run_blocking(self, target, *args, **kwargs):
+        if self.__socketio.async_mode == "eventlet":
+            from eventlet import tpool
+            return tpool.execute(target, *args, **kwargs)
+        return target(*args, **kwargs)
@@ -37,8 +37,7 @@ class DeviceRunnable(DeviceRunnableProtocol, Device, ABC):
             self.__current_run_start_time = time.perf_counter()
         if self.__status == EDeviceStatus.STOPPED:
             current = round(self.run_time_current, 2)
-            self.device_service.add_device_total_run_time(self.device_name, current)
-            self.device_service.set_device_last_run_time(self.device_name, current)
+            self.device_service.record_device_stop(self.device_name, current)
             self.__current_run_start_time = 0.0
 
     @property
@@ -89,6 +88,10 @@ class DeviceRunnable(DeviceRunnableProtocol, Device, ABC):
     def run_time_total(self) -> float:
         return self.device_service.get_device_total_run_time(self.device_name) + self.run_time_current
 
+    def checkpoint_run_time(self) -> None:
+        if self.__current_run_start_time != 0.0:
+            self.device_service.checkpoint_device_run_time(self.device_name, round(self.run_time_current, 2))
+
     def reset_run_time(self) -> None:
         self.__current_run_start_time = 0.0
         self.device_service.clear_device_run_times(self.device_name)
@@ -29,6 +29,8 @@ class DeviceRunnableProtocol(DeviceProtocol, Protocol):
     @property
     def is_called_to_run(self) -> bool: ...
 
+    def checkpoint_run_time(self) -> None: ...
+
     def reset_run_time(self) -> None: ...
 
     def call_to_run(self) -> None: ...
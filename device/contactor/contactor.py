@@ -32,7 +32,8 @@ class Contactor(ContactorProtocol, DeviceRunnable):
         self.__di_running = di_running
         self.__do_run = do_run
 
-        event_dispatcher.subscribe(DIEvent, self.handle_di_change)
+        for io_id in {di_running, io_service.di_emergency_stop}:
+            event_dispatcher.subscribe(DIEvent, self.handle_di_change, key=io_id)
 
     @property
     def device_name(self) -> str:
@@ -46,6 +47,16 @@ class Contactor(ContactorProtocol, DeviceRunnable):
     def do_run(self) -> int:
         return self.__do_run
 
+    @property
+    def status(self) -> EDeviceStatus:
+        # The feedback input as the caller sees it (a station tick: its input image); the
+        # DI handler sets the status to keep the run time bookkeeping
+        return EDeviceStatus.RUNNING if self.io_service.get_digital_input_value(self.di_running) else EDeviceStatus.STOPPED
+
+    @status.setter
+    def status(self, value: EDeviceStatus) -> None:
+        DeviceRunnable.status.fset(self, value)
+
     @property
     def is_called_to_run(self) -> bool:
         return self.io_service.get_digital_output_value(self.do_run)
@@ -1,5 +1,6 @@
 
 from common import utils
+from common.storage.events.settings_changed_event import SettingsChangedEvent
 from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
 from core.serializable_protocol import SerializableProtocol
 from device.sensor.sensor_config_manager import SensorConfigManager
@@ -26,24 +27,26 @@ class Sensor(SensorProtocol, Device):
 
         current_config = device_service.get_sensor_config(device_id, self.device_name, config)
         self.__ai_id = ai_id
-        self.__value_ai = 0
 
         self.__config_manager = SensorConfigManager(current_config)
 
-        self.event_dispatcher.subscribe(AIEvent, self.__handle_ai_change)
+        self.event_dispatcher.subscribe(AIEvent, self.__handle_ai_change, key=ai_id)
+        self.event_dispatcher.subscribe(SettingsChangedEvent, self.__handle_settings_changed, key=self.device_name)
 
     @property
     def device_name(self) -> str:
         return f"sensor_{self.device_id}"
 
     def __handle_ai_change(self, event: AIEvent):
-        if event.io_id != self.ai_id:
-            return
         # print(f"Sensor {self.device_name} AI change: {event}")
-        self.ai = event.value_new
+        self.__config_manager.value = self.value_scaled
 
         # print(f"Sensor {self.device_name} Value: {self.value_scaled}")
 
+    def __handle_settings_changed(self, event: SettingsChangedEvent):
+        self.device_service.invalidate_config(self.device_name)
+        self.__config_manager.config = self.device_service.get_sensor_config(self.device_id, self.device_name, self.config)
+
     @property
     def value_scaled(self) -> float:
        return utils.scale_value(self.ai, self.ai_min, self.ai_max, self.value_scaled_max, self.value_scaled_min, clamp_output=True) + self.__config_manager.config.adjustment
@@ -70,11 +73,8 @@ class Sensor(SensorProtocol, Device):
 
     @property
     def ai(self) -> int:
-        return self.__value_ai
-    @ai.setter
-    def ai(self, value: int) -> None:
-        self.__value_ai = value
-        self.__config_manager.value = self.value_scaled
+        # Read through the IO service so a station tick sees the value of its input image
+        return self.io_service.get_analog_input_value(self.ai_id)
 
     @property
     def ai_max(self) -> int:
@@ -43,22 +43,25 @@ class System(SystemProtocol, Device):
         self.__priority_auto = ESystemPriority.OUT
 
         self.__software_mode = kwargs.get("mode", ESystemMode.OFF)
-        self.__physical_mode: ESystemMode = ESystemMode.OFF
 
         self.__emergency_stop: bool = False
 
-        event_dispatcher.subscribe(DIEvent, self.__handle_di_change)
+        for io_id in {self.__di_hand, self.__di_auto, io_service.di_emergency_stop}:
+            event_dispatcher.subscribe(DIEvent, self.__handle_di_change, key=io_id)
 
     def __handle_di_change(self, event: DIEvent):
         if event.io_id == self.io_service.di_emergency_stop:
             self.set_emergency_stop(event.value_new)
         elif event.io_id in [self.__di_hand, self.__di_auto]:
-            hand = event.io_id == self.__di_hand and event.value_new
-            auto = event.io_id == self.__di_auto and event.value_new
-            self.__physical_mode = ESystemMode.OFF if not hand and not auto else ESystemMode.HAND if hand else ESystemMode.AUTO
-            if self.__physical_mode != ESystemMode.AUTO:
+            if self.__physical_mode() != ESystemMode.AUTO:
                 self.mode = ESystemMode.OFF
 
+    def __physical_mode(self) -> ESystemMode:
+        # Both switch inputs as the caller sees them (a station tick: its input image)
+        hand = self.io_service.get_digital_input_value(self.__di_hand)
+        auto = self.io_service.get_digital_input_value(self.__di_auto)
+        return ESystemMode.OFF if not hand and not auto else ESystemMode.HAND if hand else ESystemMode.AUTO
+
     def __update_mode(self):
         if self.mode == ESystemMode.OFF:
             self.stop()
@@ -139,6 +142,10 @@ class System(SystemProtocol, Device):
     def run_time_total(self) -> float:
         return self.contactor.run_time_total if self.contactor is not None else 0
 
+    def checkpoint_run_time(self) -> None:
+        if self.contactor is not None:
+            self.contactor.checkpoint_run_time()
+
     def reset_run_time(self) -> None:
         if self.contactor is not None:
             self.contactor.reset_run_time()
@@ -155,15 +162,16 @@ class System(SystemProtocol, Device):
     def mode(self) -> ESystemMode:
         if self.__emergency_stop:
             return ESystemMode.OFF
-        if self.__physical_mode == ESystemMode.OFF:
+        physical_mode = self.__physical_mode()
+        if physical_mode == ESystemMode.OFF:
             return ESystemMode.OFF
-        elif self.__physical_mode == ESystemMode.HAND:
+        elif physical_mode == ESystemMode.HAND:
             return ESystemMode.HAND
         return self.__software_mode
 
     @mode.setter
     def mode(self, value: ESystemMode) -> None:
-        if self.__emergency_stop or self.__physical_mode != ESystemMode.AUTO:
+        if self.__emergency_stop or self.__physical_mode() != ESystemMode.AUTO:
             self.__software_mode = ESystemMode.OFF
         else:
             self.__software_mode = value
@@ -219,7 +227,7 @@ class System(SystemProtocol, Device):
             run_time_total=self.run_time_total,
 
             mode=self.mode,
-            remote_mode=self.__physical_mode,
+            remote_mode=self.__physical_mode(),
             priority=self.priority,
             priority_hand=self.priority_hand,
             priority_auto=self.priority_auto,
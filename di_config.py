@@ -1,6 +1,9 @@
 from flask import Flask
 from flask_socketio import SocketIO
 
+from common.storage.kv_backend_protocol import KVBackendProtocol
+from common.storage.persistence_writer import PersistenceWriter
+from common.storage.settings_watcher import SettingsWatcher
 from core.di.di_container import container
 from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
 from core.thread_manager_protocol import ThreadManagerProtocol
@@ -12,30 +15,39 @@ from device.sensor.sensor import Sensor
 from device.sensor.sensor_protocol import SensorProtocol
 from device.system.system import System
 from device.system.system_protocol import SystemProtocol
-from factory import build_application_systems, build_pressure_sensor, build_application_service, build_thread_manager, build_event_dispatcher, build_io_service
+from factory import EKVBackend, build_application_systems, build_pressure_sensor, build_application_service, build_thread_manager, build_event_dispatcher, build_io_service, build_kv_backend, build_device_service, build_settings_watcher, build_persistence_writer, build_hydraulic_model, build_soe_recorder
 from services.application.application_service_protocol import ApplicationServiceProtocol
-from services.device.device_service import DeviceService
 from services.device.device_service_protocol import DeviceServiceProtocol
 from services.io.io_service_protocol import IOServiceProtocol
+from services.io.modules.sim.hydraulic_model import HydraulicModel
+from services.io.soe_recorder import SoeRecorder
 from station.alternatator.alternator_protocol import AlternatorProtocol
 from station.alternatator.time_alternator import TimeAlternator
 from station.starter.incremental_basic_starter import IncBasicStarter
 from station.station import Station
 from station.station_protocol import StationProtocol
+from web.handlers.diagnostics_handler import DiagnosticsHandler
 from web.handlers.settings_handler import SettingsHandler
+from web.handlers.soe_handler import SoeHandler
 from web.handlers.station_handler import StationHandler
 from web.handlers.system_handler import SystemHandler
 from web.socket_app import socketio, flask_app
 
-def create_di(defaults=True) -> StationProtocol:
+def create_di(defaults=True, simulated=False, kv_backend: EKVBackend = EKVBackend.INI) -> StationProtocol:
     container.register_instance(SocketIO, socketio)
     container.register_instance(Flask, flask_app)
     container.register_instance(ThreadManagerProtocol, build_thread_manager())
     container.register_instance(EventDispatcherProtocol, build_event_dispatcher())
 
-    container.register_instance(IOServiceProtocol, build_io_service())
+    container.register_instance(SoeRecorder, build_soe_recorder())
+    if simulated:
+        container.register_instance(HydraulicModel, build_hydraulic_model())
+    container.register_instance(IOServiceProtocol, build_io_service(simulated=simulated))
+    container.register_instance(KVBackendProtocol, build_kv_backend(kv_backend))
+    container.register_instance(SettingsWatcher, build_settings_watcher())
+    container.register_instance(PersistenceWriter, build_persistence_writer())
     container.register_instance(ApplicationServiceProtocol, build_application_service(defaults=defaults))
-    container.register_instance(DeviceServiceProtocol, DeviceService())
+    container.register_instance(DeviceServiceProtocol, build_device_service())
 
     container.register_factory(
         SensorProtocol,
@@ -98,7 +110,8 @@ def create_di(defaults=True) -> StationProtocol:
     starter = IncBasicStarter(
         app_service=container.resolve(ApplicationServiceProtocol),
         sensor=pressure_sensor,
-        systems=systems
+        systems=systems,
+        event_dispatcher=container.resolve(EventDispatcherProtocol)
     )
 
     station = Station(
@@ -110,8 +123,12 @@ def create_di(defaults=True) -> StationProtocol:
         starter=starter,
         sensor_pressure = pressure_sensor,
         systems=systems,
+        soe=container.resolve(SoeRecorder),
     )
 
+    container.resolve(SettingsWatcher).start()
+    container.resolve(SoeRecorder).start()
+
     #region Web Handlers
     container.register_instance(StationProtocol, station)
 
@@ -134,13 +151,29 @@ def create_di(defaults=True) -> StationProtocol:
         app_service=container.resolve(ApplicationServiceProtocol)
     )
 
+    soe_handler = SoeHandler(
+        socketio=socketio,
+        dispatcher=container.resolve(EventDispatcherProtocol),
+        recorder=container.resolve(SoeRecorder)
+    )
+
+    diagnostics_handler = DiagnosticsHandler(
+        socketio=socketio,
+        dispatcher=container.resolve(EventDispatcherProtocol),
+        flask_app=container.resolve(Flask)
+    )
+
     station_handler.register()
     system_handler.register()
     settings_handler.register()
+    soe_handler.register()
+    diagnostics_handler.register()
 
     container.register_instance(StationHandler, station_handler)
     container.register_instance(SystemHandler, station_handler)
     container.register_instance(SettingsHandler, station_handler)
+    container.register_instance(SoeHandler, soe_handler)
+    container.register_instance(DiagnosticsHandler, diagnostics_handler)
     #endregion
 
     return station
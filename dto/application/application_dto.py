@@ -1,13 +1,14 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 from dto.base_dto import BaseDto
+from dto.config_schema import config_field
 
 
 @dataclass
 class ApplicationDto(BaseDto):
-    level_set_point: float
-    level_offset: float
-    system_count: int = field(kw_only=True, default=3)
-    start_pump_delay: int = field(kw_only=True, default=5)
-    stop_pump_delay: int = field(kw_only=True, default=5)
-    system_fail_to_start_delay: int = field(kw_only=True, default=0)
+    level_set_point: float = config_field("level_set_point", kw_only=False)
+    level_offset: float = config_field("level_offset", kw_only=False)
+    system_count: int = config_field("system_count", 3)
+    start_pump_delay: int = config_field("start_pump_delay", 5)
+    stop_pump_delay: int = config_field("stop_pump_delay", 5)
+    system_fail_to_start_delay: int = config_field("system_fail_to_start_delay", 0)
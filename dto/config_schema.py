@@ -0,0 +1,71 @@
+import configparser
+import dataclasses
+import functools
+import typing
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Mapping, Optional, TypeVar, Type
+
+from dto.base_dto import BaseDto
+
+TDto = TypeVar("TDto", bound=BaseDto)
+
+CONFIG_KEY = "config_key"
+
+
+def config_field(key: str, default: Any = dataclasses.MISSING, kw_only: bool = True) -> Any:
+    """A dataclass field that is persisted under `key` in its config section."""
+    return dataclasses.field(kw_only=kw_only, default=default, metadata={CONFIG_KEY: key.value if isinstance(key, Enum) else key})
+
+
+@dataclass(frozen=True)
+class ConfigField:
+    name: str
+    key: str
+    type: type
+
+
+@functools.cache
+def config_fields(cls: Type[BaseDto]) -> tuple[ConfigField, ...]:
+    """Persisted fields of cls, resolved once per class."""
+    hints = typing.get_type_hints(cls)
+    return tuple(
+        ConfigField(name=f.name, key=f.metadata[CONFIG_KEY], type=hints[f.name])
+        for f in dataclasses.fields(cls)
+        if CONFIG_KEY in f.metadata
+    )
+
+
+def _convert(raw: str, to_type: type) -> Any:
+    if to_type is bool:
+        value = configparser.ConfigParser.BOOLEAN_STATES.get(raw.strip().lower())
+        if value is None:
+            raise ValueError(f"Not a boolean: {raw!r}")
+        return value
+    return to_type(raw)
+
+
+def load_config(cls: Type[TDto], items: Mapping[str, str], default: Optional[TDto] = None, **values: Any) -> TDto:
+    """
+    Builds a cls instance from a whole config section in one pass.
+
+    For every persisted field the stored string is converted to the field's type.
+    Missing or unparsable values fall back to `default`'s value, then to the field default.
+    `values` sets non-persisted fields (device_id, device_name, ...).
+    """
+    for field in config_fields(cls):
+        raw = items.get(field.key)
+        if raw is not None:
+            try:
+                values[field.name] = _convert(raw, field.type)
+                continue
+            except (ValueError, TypeError):
+                pass
+        if default is not None:
+            values[field.name] = getattr(default, field.name)
+    return cls(**values)
+
+
+def dump_config(dto: BaseDto) -> dict[str, Any]:
+    """Persisted fields of dto keyed by their config key."""
+    return {field.key: getattr(dto, field.name) for field in config_fields(type(dto))}
@@ -0,0 +1,27 @@
+from enum import Enum
+
+
+class EConfigKey(str, Enum):
+    ID = "id"
+
+    RUN_TIME_TOTAL = "total_run_time"
+    RUN_TIME_LAST = "last_run_time"
+
+    SENSOR_VALUE_SCALED_MAX = "value_scaled_max"
+    SENSOR_VALUE_SCALED_MIN = "value_scaled_min"
+    SENSOR_AI_MAX = "ai_max"
+    SENSOR_AI_MIN = "ai_min"
+    SENSOR_ALARM_RESET = "alarm_reset"
+    SENSOR_ALARM_START_DELAY = "alarm_start_delay"
+    SENSOR_ALARM_STOP_DELAY = "alarm_stop_delay"
+    SENSOR_ALARM_START_HIGH = "alarm_start_high"
+    SENSOR_ALARM_STOP_HIGH = "alarm_stop_high"
+    SENSOR_ALARM_START_HIGH_HIGH = "alarm_start_high_high"
+    SENSOR_ALARM_STOP_HIGH_HIGH = "alarm_stop_high_high"
+    SENSOR_ALARM_START_LOW = "alarm_start_low"
+    SENSOR_ALARM_STOP_LOW = "alarm_stop_low"
+    SENSOR_ALARM_START_LOW_LOW = "alarm_start_low_low"
+    SENSOR_ALARM_STOP_LOW_LOW = "alarm_stop_low_low"
+    SENSOR_HIGH_HIGH_CRITICAL = "high_high_critical"
+    SENSOR_LOW_LOW_CRITICAL = "low_low_critical"
+    SENSOR_ADJUSTMENT = "adjustment"
@@ -1,36 +1,38 @@
 from dataclasses import dataclass, field
 
+from dto.config_schema import config_field
 from dto.device.device_dto import DeviceDto
+from dto.device.config_key import EConfigKey
 
 @dataclass
 class SensorConfigDto(DeviceDto):
-    value_scaled_max: float = field(kw_only=True, default=0.0)
-    value_scaled_min: float = field(kw_only=True, default=0.0)
+    value_scaled_max: float = config_field(EConfigKey.SENSOR_VALUE_SCALED_MAX, 0.0)
+    value_scaled_min: float = config_field(EConfigKey.SENSOR_VALUE_SCALED_MIN, 0.0)
 
-    ai_max: int = field(kw_only=True, default=0)
-    ai_min: int = field(kw_only=True, default=0)
+    ai_max: int = config_field(EConfigKey.SENSOR_AI_MAX, 0)
+    ai_min: int = config_field(EConfigKey.SENSOR_AI_MIN, 0)
 
-    need_alarm_reset: bool = field(kw_only=True, default=False)
+    need_alarm_reset: bool = config_field(EConfigKey.SENSOR_ALARM_RESET, False)
 
-    alarm_start_delay: int = field(kw_only=True, default=0)
-    alarm_stop_delay: int = field(kw_only=True, default=0)
+    alarm_start_delay: int = config_field(EConfigKey.SENSOR_ALARM_START_DELAY, 0)
+    alarm_stop_delay: int = config_field(EConfigKey.SENSOR_ALARM_STOP_DELAY, 0)
 
-    alarm_start_high: float = field(kw_only=True, default=0.0)
-    alarm_stop_high: float = field(kw_only=True, default=0.0)
+    alarm_start_high: float = config_field(EConfigKey.SENSOR_ALARM_START_HIGH, 0.0)
+    alarm_stop_high: float = config_field(EConfigKey.SENSOR_ALARM_STOP_HIGH, 0.0)
 
-    alarm_start_high_high: float = field(kw_only=True, default=0.0)
-    alarm_stop_high_high: float = field(kw_only=True, default=0.0)
+    alarm_start_high_high: float = config_field(EConfigKey.SENSOR_ALARM_START_HIGH_HIGH, 0.0)
+    alarm_stop_high_high: float = config_field(EConfigKey.SENSOR_ALARM_STOP_HIGH_HIGH, 0.0)
 
-    alarm_start_low: float = field(kw_only=True, default=0.0)
-    alarm_stop_low: float = field(kw_only=True, default=0.0)
+    alarm_start_low: float = config_field(EConfigKey.SENSOR_ALARM_START_LOW, 0.0)
+    alarm_stop_low: float = config_field(EConfigKey.SENSOR_ALARM_STOP_LOW, 0.0)
 
-    alarm_start_low_low: float = field(kw_only=True, default=0.0)
-    alarm_stop_low_low: float = field(kw_only=True, default=0.0)
+    alarm_start_low_low: float = config_field(EConfigKey.SENSOR_ALARM_START_LOW_LOW, 0.0)
+    alarm_stop_low_low: float = config_field(EConfigKey.SENSOR_ALARM_STOP_LOW_LOW, 0.0)
 
-    is_high_high_critical: bool = field(kw_only=True, default=True)
-    is_low_low_critical: bool = field(kw_only=True, default=True)
+    is_high_high_critical: bool = config_field(EConfigKey.SENSOR_HIGH_HIGH_CRITICAL, True)
+    is_low_low_critical: bool = config_field(EConfigKey.SENSOR_LOW_LOW_CRITICAL, True)
 
-    adjustment: float = field(kw_only=True, default=0.0)
+    adjustment: float = config_field(EConfigKey.SENSOR_ADJUSTMENT, 0.0)
 
 @dataclass
 class SensorDto(SensorConfigDto):
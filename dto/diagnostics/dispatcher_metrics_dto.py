@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from dto.base_dto import BaseDto
+
+
+@dataclass
+class HistogramDto(BaseDto):
+    buckets_ms: list[Optional[float]]   # upper bounds, None for +Inf
+    counts: list[int]
+    count: int
+    avg_ms: float
+    max_ms: float
+
+
+@dataclass
+class EventMetricsDto(BaseDto):
+    event_name: str
+    emitted: int
+    errors: int
+    wait: HistogramDto
+
+
+@dataclass
+class SubscriberMetricsDto(BaseDto):
+    event_name: str
+    subscriber: str
+    samples: int
+    errors: int
+    slow_calls: int
+    slow: bool
+    run: HistogramDto
+
+
+@dataclass
+class DispatchPoolDto(BaseDto):
+    workers: int
+    queue_depth: int
+    max_queue_depth: int
+    lane_depths: list[int]
+    max_lag_ms: float
+    submitted: int
+    completed: int
+    dropped: int
+    dropped_by_event: dict[str, int]
+
+
+@dataclass
+class DispatcherMetricsDto(BaseDto):
+    enabled: bool
+    slow_threshold_ms: float
+    sample_every: int
+    events: list[EventMetricsDto]
+    subscribers: list[SubscriberMetricsDto]
+    pool: Optional[DispatchPoolDto] = None
@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from dto.base_dto import BaseDto
+
+
+@dataclass
+class SoeRecordDto(BaseDto):
+    seq: int
+    tick: int
+    timestamp: float
+    kind: str
+    io_id: int
+    level: bool
+
+
+@dataclass
+class SoeWindowDto(BaseDto):
+    trigger_id: Optional[int]
+    reason: Optional[str]
+    timestamp: Optional[float]
+    records: list[SoeRecordDto]
+    path: Optional[str] = None
@@ -1,10 +1,21 @@
+from enum import Enum
 from typing import Sequence
 
-import pigpio
 from flask_socketio import SocketIO
 
+from common.storage.ini_kv_backend import IniKVBackend
+from common.storage.kv_backend_protocol import KVBackendProtocol
+from common.storage.kv_migration import migrate_ini
+from common.storage.persistence_writer import PersistenceWriter
+from common.storage.sharded_ini_kv_backend import ShardedIniKVBackend
+from common.storage.settings_watcher import SettingsWatcher
+from common.storage.sqlite_kv_backend import SqliteKVBackend
+from common.storage.watchable_protocol import WatchableProtocol
 from common.utils import read_number
 from core.di.di_container import container
+from core.dispatcher.async_loop import AsyncLoop
+from core.dispatcher.dispatch_pool import DispatchPool, EOverflowPolicy
+from core.dispatcher.dispatcher_metrics import DispatcherMetrics
 from core.dispatcher.event_dispatcher import EventDispatcher
 from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
 from core.thread_manager_protocol import ThreadManagerProtocol, ThreadManager
@@ -17,35 +28,152 @@ from dto.application.application_dto import ApplicationDto
 from dto.device.sensor_dto import SensorConfigDto
 from services.application.application_service import ApplicationService
 from services.application.application_service_protocol import ApplicationServiceProtocol
+from services.device.device_service import DeviceService
+from services.device.device_service_protocol import DeviceServiceProtocol
+from services.device.run_time_journal import RunTimeJournal
+from services.io.filters.analog_filter_chain import AnalogFilterChain
+from services.io.filters.ema_filter import EmaFilter
+from services.io.filters.median_filter import MedianFilter
 from services.io.io_service import IOService
 from services.io.io_service_protocol import IOServiceProtocol
 from services.io.modules.ads1x.ads1115_ai import Ads1115_AI
-from services.io.modules.gpio.gpio_di import GPIO_DI
-from services.io.modules.gpio.gpio_do import GPIO_DO
+from services.io.soe_recorder import SoeRecorder
+from services.io.modules.ads1x.ads1115_map import ADS1115_DEVICES
+from services.io.modules.sim.hydraulic_model import HydraulicModel, HydraulicModelConfig
+from services.io.modules.sim.sim_ads1115 import SimAds1115
+from services.io.modules.sim.sim_gpio_di import SimGpioDI
+from services.io.modules.sim.sim_gpio_do import SimGpioDO
 
+LEGACY_SETTINGS_PATH = "settings.ini"
 
-def build_io_service() -> IOServiceProtocol:
-    pi = pigpio.pi()
+# Point tag -> level that makes the SOE recorder save the edges around it
+SOE_TRIGGERS: dict[str, bool] = {
+    "station.estop": True,
+}
 
-    ai_module_0 = Ads1115_AI()
-    di_module_0 = GPIO_DI(pi)
-    do_module_0 = GPIO_DO(pi)
+# Point tags whose edges are delivered synchronously on the edge thread, ahead of every queue
+SAFETY_POINTS: tuple[str, ...] = (
+    "station.estop",
+)
+
+# Event type -> what the dispatcher pool does with it when its queue is full
+# (types not listed block). Station updates are periodic snapshots: only the latest matters.
+DISPATCH_POLICIES: dict[str, EOverflowPolicy] = {
+    "StationUpdateEvent": EOverflowPolicy.DROP_OLDEST,
+    "IOChangeSet": EOverflowPolicy.BLOCK,
+}
+
+class EKVBackend(str, Enum):
+    INI = "ini"                  # single settings.ini (legacy)
+    SHARDED_INI = "sharded_ini"  # settings.d/<section>.ini
+    SQLITE = "sqlite"            # settings.db (WAL)
+
+
+def build_io_service(simulated: bool = False) -> IOServiceProtocol:
+    if simulated:
+        model = container.resolve(HydraulicModel)
+        ai_modules = []
+        for (bus, address), tags in ADS1115_DEVICES.items():
+            pressure_input = next((pos for pos, tag in tags.items() if tag == "station.pressure"), None)
+            ai_modules.append(Ads1115_AI(address=address, bus=bus, tags=tags, registers=SimAds1115(model, pressure_input=pressure_input)))
+        di_module_0 = SimGpioDI(model)
+        do_module_0 = SimGpioDO(model)
+    else:
+        # Imported here so the simulation runs without the pigpio daemon and Pi libraries
+        import pigpio
+        from services.io.modules.gpio.gpio_di import GPIO_DI
+        from services.io.modules.gpio.gpio_do import GPIO_DO
+
+        pi = pigpio.pi()
+        ai_modules = [Ads1115_AI(address=address, bus=bus, tags=tags) for (bus, address), tags in ADS1115_DEVICES.items()]
+        di_module_0 = GPIO_DI(pi)
+        do_module_0 = GPIO_DO(pi)
 
     io_service = IOService(
         event_dispatcher=container.resolve(EventDispatcherProtocol),
-        ai_modules=[ai_module_0],
+        ai_modules=ai_modules,
         di_modules=[di_module_0],
-        do_modules=[do_module_0]
+        do_modules=[do_module_0],
+        thread_manager=container.resolve(ThreadManagerProtocol),
+        soe=container.resolve(SoeRecorder)
     )
+    for point in io_service.registry.points("ai"):
+        io_service.set_ai_filter(point.pos, build_ai_filter(raw_span=point.raw_max))
+
+    for tag in SAFETY_POINTS:
+        point = io_service.registry.find(tag)
+        io_service.set_safety(point.kind, point.pos)
+
+    soe = container.resolve(SoeRecorder)
+    for tag, level in SOE_TRIGGERS.items():
+        point = io_service.registry.find(tag)
+        soe.add_trigger(point.kind, point.pos, level, tag)
 
     return io_service
 
+def build_soe_recorder() -> SoeRecorder:
+    thread_manager = container.resolve(ThreadManagerProtocol)
+    return SoeRecorder(directory="soe", thread_manager=thread_manager, run_blocking=thread_manager.run_blocking)
+
+def build_hydraulic_model() -> HydraulicModel:
+    return HydraulicModel(HydraulicModelConfig())
+
+def build_ai_filter(raw_span: int, eu_span: float = 100.0, deadband: float = 0.1) -> AnalogFilterChain:
+    """Median-of-5 against spikes, EMA against noise, deadband in % of span."""
+    return AnalogFilterChain(
+        [MedianFilter(5), EmaFilter(alpha=0.3)],
+        deadband=deadband,
+        eu_per_count=eu_span / raw_span,
+    )
+
 def build_event_dispatcher() -> EventDispatcherProtocol:
-    return EventDispatcher(thread_manager=container.resolve(ThreadManagerProtocol))
+    thread_manager = container.resolve(ThreadManagerProtocol)
+    pool = DispatchPool(thread_manager, workers=4, max_queue=256)
+    for event_name, policy in DISPATCH_POLICIES.items():
+        pool.set_policy(event_name, policy)
+    pool.start()
+    async_loop = AsyncLoop()
+    async_loop.start()
+    return EventDispatcher(thread_manager=thread_manager, pool=pool, metrics=DispatcherMetrics(slow_threshold=0.05), async_loop=async_loop)
 
 def build_thread_manager() -> ThreadManagerProtocol:
     return ThreadManager(socketio=container.resolve(SocketIO))
 
+def build_kv_backend(kind: EKVBackend = EKVBackend.INI) -> KVBackendProtocol:
+    run_blocking = container.resolve(ThreadManagerProtocol).run_blocking
+    if kind == EKVBackend.INI:
+        return IniKVBackend(LEGACY_SETTINGS_PATH, run_blocking=run_blocking)
+
+    if kind == EKVBackend.SHARDED_INI:
+        backend = ShardedIniKVBackend("settings.d", run_blocking=run_blocking)
+    else:
+        backend = SqliteKVBackend("settings.db", run_blocking=run_blocking)
+    # Once per backend: the migration records itself in the target
+    migrate_ini(LEGACY_SETTINGS_PATH, backend)
+    return backend
+
+def build_settings_watcher() -> SettingsWatcher:
+    watcher = SettingsWatcher(
+        event_dispatcher=container.resolve(EventDispatcherProtocol),
+        thread_manager=container.resolve(ThreadManagerProtocol)
+    )
+    backend = container.resolve(KVBackendProtocol)
+    if isinstance(backend, WatchableProtocol):
+        watcher.watch(backend)
+    return watcher
+
+def build_persistence_writer() -> PersistenceWriter:
+    writer = PersistenceWriter(thread_manager=container.resolve(ThreadManagerProtocol))
+    writer.start()
+    return writer
+
+def build_device_service() -> DeviceServiceProtocol:
+    return DeviceService(
+        backend=container.resolve(KVBackendProtocol),
+        run_time_store=RunTimeJournal(run_blocking=container.resolve(ThreadManagerProtocol).run_blocking),
+        writer=container.resolve(PersistenceWriter)
+    )
+
 def build_application_service(defaults = True) -> ApplicationServiceProtocol:
     system_count = 3 if defaults else read_number(f"Enter systems count:", int)
     set_point = 50.0 if defaults else read_number(f"Enter set point:", float)
@@ -54,39 +182,43 @@ def build_application_service(defaults = True) -> ApplicationServiceProtocol:
     stop_pump_delay = 5 if defaults else read_number(f"Enter stop pumps delay (s):", int)
 
 
-    application_service = ApplicationService(ApplicationDto(
-        system_count=system_count,
-        level_set_point=set_point,
-        level_offset=offset,
-        start_pump_delay=start_pump_delay,
-        stop_pump_delay=stop_pump_delay
-    ))
+    application_service = ApplicationService(
+        ApplicationDto(
+            system_count=system_count,
+            level_set_point=set_point,
+            level_offset=offset,
+            start_pump_delay=start_pump_delay,
+            stop_pump_delay=stop_pump_delay
+        ),
+        event_dispatcher=container.resolve(EventDispatcherProtocol),
+        store=container.resolve(KVBackendProtocol).get_store("app"),
+        writer=container.resolve(PersistenceWriter)
+    )
 
     return application_service
 
 def build_contactor_list(defaults = True) -> Sequence[ContactorProtocol]:
     app_service = container.resolve(ApplicationServiceProtocol)
+    registry = container.resolve(IOServiceProtocol).registry
     contactor_list = []
     for i in range(0, app_service.system_count):
         contactor_list.append(
             container.resolve_new(
                 ContactorProtocol,
                 device_id=i + 1,
-                di_running=i if defaults else read_number(f"Enter digital input number for RUNNING of contactor {i + 1}:", int),
-                do_run=i if defaults else read_number(f"Enter digital output number for RUN CMD of contactor {i + 1}:", int)
+                di_running=registry.pos_of(f"pump{i + 1}.run_fb") if defaults else read_number(f"Enter digital input number for RUNNING of contactor {i + 1}:", int),
+                do_run=registry.pos_of(f"pump{i + 1}.run_cmd") if defaults else read_number(f"Enter digital output number for RUN CMD of contactor {i + 1}:", int)
             )
         )
     return contactor_list
 
 def build_application_systems(defaults = True) -> Sequence[SystemProtocol]:
     app_service = container.resolve(ApplicationServiceProtocol)
+    registry = container.resolve(IOServiceProtocol).registry
 
     contactor_list = build_contactor_list(defaults=defaults)
     systems_list = []
 
-    position_hand = app_service.system_count
-    position_auto = position_hand + 1
-
     for i in range(0, app_service.system_count):
         systems_list.append(
             container.resolve_new(
@@ -95,12 +227,10 @@ def build_application_systems(defaults = True) -> Sequence[SystemProtocol]:
                 contactor=contactor_list[i],
                 pump=None,
                 mode=ESystemMode.OFF,
-                di_hand=position_hand if defaults else read_number(f"Enter digital input number for HAND of system {i + 1}:", int),
-                di_auto=position_auto if defaults else read_number(f"Enter digital input number for AUTO of system {i + 1}:", int),
+                di_hand=registry.pos_of(f"pump{i + 1}.hand") if defaults else read_number(f"Enter digital input number for HAND of system {i + 1}:", int),
+                di_auto=registry.pos_of(f"pump{i + 1}.auto") if defaults else read_number(f"Enter digital input number for AUTO of system {i + 1}:", int),
             )
         )
-        position_hand = position_auto + 1
-        position_auto = position_hand + 1
     return systems_list
 
 def build_pressure_sensor(defaults = True) -> SensorProtocol:
@@ -108,7 +238,7 @@ def build_pressure_sensor(defaults = True) -> SensorProtocol:
 
     value_scaled_max = 100.0 if defaults else read_number(f"Enter pressure sensor ENG MAX VALUE:", float)
     value_scaled_min = 0.0 if defaults else read_number(f"Enter pressure sensor ENG MIN VALUE:", float)
-    ai_id = 0 if defaults else read_number(f"Enter analog input number:", int)
+    ai_id = io_service.registry.pos_of("station.pressure") if defaults else read_number(f"Enter analog input number:", int)
     alarm_start_delay = 5 if defaults else read_number(f"Enter alarm start delay in (s):", int)
     alarm_stop_delay = 5 if defaults else read_number(f"Enter alarm stop delay in (s):", int)
 
@@ -6,16 +6,24 @@ from flask_socketio import SocketIO
 from flask import Flask
 
 from core.di.di_container import container
+from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
 
 
 
+import argparse
+import os
 from pathlib import Path
 import ssl
 
 import di_config
+from factory import EKVBackend
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sim", action="store_true", help="simulated IO and hydraulics instead of the Pi hardware")
+    args = parser.parse_args()
+
     print("[MAIN] Starting...")
     # cert_path = Path("web/certs/cert.pem")
     # key_path = Path("web/certs/key.pem")
@@ -25,7 +33,11 @@ if __name__ == "__main__":
     context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
     context.load_cert_chain(cert_path, key_path)
 
-    station = di_config.create_di()
+    # Settings storage: "ini" (settings.ini, default), "sharded_ini" or "sqlite"
+    kv_backend = EKVBackend(os.environ.get("PDWS_SETTINGS", EKVBackend.INI.value))
+    station = di_config.create_di(simulated=args.sim, kv_backend=kv_backend)
+    if args.sim:
+        print("[MAIN] Simulated IO")
     socketio = container.resolve(SocketIO)
     flask_app = container.resolve(Flask)
 
@@ -77,4 +89,7 @@ if __name__ == "__main__":
 
     except Exception as e:
         print(f"[TLS] Failed to start with TLS: {e}. Falling back to HTTP.")
-        socketio.run(flask_app, **run_kwargs)
\ No newline at end of file
+        socketio.run(flask_app, **run_kwargs)
+    finally:
+        # Cancels coroutine subscribers still running on the dispatcher's loop
+        container.resolve(EventDispatcherProtocol).stop()
\ No newline at end of file
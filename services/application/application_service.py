@@ -1,73 +1,139 @@
-from typing import TypedDict, Unpack
+import dataclasses
+import threading
+from typing import Optional, Any
 
 from common.kv_config import KVConfig
+from common.storage.persistence_writer import PersistenceWriter
+from common.storage.events.settings_changed_event import SettingsChangedEvent
+from common.storage.kv_store_protocol import KVStoreProtocol
+from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
 from core.serializable_protocol import SerializableProtocol
 from dto.application.application_dto import ApplicationDto
+from dto.config_schema import load_config, dump_config
 from services.application.application_service_protocol import ApplicationServiceProtocol
+from services.application.events.app_config_changed_event import AppConfigChangedEvent
 
 class ApplicationService(ApplicationServiceProtocol):
-    def __init__(self, config: ApplicationDto) -> None:
-        self.__config = KVConfig(section="app")
+    """
+    Application settings held in memory as an ApplicationDto.
 
-        merged = config.to_dict() | self.__config.items()
+    Reads return fields of the current snapshot without locking; every change
+    replaces the snapshot (it is never mutated in place), publishes an
+    AppConfigChangedEvent and hands the new values to the PersistenceWriter, which
+    coalesces bursts of changes into one write. Without a writer changes are
+    written immediately.
+    """
+    def __init__(
+            self,
+            config: ApplicationDto,
+            event_dispatcher: Optional[EventDispatcherProtocol] = None,
+            store: Optional[KVStoreProtocol] = None,
+            writer: Optional[PersistenceWriter] = None,
+    ) -> None:
+        self.__store = store if store is not None else KVConfig(section="app")
+        self.__event_dispatcher = event_dispatcher
+        self.__writer = writer
 
-        self.update_config(ApplicationDto(**merged))
+        self.__lock = threading.Lock()
+
+        self.__config = self.__normalize(load_config(ApplicationDto, self.__store.items(), default=config))
+        self.__store.set_many(dump_config(self.__config))
+
+        if event_dispatcher is not None:
+            event_dispatcher.subscribe(SettingsChangedEvent, self.__handle_settings_changed, key=self.__store.section)
+
+    def __handle_settings_changed(self, event: SettingsChangedEvent) -> None:
+        # Edited by another process: adopt it without writing it back. A local change
+        # still queued in the writer goes to the store first, or the reload would drop it.
+        self.flush()
+        external = self.__normalize(load_config(ApplicationDto, self.__store.items(), default=self.__config))
+        self.__update(persist=False, **dataclasses.asdict(external))
+
+    @property
+    def config(self) -> ApplicationDto:
+        return self.__config
 
     def update_config(self, config: ApplicationDto) -> None:
+        self.__update(**dataclasses.asdict(self.__normalize(config)))
 
-        self.__config.set("system_count", config.system_count if config.system_count else 3)
-        self.__config.set("level_set_point", config.level_set_point if config.level_set_point else 0.0)
-        self.__config.set("level_offset", config.level_offset if config.level_offset else 0.0)
-        self.__config.set("start_pump_delay", config.start_pump_delay if config.start_pump_delay else 0)
-        self.__config.set("stop_pump_delay", config.stop_pump_delay if config.stop_pump_delay else 0)
-        self.__config.set("system_fail_to_start_delay", config.system_fail_to_start_delay if config.system_fail_to_start_delay else 0)
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until pending changes are written. Returns False on timeout."""
+        return self.__writer.flush(timeout) if self.__writer is not None else True
 
     @property
     def system_fail_to_start_delay(self) -> int:
-        return self.__config.get_int("system_fail_to_start_delay", 0)
+        return self.__config.system_fail_to_start_delay
 
     @system_fail_to_start_delay.setter
     def system_fail_to_start_delay(self, value: int) -> None:
-        self.__config.set("system_fail_to_start_delay", value)
+        self.__update(system_fail_to_start_delay=value)
 
     @property
     def system_count(self) -> int:
-        return self.__config.get_int("system_count", 3)
+        return self.__config.system_count
 
     @property
     def level_set_point(self) -> float:
-        return self.__config.get_float("level_set_point", 0.0)
+        return self.__config.level_set_point
     @level_set_point.setter
     def level_set_point(self, value: float) -> None:
-        self.__config.set("level_set_point", value)
+        self.__update(level_set_point=value)
 
     @property
     def level_offset(self) -> float:
-        return self.__config.get_float("level_offset", 0.0)
+        return self.__config.level_offset
     @level_offset.setter
     def level_offset(self, value: float) -> None:
-        self.__config.set("level_offset", value)
+        self.__update(level_offset=value)
 
     @property
     def start_pump_delay(self) -> int:
-        return self.__config.get_int("start_pump_delay", 0)
+        return self.__config.start_pump_delay
     @start_pump_delay.setter
     def start_pump_delay(self, value: int) -> None:
-        self.__config.set("start_pump_delay", value)
+        self.__update(start_pump_delay=value)
 
     @property
     def stop_pump_delay(self) -> int:
-        return self.__config.get_int("stop_pump_delay", 0)
+        return self.__config.stop_pump_delay
     @stop_pump_delay.setter
     def stop_pump_delay(self, value: int) -> None:
-        self.__config.set("stop_pump_delay", value)
+        self.__update(stop_pump_delay=value)
 
     def to_serializable(self) -> SerializableProtocol:
+        return self.__config
+
+    @staticmethod
+    def __normalize(config: ApplicationDto) -> ApplicationDto:
         return ApplicationDto(
-            system_count=self.system_count,
-            level_set_point=self.level_set_point,
-            level_offset=self.level_offset,
-            start_pump_delay=self.start_pump_delay,
-            stop_pump_delay=self.stop_pump_delay,
-            system_fail_to_start_delay=self.system_fail_to_start_delay,
-        )
\ No newline at end of file
+            system_count=int(config.system_count) if config.system_count else 3,
+            level_set_point=float(config.level_set_point) if config.level_set_point else 0.0,
+            level_offset=float(config.level_offset) if config.level_offset else 0.0,
+            start_pump_delay=int(config.start_pump_delay) if config.start_pump_delay else 0,
+            stop_pump_delay=int(config.stop_pump_delay) if config.stop_pump_delay else 0,
+            system_fail_to_start_delay=int(config.system_fail_to_start_delay) if config.system_fail_to_start_delay else 0,
+        )
+
+    def __update(self, persist: bool = True, **changes: Any) -> None:
+        with self.__lock:
+            old = self.__config
+            changed = tuple(name for name, value in changes.items() if getattr(old, name) != value)
+            if not changed:
+                return
+            new = dataclasses.replace(old, **changes)
+            self.__config = new
+
+        # Outside the lock: submit() waits while the writer's queue is full, other updates must not.
+        # The current snapshot rather than `new`, in case a racing update already replaced it.
+        if persist:
+            self.__persist(self.__config)
+
+        if self.__event_dispatcher is not None:
+            self.__event_dispatcher.emit_async(AppConfigChangedEvent(config_old=old, config_new=new, changed=changed))
+
+    def __persist(self, config: ApplicationDto) -> None:
+        values = dump_config(config)
+        if self.__writer is not None:
+            self.__writer.submit(self.__store, values)
+        else:
+            self.__store.set_many(values)
@@ -5,6 +5,9 @@ from dto.application.application_dto import ApplicationDto
 
 
 class ApplicationServiceProtocol(Protocol):
+    @property
+    def config(self) -> ApplicationDto: ...
+
     def update_config(self, config: ApplicationDto) -> None: ...
 
     @property
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+from dto.application.application_dto import ApplicationDto
+
+
+@dataclass
+class AppConfigChangedEvent:
+    config_old: ApplicationDto
+    config_new: ApplicationDto
+    changed: tuple[str, ...]
@@ -1,114 +1,91 @@
-from enum import Enum
+import dataclasses
 from typing import Optional
 
-from common.kv_config import KVConfig
+from common.storage.ini_kv_backend import IniKVBackend
+from common.storage.kv_backend_protocol import KVBackendProtocol
+from common.storage.kv_store_protocol import KVStoreProtocol
+from common.storage.persistence_writer import PersistenceWriter
+from dto.config_schema import load_config, dump_config
 from dto.device.sensor_dto import SensorConfigDto
+from dto.device.config_key import EConfigKey
 from services.device.device_service_protocol import DeviceServiceProtocol
-
-class EConfigKey(str, Enum):
-    ID = "id"
-
-    RUN_TIME_TOTAL = "total_run_time"
-    RUN_TIME_LAST = "last_run_time"
-
-    SENSOR_VALUE_SCALED_MAX = "value_scaled_max"
-    SENSOR_VALUE_SCALED_MIN = "value_scaled_min"
-    SENSOR_AI_MAX = "ai_max"
-    SENSOR_AI_MIN = "ai_min"
-    SENSOR_ALARM_RESET = "alarm_reset"
-    SENSOR_ALARM_START_DELAY = "alarm_start_delay"
-    SENSOR_ALARM_STOP_DELAY = "alarm_stop_delay"
-    SENSOR_ALARM_START_HIGH = "alarm_start_high"
-    SENSOR_ALARM_STOP_HIGH = "alarm_stop_high"
-    SENSOR_ALARM_START_HIGH_HIGH = "alarm_start_high_high"
-    SENSOR_ALARM_STOP_HIGH_HIGH = "alarm_stop_high_high"
-    SENSOR_ALARM_START_LOW = "alarm_start_low"
-    SENSOR_ALARM_STOP_LOW = "alarm_stop_low"
-    SENSOR_ALARM_START_LOW_LOW = "alarm_start_low_low"
-    SENSOR_ALARM_STOP_LOW_LOW = "alarm_stop_low_low"
-    SENSOR_HIGH_HIGH_CRITICAL = "high_high_critical"
-    SENSOR_LOW_LOW_CRITICAL = "low_low_critical"
-    SENSOR_ADJUSTMENT = "adjustment"
+from services.device.run_time_journal import RunTimeJournal
+from services.device.run_time_store_protocol import RunTimeStoreProtocol
 
 class DeviceService(DeviceServiceProtocol):
-    def __init__(self):
-        self.__configs: dict[str, KVConfig] = {}
+    def __init__(self, backend: Optional[KVBackendProtocol] = None, run_time_store: Optional[RunTimeStoreProtocol] = None, writer: Optional[PersistenceWriter] = None):
+        self.__backend = backend if backend is not None else IniKVBackend()
+        self.__writer = writer
+        self.__sensor_configs: dict[str, SensorConfigDto] = {}
+        self.__run_time_store = run_time_store if run_time_store is not None else RunTimeJournal()
+
+    def __run_times(self, device_name: str) -> RunTimeStoreProtocol:
+        """
+        Run-time store for device_name, seeded once from the values that older
+        versions kept in settings.ini.
+        """
+        store = self.__run_time_store
+        if not store.contains(device_name):
+            config = self.get_config(device_name)
+            store.set_times(
+                device_name,
+                total=config.get_float(EConfigKey.RUN_TIME_TOTAL, 0.0),
+                last=config.get_float(EConfigKey.RUN_TIME_LAST, 0.0),
+            )
+        return store
 
     def get_device_total_run_time(self, device_name: str) -> float:
-        config = self.get_config(device_name)
-        return config.get_float(EConfigKey.RUN_TIME_TOTAL, 0.0)
+        return self.__run_times(device_name).get_total(device_name)
 
     def set_device_total_run_time(self, device_name: str, run_time: float) -> None:
-        config = self.get_config(device_name)
-        config.set(EConfigKey.RUN_TIME_TOTAL, run_time)
+        self.__run_times(device_name).set_times(device_name, total=run_time)
 
     def add_device_total_run_time(self, device_name: str, run_time: float) -> float:
-        current_total = self.get_device_total_run_time(device_name)
-        new_total = current_total + run_time
-        self.set_device_total_run_time(device_name, new_total)
+        store = self.__run_times(device_name)
+        new_total = store.get_total(device_name) + run_time
+        store.set_times(device_name, total=new_total)
         return new_total
 
     def get_device_last_run_time(self, device_name: str) -> float:
-        config = self.get_config(device_name)
-        return config.get_float(EConfigKey.RUN_TIME_LAST, 0.0)
+        return self.__run_times(device_name).get_last(device_name)
 
     def set_device_last_run_time(self, device_name: str, run_time: float) -> None:
-        config = self.get_config(device_name)
-        config.set(EConfigKey.RUN_TIME_LAST, run_time)
+        self.__run_times(device_name).set_times(device_name, last=run_time)
+
+    def record_device_stop(self, device_name: str, run_time: float) -> float:
+        return self.__run_times(device_name).record_stop(device_name, run_time)
+
+    def checkpoint_device_run_time(self, device_name: str, run_time_current: float) -> None:
+        self.__run_times(device_name).checkpoint(device_name, run_time_current)
 
     def clear_device_run_times(self, device_name: str) -> None:
-        config = self.get_config(device_name)
-        config.set(EConfigKey.RUN_TIME_TOTAL, 0.0)
-        config.set(EConfigKey.RUN_TIME_LAST, 0.0)
+        self.__run_times(device_name).set_times(device_name, total=0.0, last=0.0)
 
-    def get_config(self, device_name: str) -> KVConfig:
-        if not device_name in self.__configs:
-            self.__configs[device_name] = KVConfig(section=device_name)
-        return self.__configs[device_name]
+    def get_config(self, device_name: str) -> KVStoreProtocol:
+        return self.__backend.get_store(device_name)
 
     def get_sensor_config(self, device_id: int, device_name: str, default: Optional[SensorConfigDto] = None) -> Optional[SensorConfigDto]:
-        config = self.get_config(device_name)
-        return SensorConfigDto(
-            device_id=device_id,
-            device_name=device_name,
-            value_scaled_max=config.get_float(EConfigKey.SENSOR_VALUE_SCALED_MAX, default.value_scaled_max if default is not None else 0.0),
-            value_scaled_min=config.get_float(EConfigKey.SENSOR_VALUE_SCALED_MIN, default.value_scaled_min if default is not None else 0.0),
-            ai_max=config.get_int(EConfigKey.SENSOR_AI_MAX, default.ai_max if default is not None else 0),
-            ai_min=config.get_int(EConfigKey.SENSOR_AI_MIN, default.ai_min if default is not None else 0),
-            need_alarm_reset=config.get_bool(EConfigKey.SENSOR_ALARM_RESET, default.need_alarm_reset if default is not None else False),
-            alarm_start_delay=config.get_int(EConfigKey.SENSOR_ALARM_START_DELAY, default.alarm_start_delay if default is not None else 0),
-            alarm_stop_delay=config.get_int(EConfigKey.SENSOR_ALARM_STOP_DELAY, default.alarm_stop_delay if default is not None else 0),
-            alarm_start_high=config.get_float(EConfigKey.SENSOR_ALARM_START_HIGH, default.alarm_start_high if default is not None else 0.0),
-            alarm_stop_high=config.get_float(EConfigKey.SENSOR_ALARM_STOP_HIGH, default.alarm_stop_high if default is not None else 0.0),
-            alarm_start_high_high=config.get_float(EConfigKey.SENSOR_ALARM_START_HIGH_HIGH, default.alarm_start_high_high if default is not None else 0.0),
-            alarm_stop_high_high=config.get_float(EConfigKey.SENSOR_ALARM_STOP_HIGH_HIGH, default.alarm_stop_high_high if default is not None else 0.0),
-            alarm_start_low=config.get_float(EConfigKey.SENSOR_ALARM_START_LOW, default.alarm_start_low if default is not None else 0.0),
-            alarm_stop_low=config.get_float(EConfigKey.SENSOR_ALARM_STOP_LOW, default.alarm_stop_low if default is not None else 0.0),
-            alarm_start_low_low=config.get_float(EConfigKey.SENSOR_ALARM_START_LOW_LOW, default.alarm_start_low_low if default is not None else 0.0),
-            alarm_stop_low_low=config.get_float(EConfigKey.SENSOR_ALARM_STOP_LOW_LOW, default.alarm_stop_low_low if default is not None else 0.0),
-            is_high_high_critical=config.get_bool(EConfigKey.SENSOR_HIGH_HIGH_CRITICAL, default.is_high_high_critical if default is not None else False),
-            is_low_low_critical=config.get_bool(EConfigKey.SENSOR_LOW_LOW_CRITICAL, default.is_low_low_critical if default is not None else False),
-            adjustment=config.get_float(EConfigKey.SENSOR_ADJUSTMENT, default.adjustment if default is not None else 0.0),
-        )
+        cached = self.__sensor_configs.get(device_name)
+        if cached is None:
+            cached = load_config(SensorConfigDto, self.get_config(device_name).items(), default, device_id=device_id, device_name=device_name)
+            self.__sensor_configs[device_name] = cached
+        # Callers mutate the returned config, keep the cached copy private
+        return dataclasses.replace(cached, device_id=device_id, device_name=device_name)
+
+    def invalidate_config(self, device_name: str) -> None:
+        """
+        Drops typed configs cached for device_name so the next get re-reads storage.
+        Pending writes go out first, so the re-read does not drop a local change.
+        """
+        if self.__writer is not None:
+            self.__writer.flush()
+        self.__sensor_configs.pop(device_name, None)
 
     def set_sensor_config(self, device_name: str, sensor: SensorConfigDto) -> None:
-        print(f"set_sensor_config adjustment: {sensor.adjustment}")
-        config = self.get_config(device_name)
-        config.set(EConfigKey.SENSOR_VALUE_SCALED_MAX, sensor.value_scaled_max)
-        config.set(EConfigKey.SENSOR_VALUE_SCALED_MIN, sensor.value_scaled_min)
-        config.set(EConfigKey.SENSOR_AI_MAX, sensor.ai_max)
-        config.set(EConfigKey.SENSOR_AI_MIN, sensor.ai_min)
-        config.set(EConfigKey.SENSOR_ALARM_RESET, sensor.need_alarm_reset)
-        config.set(EConfigKey.SENSOR_ALARM_START_DELAY, sensor.alarm_start_delay)
-        config.set(EConfigKey.SENSOR_ALARM_STOP_DELAY, sensor.alarm_stop_delay)
-        config.set(EConfigKey.SENSOR_ALARM_START_HIGH, sensor.alarm_start_high)
-        config.set(EConfigKey.SENSOR_ALARM_STOP_HIGH, sensor.alarm_stop_high)
-        config.set(EConfigKey.SENSOR_ALARM_START_HIGH_HIGH, sensor.alarm_start_high_high)
-        config.set(EConfigKey.SENSOR_ALARM_STOP_HIGH_HIGH, sensor.alarm_stop_high_high)
-        config.set(EConfigKey.SENSOR_ALARM_START_LOW, sensor.alarm_start_low)
-        config.set(EConfigKey.SENSOR_ALARM_STOP_LOW, sensor.alarm_stop_low)
-        config.set(EConfigKey.SENSOR_ALARM_START_LOW_LOW, sensor.alarm_start_low_low)
-        config.set(EConfigKey.SENSOR_ALARM_STOP_LOW_LOW, sensor.alarm_stop_low_low)
-        config.set(EConfigKey.SENSOR_HIGH_HIGH_CRITICAL, sensor.is_high_high_critical)
-        config.set(EConfigKey.SENSOR_LOW_LOW_CRITICAL, sensor.is_low_low_critical)
-        config.set(EConfigKey.SENSOR_ADJUSTMENT, sensor.adjustment)
\ No newline at end of file
+        """Updates the cached config at once; the write goes through the PersistenceWriter when there is one."""
+        self.__sensor_configs[device_name] = dataclasses.replace(sensor)
+        values = dump_config(sensor)
+        if self.__writer is not None:
+            self.__writer.submit(self.get_config(device_name), values)
+        else:
+            self.get_config(device_name).set_many(values)
@@ -15,8 +15,14 @@ class DeviceServiceProtocol(Protocol):
 
     def set_device_last_run_time(self, device_name: str, run_time: float) -> None: ...
 
+    def record_device_stop(self, device_name: str, run_time: float) -> float: ...
+
+    def checkpoint_device_run_time(self, device_name: str, run_time_current: float) -> None: ...
+
     def clear_device_run_times(self, device_name: str) -> None: ...
 
     def get_sensor_config(self, device_id: int, device_name: str, default: Optional[SensorConfigDto] = None) -> Optional[SensorConfigDto]: ...
 
+    def invalidate_config(self, device_name: str) -> None: ...
+
     def set_sensor_config(self, device_name: str, sensor: SensorConfigDto) -> None: ...
\ No newline at end of file
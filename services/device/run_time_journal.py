@@ -0,0 +1,241 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, TextIO, Callable, Any
+
+from services.device.run_time_store_protocol import RunTimeStoreProtocol
+
+
+@dataclass
+class RunTimeRecord:
+    total: float = 0.0
+    last: float = 0.0
+    # Run time of the current (unfinished) run as of the last checkpoint
+    current: float = 0.0
+
+
+class RunTimeJournal(RunTimeStoreProtocol):
+    """
+    Append-only store for device run hours.
+
+    Every change is one short line appended to ``<name>.journal`` and fsync'ed:
+
+        <crc32 hex> {"s": seq, "op": ..., "d": device, ...}
+
+    Lines with a bad checksum (torn write on power loss) end the replay. After
+    ``compact_after`` records the state is written to ``<name>.snapshot.json`` with
+    an atomic replace and the journal is truncated. The snapshot keeps the last
+    applied sequence number, so a crash between both steps never applies a record
+    twice.
+
+    Running devices checkpoint their current run time at most every
+    ``checkpoint_interval`` seconds. On load, a checkpoint that was never closed by
+    a stop (power cut while running) is folded into the totals. Load only compacts
+    when it replayed records or closed such a run.
+
+    Every fsync (journal appends, compaction, the snapshot) runs through
+    ``run_blocking`` when given, so it does not stall the event loop.
+    """
+    def __init__(self, directory: str | os.PathLike = ".", name: str = "run_times", checkpoint_interval: float = 5.0, compact_after: int = 2000, run_blocking: Optional[Callable[..., Any]] = None):
+        self.__directory = Path(directory)
+        self.__journal_path = self.__directory / f"{name}.journal"
+        self.__snapshot_path = self.__directory / f"{name}.snapshot.json"
+        self.__checkpoint_interval = checkpoint_interval
+        self.__compact_after = compact_after
+        self.__run_blocking = run_blocking
+
+        self.__lock = threading.RLock()
+        self.__records: dict[str, RunTimeRecord] = {}
+        self.__last_checkpoint: dict[str, float] = {}
+        self.__seq = 0
+        self.__journal_count = 0
+        self.__journal: Optional[TextIO] = None
+
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.__load()
+
+    # ---------- public API ----------
+
+    def contains(self, device_name: str) -> bool:
+        with self.__lock:
+            return device_name in self.__records
+
+    def get_total(self, device_name: str) -> float:
+        with self.__lock:
+            record = self.__records.get(device_name)
+            return record.total if record else 0.0
+
+    def get_last(self, device_name: str) -> float:
+        with self.__lock:
+            record = self.__records.get(device_name)
+            return record.last if record else 0.0
+
+    def set_times(self, device_name: str, total: Optional[float] = None, last: Optional[float] = None) -> None:
+        entry = {"op": "set", "d": device_name}
+        if total is not None:
+            entry["total"] = total
+        if last is not None:
+            entry["last"] = last
+        self.__append(entry)
+
+    def record_stop(self, device_name: str, run_time: float) -> float:
+        """
+        Closes a run: adds it to the total and makes it the last run time.
+        Returns the new total.
+        """
+        with self.__lock:
+            self.__append({"op": "stop", "d": device_name, "v": run_time})
+            self.__last_checkpoint.pop(device_name, None)
+            return self.__records[device_name].total
+
+    def checkpoint(self, device_name: str, run_time_current: float) -> None:
+        """
+        Persists the run time of a device that is still running. Calls closer than
+        checkpoint_interval to the previous one are ignored.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            last = self.__last_checkpoint.get(device_name)
+            if last is not None and (now - last) < self.__checkpoint_interval:
+                return
+            self.__last_checkpoint[device_name] = now
+            self.__append({"op": "cp", "d": device_name, "v": run_time_current})
+
+    def compact(self) -> None:
+        with self.__lock:
+            snapshot = {
+                "seq": self.__seq,
+                "devices": {name: {"total": r.total, "last": r.last, "current": r.current} for name, r in self.__records.items()},
+            }
+            self.__atomic_write(self.__snapshot_path, json.dumps(snapshot, indent=1))
+
+            self.__close_journal()
+            with open(self.__journal_path, "w", encoding="utf-8") as f:
+                f.flush()
+                self.__fsync(f.fileno())
+            self.__journal_count = 0
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__close_journal()
+
+    # ---------- internals ----------
+
+    def __append(self, entry: dict) -> None:
+        with self.__lock:
+            self.__seq += 1
+            entry["s"] = self.__seq
+            self.__apply(entry)
+
+            payload = json.dumps(entry, separators=(",", ":"))
+            journal = self.__open_journal()
+            journal.write(f"{zlib.crc32(payload.encode('utf-8')):08x} {payload}\n")
+            journal.flush()
+            self.__fsync(journal.fileno())
+
+            self.__journal_count += 1
+            if self.__journal_count >= self.__compact_after:
+                self.compact()
+
+    def __apply(self, entry: dict) -> None:
+        record = self.__records.setdefault(entry["d"], RunTimeRecord())
+        match entry["op"]:
+            case "set":
+                if "total" in entry:
+                    # A reset total drops the open run too, or a power cut would add it back on load
+                    record.total = float(entry["total"])
+                    record.current = 0.0
+                    self.__last_checkpoint.pop(entry["d"], None)
+                record.last = float(entry.get("last", record.last))
+            case "stop":
+                record.total += float(entry["v"])
+                record.last = float(entry["v"])
+                record.current = 0.0
+            case "cp":
+                record.current = float(entry["v"])
+
+    def __load(self) -> None:
+        snapshot_seq = 0
+        if self.__snapshot_path.exists():
+            data = json.loads(self.__snapshot_path.read_text(encoding="utf-8"))
+            snapshot_seq = int(data.get("seq", 0))
+            for name, values in data.get("devices", {}).items():
+                self.__records[name] = RunTimeRecord(
+                    total=float(values.get("total", 0.0)),
+                    last=float(values.get("last", 0.0)),
+                    current=float(values.get("current", 0.0)),
+                )
+        self.__seq = snapshot_seq
+
+        replayed = 0
+        if self.__journal_path.exists():
+            with open(self.__journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    entry = self.__parse_line(line)
+                    if entry is None:
+                        print(f"[RunTimeJournal] Discarding corrupt tail of {self.__journal_path}")
+                        break
+                    if entry["s"] <= snapshot_seq:
+                        continue
+                    self.__apply(entry)
+                    self.__seq = entry["s"]
+                    replayed += 1
+
+        # Devices that were running when the process died: close their run at the last checkpoint
+        folded = 0
+        for record in self.__records.values():
+            if record.current > 0.0:
+                record.total += record.current
+                record.last = record.current
+                record.current = 0.0
+                folded += 1
+
+        # Start with a clean snapshot and an empty journal, unless they already are
+        if replayed or folded:
+            self.compact()
+
+    def __fsync(self, fd: int) -> None:
+        if self.__run_blocking is None:
+            os.fsync(fd)
+        else:
+            self.__run_blocking(os.fsync, fd)
+
+    @staticmethod
+    def __parse_line(line: str) -> Optional[dict]:
+        checksum, _, payload = line.rstrip("\n").partition(" ")
+        try:
+            if int(checksum, 16) != zlib.crc32(payload.encode("utf-8")):
+                return None
+            return json.loads(payload)
+        except ValueError:
+            return None
+
+    def __open_journal(self) -> TextIO:
+        if self.__journal is None:
+            self.__journal = open(self.__journal_path, "a", encoding="utf-8")
+        return self.__journal
+
+    def __close_journal(self) -> None:
+        if self.__journal is not None:
+            self.__journal.close()
+            self.__journal = None
+
+    def __atomic_write(self, path: Path, content: str) -> None:
+        tmp_fd, tmp_name = tempfile.mkstemp(prefix=path.name + ".", dir=path.parent)
+        try:
+            with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                self.__fsync(f.fileno())
+            os.replace(tmp_name, path)
+        finally:
+            try:
+                if os.path.exists(tmp_name):
+                    os.remove(tmp_name)
+            except OSError:
+                pass
@@ -0,0 +1,20 @@
+from typing import Protocol, runtime_checkable, Optional
+
+
+@runtime_checkable
+class RunTimeStoreProtocol(Protocol):
+    def contains(self, device_name: str) -> bool: ...
+
+    def get_total(self, device_name: str) -> float: ...
+
+    def get_last(self, device_name: str) -> float: ...
+
+    def set_times(self, device_name: str, total: Optional[float] = None, last: Optional[float] = None) -> None: ...
+
+    def record_stop(self, device_name: str, run_time: float) -> float: ...
+
+    def checkpoint(self, device_name: str, run_time_current: float) -> None: ...
+
+    def compact(self) -> None: ...
+
+    def close(self) -> None: ...
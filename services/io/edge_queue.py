@@ -0,0 +1,162 @@
+import collections
+import dataclasses
+import time
+from typing import Callable, Hashable, Optional
+
+from core.thread_manager_protocol import ThreadManagerProtocol
+
+# (key, value, tick of the edge or None, monotonic time the edge was pushed)
+_Edge = tuple[Hashable, bool, Optional[int], float]
+
+
+@dataclasses.dataclass(frozen=True)
+class EdgeQueueStats:
+    received: int = 0
+    emitted: int = 0       # settled transitions that changed the point
+    coalesced: int = 0     # edges superseded by a later edge of the same point
+    bounced: int = 0       # settled values equal to the point's value (chatter that came back)
+    dropped: int = 0       # edges refused because the queue was full
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+
+
+class EdgeQueue:
+    """
+    Decouples input edge callbacks (pigpio's callback thread) from IO event publishing.
+
+    push() only appends to a deque, so it never takes a lock or blocks the callback
+    thread. The consumer task drains the deque every `window` seconds and keeps the
+    last edge of each point: a burst within the window is one transition. A point
+    with a debounce time is only settled once it has had no edge for that long. The
+    settled value goes to `sink(key, value, tick)`, which returns True if it changed
+    the point.
+
+    Without a started consumer, push() calls the sink directly. When more than
+    `max_pending` edges are queued new edges are dropped; the next IO scan picks up
+    the level they would have reported.
+    """
+    def __init__(
+            self,
+            thread_manager: ThreadManagerProtocol,
+            sink: Callable[[Hashable, bool, Optional[int]], bool],
+            window: float = 0.005,
+            max_pending: int = 4096,
+    ):
+        self.__thread_manager = thread_manager
+        self.__sink = sink
+        self.__window = window
+        self.__max_pending = max_pending
+
+        self.__queue: collections.deque[_Edge] = collections.deque()
+        self.__debounce: dict[Hashable, float] = {}
+        # Last edge of every point that has not settled yet
+        self.__pending: dict[Hashable, _Edge] = {}
+        self.__running = False
+        # Bumped by every start() and stop(); a worker of an older generation exits
+        self.__generation = 0
+
+        self.__received = 0
+        self.__dropped = 0
+        self.__emitted = 0
+        self.__coalesced = 0
+        self.__bounced = 0
+        self.__max_depth = 0
+
+    @property
+    def running(self) -> bool:
+        return self.__running
+
+    @property
+    def stats(self) -> EdgeQueueStats:
+        depth = len(self.__queue)
+        return EdgeQueueStats(
+            received=self.__received,
+            emitted=self.__emitted,
+            coalesced=self.__coalesced,
+            bounced=self.__bounced,
+            dropped=self.__dropped,
+            queue_depth=depth,
+            max_queue_depth=max(self.__max_depth, depth),
+        )
+
+    def set_debounce(self, key: Hashable, seconds: float) -> None:
+        """Time a point must keep its level before the edge is published (0: window only)."""
+        if seconds > 0:
+            self.__debounce[key] = seconds
+        else:
+            self.__debounce.pop(key, None)
+
+    def get_debounce(self, key: Hashable) -> float:
+        return self.__debounce.get(key, 0.0)
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self.__pending)
+
+    def is_pending(self, key: Hashable) -> bool:
+        """True while the point has edges that have not settled."""
+        return key in self.__pending
+
+    def push(self, key: Hashable, value: bool, tick: Optional[int] = None) -> None:
+        """Called from the edge callback thread."""
+        self.__received += 1
+        if not self.__running:
+            self.__settle((key, value, tick, time.monotonic()))
+            return
+        if len(self.__queue) >= self.__max_pending:
+            self.__dropped += 1
+            return
+        self.__queue.append((key, value, tick, time.monotonic()))
+
+    def start(self) -> None:
+        if self.__running:
+            return
+        self.__running = True
+        self.__generation += 1
+        self.__thread_manager.start_background_task(self.__worker, self.__generation)
+
+    def stop(self) -> None:
+        """Stops the consumer and publishes everything still queued or pending."""
+        self.__running = False
+        self.__generation += 1
+        self.__drain(float("inf"))
+
+    # ---------- internals ----------
+
+    def __worker(self, generation: int) -> None:
+        # A stop() followed by a start() within one sleep leaves this worker stale
+        while self.__generation == generation:
+            self.__drain(time.monotonic())
+            time.sleep(self.__window)
+
+    def __drain(self, now: float) -> None:
+        queue = self.__queue
+        pending = self.__pending
+        self.__max_depth = max(self.__max_depth, len(queue))
+        while queue:
+            edge = queue.popleft()
+            if edge[0] in pending:
+                self.__coalesced += 1
+            pending[edge[0]] = edge
+
+        if not pending:
+            return
+        settled = [edge for key, edge in pending.items() if now - edge[3] >= self.__debounce.get(key, 0.0)]
+        for edge in settled:
+            # The sink can yield, so a concurrent drain (stop() during a worker pass) may have settled it
+            if pending.get(edge[0]) is not edge:
+                continue
+            del pending[edge[0]]
+            self.__settle(edge)
+
+    def __settle(self, edge: _Edge) -> None:
+        key, value, tick, _ = edge
+        try:
+            changed = self.__sink(key, value, tick)
+        except Exception as e:
+            print(f"[EdgeQueue] Error publishing edge of {key}: {e}")
+            return
+        if changed:
+            self.__emitted += 1
+        else:
+            self.__bounced += 1
@@ -0,0 +1,39 @@
+from dataclasses import dataclass, field
+from typing import Optional, Iterator
+
+from services.io.events.ai_event import AIEvent
+from services.io.events.ao_event import AOEvent
+from services.io.events.di_event import DIEvent
+from services.io.events.do_event import DOEvent
+from services.io.events.io_event import IOEvent
+
+
+@dataclass(frozen=True)
+class IOChange:
+    io_id: int
+    value_old: Optional[bool | int]
+    value_new: bool | int
+
+
+@dataclass(frozen=True)
+class IOChangeSet:
+    """
+    Every point that changed in one IOService scan (or one input edge), with its old
+    and new value. `seq` increases by one per change set.
+    """
+    seq: int
+    timestamp: float
+    di: tuple[IOChange, ...] = field(default=())
+    do: tuple[IOChange, ...] = field(default=())
+    ai: tuple[IOChange, ...] = field(default=())
+    ao: tuple[IOChange, ...] = field(default=())
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.di or self.do or self.ai or self.ao)
+
+    def to_events(self) -> Iterator[IOEvent]:
+        """The same changes as per-point DIEvent/DOEvent/AIEvent/AOEvent."""
+        for changes, event_cls in ((self.di, DIEvent), (self.do, DOEvent), (self.ai, AIEvent), (self.ao, AOEvent)):
+            for change in changes:
+                yield event_cls(io_id=change.io_id, value_old=change.value_old, value_new=change.value_new)
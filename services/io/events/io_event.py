@@ -4,3 +4,8 @@ from dataclasses import dataclass
 @dataclass
 class IOEvent:
     io_id: int
+
+    @property
+    def routing_key(self) -> int:
+        """Key for EventDispatcher.subscribe(..., key=io_id)."""
+        return self.io_id
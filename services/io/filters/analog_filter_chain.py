@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from services.io.filters.analog_filter_protocol import AnalogFilterProtocol
+
+
+@dataclass(frozen=True)
+class AnalogFilterStats:
+    samples: int = 0
+    published: int = 0
+    suppressed: int = 0
+
+
+class AnalogFilterChain:
+    """
+    Filters the raw samples of one analog input and decides which value IOService
+    publishes for it.
+
+    Each batch of samples runs through `filters` in order. The last filtered value
+    replaces the published one only if it moved by at least `deadband` engineering
+    units (`eu_per_count` converts raw counts to engineering units). A batch whose
+    raw value differs from the published one but stays inside the deadband counts
+    as suppressed: without the chain it would have been an AIEvent.
+    """
+    def __init__(self, filters: Sequence[AnalogFilterProtocol] = (), deadband: float = 0.0, eu_per_count: float = 1.0):
+        self.__filters = tuple(filters)
+        self.__deadband_counts = deadband / eu_per_count if eu_per_count else 0.0
+        self.__published: Optional[int] = None
+        self.__samples = 0
+        self.__published_count = 0
+        self.__suppressed = 0
+
+    @property
+    def value(self) -> Optional[int]:
+        return self.__published
+
+    @property
+    def stats(self) -> AnalogFilterStats:
+        return AnalogFilterStats(samples=self.__samples, published=self.__published_count, suppressed=self.__suppressed)
+
+    def update(self, samples: Sequence[int]) -> Optional[int]:
+        """Feeds a batch of raw samples (oldest first) and returns the value to publish."""
+        if not samples:
+            return self.__published
+        self.__samples += len(samples)
+
+        values: list[float] = [float(sample) for sample in samples]
+        for f in self.__filters:
+            values = f.apply(values)
+            if not values:
+                return self.__published
+
+        filtered = values[-1]
+        published = self.__published
+        if published is None or abs(filtered - published) >= self.__deadband_counts:
+            new_value = round(filtered)
+            if new_value != published:
+                self.__published = new_value
+                self.__published_count += 1
+        elif samples[-1] != published:
+            self.__suppressed += 1
+        return self.__published
+
+    def reset(self) -> None:
+        for f in self.__filters:
+            f.reset()
+        self.__published = None
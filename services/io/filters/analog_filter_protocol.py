@@ -0,0 +1,9 @@
+from typing import Protocol
+
+
+class AnalogFilterProtocol(Protocol):
+    def apply(self, samples: list[float]) -> list[float]:
+        """Filters a batch of samples (oldest first); may return fewer samples than it got."""
+        ...
+
+    def reset(self) -> None: ...
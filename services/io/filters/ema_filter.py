@@ -0,0 +1,25 @@
+from typing import Optional
+
+from services.io.filters.analog_filter_protocol import AnalogFilterProtocol
+
+
+class EmaFilter(AnalogFilterProtocol):
+    """Exponential moving average: y += alpha * (x - y). Smaller alpha, smoother and slower."""
+    def __init__(self, alpha: float = 0.3):
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+        self.__alpha = alpha
+        self.__value: Optional[float] = None
+
+    def apply(self, samples: list[float]) -> list[float]:
+        alpha = self.__alpha
+        value = self.__value
+        result = []
+        for sample in samples:
+            value = sample if value is None else value + alpha * (sample - value)
+            result.append(value)
+        self.__value = value
+        return result
+
+    def reset(self) -> None:
+        self.__value = None
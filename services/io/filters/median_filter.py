@@ -0,0 +1,24 @@
+from collections import deque
+
+from services.io.filters.analog_filter_protocol import AnalogFilterProtocol
+
+
+class MedianFilter(AnalogFilterProtocol):
+    """Median of the last `n` samples, for every sample; removes single-sample spikes."""
+    def __init__(self, n: int = 5):
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        self.__window: deque[float] = deque(maxlen=n)
+
+    def apply(self, samples: list[float]) -> list[float]:
+        window = self.__window
+        result = []
+        for sample in samples:
+            window.append(sample)
+            ordered = sorted(window)
+            middle = len(ordered) // 2
+            result.append(ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2)
+        return result
+
+    def reset(self) -> None:
+        self.__window.clear()
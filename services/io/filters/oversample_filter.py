@@ -0,0 +1,25 @@
+from services.io.filters.analog_filter_protocol import AnalogFilterProtocol
+
+
+class OversampleFilter(AnalogFilterProtocol):
+    """
+    Averages every `n` consecutive samples into one. Samples that do not fill a
+    block yet are kept for the next batch.
+    """
+    def __init__(self, n: int):
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        self.__n = n
+        self.__pending: list[float] = []
+
+    def apply(self, samples: list[float]) -> list[float]:
+        pending = self.__pending
+        pending.extend(samples)
+        n = self.__n
+        blocks = len(pending) // n
+        result = [sum(pending[i * n:(i + 1) * n]) / n for i in range(blocks)]
+        del pending[:blocks * n]
+        return result
+
+    def reset(self) -> None:
+        self.__pending.clear()
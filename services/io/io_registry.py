@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from services.io.modules.io_module_protocol import IOModuleProtocol
+
+IO_KINDS = ("di", "do", "ai", "ao")
+
+
+@dataclass(frozen=True)
+class IOPoint:
+    kind: str                 # "di", "do", "ai" or "ao"
+    pos: int                  # global position within its kind
+    module: IOModuleProtocol
+    local_index: int          # index in module.get_all_values()
+    address: Optional[int]    # hardware address (GPIO number, ADC input, ...)
+    tag: Optional[str]        # e.g. "pump1.run_fb"
+    raw_max: int = 0          # full-scale raw value of analog points
+
+
+class IORegistry:
+    """
+    Every IO point, built once from the modules of each kind.
+
+    Global positions are assigned in module order. Points are kept in flat tuples
+    indexed by position, so lookups by (kind, pos), by tag or by module are O(1).
+    """
+    def __init__(self, modules: dict[str, Sequence[IOModuleProtocol]]):
+        self.__points: dict[str, tuple[IOPoint, ...]] = {}
+        self.__by_tag: dict[str, IOPoint] = {}
+        self.__offsets: dict[int, tuple[str, int]] = {}
+
+        for kind in IO_KINDS:
+            points: list[IOPoint] = []
+            for module in modules.get(kind, ()):
+                self.__offsets[id(module)] = (kind, len(points))
+                addresses = module.addresses
+                tags = module.tags
+                raw_max = module.get_max_value() if kind in ("ai", "ao") else 0
+                for local_index in range(module.io_count):
+                    point = IOPoint(
+                        kind=kind,
+                        pos=len(points),
+                        module=module,
+                        local_index=local_index,
+                        address=addresses[local_index] if local_index < len(addresses) else None,
+                        tag=tags.get(local_index),
+                        raw_max=raw_max,
+                    )
+                    if point.tag is not None:
+                        if point.tag in self.__by_tag:
+                            raise ValueError(f"Duplicate IO tag '{point.tag}'")
+                        self.__by_tag[point.tag] = point
+                    points.append(point)
+            self.__points[kind] = tuple(points)
+
+    def count(self, kind: str) -> int:
+        return len(self.__points[kind])
+
+    def points(self, kind: str) -> tuple[IOPoint, ...]:
+        return self.__points[kind]
+
+    def point(self, kind: str, pos: int) -> Optional[IOPoint]:
+        points = self.__points[kind]
+        return points[pos] if 0 <= pos < len(points) else None
+
+    def find(self, tag: str) -> IOPoint:
+        """The point with this tag; raises KeyError for unknown tags."""
+        point = self.__by_tag.get(tag)
+        if point is None:
+            raise KeyError(f"Unknown IO tag '{tag}'")
+        return point
+
+    def pos_of(self, tag: str) -> int:
+        return self.find(tag).pos
+
+    def tags(self) -> dict[str, IOPoint]:
+        return dict(self.__by_tag)
+
+    def slot_of(self, module: IOModuleProtocol) -> tuple[str, int]:
+        """(kind, global position of the module's first point)."""
+        return self.__offsets[id(module)]
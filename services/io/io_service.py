@@ -1,186 +1,468 @@
+import contextlib
+import functools
+import itertools
 import threading
-from typing import Optional, Callable
+import time
+from typing import Optional, Callable, Mapping
 
 from common import utils
 from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
 from core.serializable_protocol import SerializableProtocol
+from core.thread_manager_protocol import ThreadManagerProtocol
 from dto.io.analog_io_dto import AnalogIoDto
 from dto.io.digital_io_dto import DigitalIoDto
 from dto.io.io_status_dto import IoStatusDto
-from services.io.events.ai_event import AIEvent
-from services.io.events.ao_event import AOEvent
-from services.io.events.di_event import DIEvent
-from services.io.events.do_event import DOEvent
+from services.io.edge_queue import EdgeQueue, EdgeQueueStats
+from services.io.events.io_change_set import IOChangeSet, IOChange
+from services.io.filters.analog_filter_chain import AnalogFilterChain, AnalogFilterStats
+from services.io.io_registry import IORegistry, IO_KINDS
 from services.io.io_service_protocol import IOServiceProtocol
 from services.io.modules.ai_module_protocol import AIModuleProtocol
-from services.io.modules.analog_module_protocol import AnalogModuleProtocol
 from services.io.modules.ao_module_protocol import AOModuleProtocol
 from services.io.modules.di_module_protocol import DIModuleProtocol
-from services.io.modules.digital_module_protocol import DigitalModuleProtocol
 from services.io.modules.do_module_protocol import DOModuleProtocol
 from services.io.modules.io_module_protocol import IOModuleProtocol
+from services.io.process_image import InputImage, ProcessImageStats
+from services.io.safety_latency import SafetyLatency, SafetyLatencyStats
+from services.io.scan_scheduler import ScanScheduler, ModuleScanStats
+from services.io.soe_recorder import SoeRecorder
 
 
 class IOService(IOServiceProtocol):
+    """
+    Every scan reads all modules, diffs the values against the previous scan and
+    publishes one IOChangeSet with everything that changed. Edges reported by the
+    modules between scans go through an EdgeQueue, which coalesces and debounces them
+    per point; each settled transition is published the same way, one change each.
+    The scan leaves points with unsettled edges to the queue. Every raw edge is also
+    recorded, with its pigpio tick, by the SoeRecorder when one is given.
+
+    run_scan() hands the modules to a ScanScheduler, which scans each one in its own
+    task at the module's scan_period; scan() reads everything once, synchronously.
+
+    Analog inputs with an AnalogFilterChain publish the filtered value of the samples
+    acquired since the previous scan instead of the raw reading, so ADC noise inside
+    the chain's deadband produces no AIEvent.
+
+    The change set and its per-point DIEvent/DOEvent/AIEvent/AOEvent equivalents are
+    delivered with a single emit_batch call: change sets in order on one lane of the
+    dispatcher's pool, the events of each point in order on the lane of that point.
+
+    Points are addressed by global position per kind, resolved through an IORegistry
+    built once from the modules; they can also be looked up by tag ("pump1.run_fb").
+
+    Between begin_cycle() and end_cycle() the calling thread (the station's tick, a
+    green thread under eventlet) works on a process image: its reads come from an
+    InputImage frozen at begin_cycle(), its digital output writes collect in an output
+    image that end_cycle() commits to the modules in one write each. Other threads
+    (subscribers, socket handlers) and the tick outside a cycle read the latest
+    scanned values and write straight out.
+
+    Edges of safety points (set_safety(), e.g. the e-stop) skip the edge queue: their
+    per-point event is delivered with a synchronous emit on the edge callback thread,
+    or on the scanning thread for changes a scan finds on them, and is skipped if a
+    newer edge already changed the point again. The outputs its subscribers write go
+    straight out; a cycle that began before such a write does not commit its own
+    pending write of that output. The change set still goes to observers through
+    emit_async, from a background task so a full dispatcher pool never holds up the
+    edge thread. The time from the edge to the last output written is kept in a
+    SafetyLatency.
+    """
     def __init__(
             self,
             event_dispatcher: EventDispatcherProtocol,
             ai_modules: Optional[list[AIModuleProtocol]] = None,
             ao_modules: Optional[list[AOModuleProtocol]] = None,
             di_modules: Optional[list[DIModuleProtocol]] = None,
-            do_modules: Optional[list[DOModuleProtocol]] = None
+            do_modules: Optional[list[DOModuleProtocol]] = None,
+            thread_manager: Optional[ThreadManagerProtocol] = None,
+            ai_filters: Optional[dict[int, AnalogFilterChain]] = None,
+            soe: Optional[SoeRecorder] = None,
     ):
         self.__event_dispatcher = event_dispatcher
-        self.__di_cache: dict[int, bool] = {}
-        self.__do_cache: dict[int, bool] = {}
-        self.__ai_cache: dict[int, int] = {}
-        self.__ao_cache: dict[int, int] = {}
+        self.__thread_manager = thread_manager
+        self.__ai_filters: dict[int, AnalogFilterChain] = dict(ai_filters) if ai_filters else {}
+        self.__soe = soe
+        self.__change_set_seq = itertools.count(1)
 
-        self.__ai_modules: list[AIModuleProtocol] = ai_modules if ai_modules else []
-        self.__ao_modules: list[AOModuleProtocol] = ao_modules if ao_modules else []
-        self.__di_modules: list[DIModuleProtocol] = di_modules if di_modules else []
-        self.__do_modules: list[DOModuleProtocol] = do_modules if do_modules else []
+        self.__modules: dict[str, list[IOModuleProtocol]] = {
+            "di": di_modules if di_modules else [],
+            "do": do_modules if do_modules else [],
+            "ai": ai_modules if ai_modules else [],
+            "ao": ao_modules if ao_modules else [],
+        }
+        self.__locks: dict[str, threading.RLock] = {kind: threading.RLock() for kind in IO_KINDS}
 
-        self.__ai_lock = threading.RLock()
-        self.__ao_lock = threading.RLock()
-        self.__di_lock = threading.RLock()
-        self.__do_lock = threading.RLock()
+        for modules in self.__modules.values():
+            for module in modules:
+                module.initialize()
 
-        self.init_digital_modules(self.__di_modules, self.__on_di_change)
-        self.init_digital_modules(self.__do_modules, self.__on_do_change)
+        self.__registry = IORegistry(self.__modules)
 
-        self.init_analog_modules(self.__ai_modules)
-        self.init_analog_modules(self.__ao_modules)
+        # Last published value of every point by global position (None until first read)
+        self.__values: dict[str, list[Optional[bool | int]]] = {kind: [None] * self.__registry.count(kind) for kind in IO_KINDS}
 
-    @staticmethod
-    def init_digital_modules(modules: list[DigitalModuleProtocol], callback: Optional[Callable[[int, bool|bool], None]] = None) -> None:
-        for module in modules:
-            module.initialize()
-            module.callback = callback
+        # Modules report edges by local index
+        self.__edge_queue = EdgeQueue(thread_manager, self.__on_edge_settled)
+        for kind in ("di", "do"):
+            for module in self.__modules[kind]:
+                _, offset = self.__registry.slot_of(module)
+                module.callback = functools.partial(self.__on_edge, kind, offset)
+                for local_index, seconds in module.debounce.items():
+                    self.__edge_queue.set_debounce((kind, offset + local_index), seconds)
 
-    @staticmethod
-    def init_analog_modules(modules: list[AIModuleProtocol]) -> None:
-        for module in modules:
-            module.initialize()
+        self.__scheduler: Optional[ScanScheduler] = None
+
+        # Safety points and when each last had an edge (perf_counter), so a scan read
+        # started before the edge does not publish the old level back; dropped once a
+        # read of the point's module starts after the edge
+        self.__safety: set[tuple[str, int]] = set()
+        self.__safety_edge_at: dict[tuple[str, int], float] = {}
+        # Edge being delivered on this thread (green thread under eventlet)
+        self.__safety_delivery = threading.local()
+        self.__safety_latency = SafetyLatency()
+
+        # Process image of the control cycle running on this thread (image, outputs, start)
+        self.__cycle = threading.local()
+        self.__cycle_seq = itertools.count(1)
+        # When a safety delivery last wrote each output (perf_counter)
+        self.__safety_written_at: dict[int, float] = {}
+        self.__cycles = 0
+        self.__cycle_writes = 0
+        self.__cycle_commits = 0
+        self.__last_cycle_ms = 0.0
+        self.__max_cycle_ms = 0.0
+
+    @property
+    def registry(self) -> IORegistry:
+        return self.__registry
+
+    @property
+    def input_image(self) -> Optional[InputImage]:
+        """The image of the cycle running on the calling thread, None outside a cycle."""
+        return getattr(self.__cycle, "image", None)
+
+    def begin_cycle(self) -> InputImage:
+        """Freezes the inputs for a control cycle of the calling thread and starts collecting its output writes."""
+        if self.input_image is not None:
+            self.end_cycle()
+        # All kinds under their locks at once so no edge lands between two of them
+        with contextlib.ExitStack() as stack:
+            for kind in IO_KINDS:
+                stack.enter_context(self.__locks[kind])
+            image = InputImage.freeze(next(self.__cycle_seq), time.time(), self.__values)
+        self.__cycle.start = time.perf_counter()
+        self.__cycle.outputs = {}
+        self.__cycle.image = image
+        return image
+
+    def end_cycle(self) -> None:
+        """Commits the output image to the modules and leaves process image mode."""
+        cycle = self.__cycle
+        if getattr(cycle, "image", None) is None:
+            return
+        outputs, start = cycle.outputs, cycle.start
+        cycle.image, cycle.outputs = None, {}
+        # Outputs a safety delivery wrote during the cycle keep what it wrote
+        outputs = {pos: value for pos, value in outputs.items() if self.__safety_written_at.get(pos, 0.0) < start}
+        if outputs:
+            self.set_digital_output_values(outputs)
+            self.__cycle_commits += 1
+
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.__cycles += 1
+        self.__last_cycle_ms = elapsed_ms
+        self.__max_cycle_ms = max(self.__max_cycle_ms, elapsed_ms)
+
+    def get_cycle_stats(self) -> ProcessImageStats:
+        return ProcessImageStats(
+            cycles=self.__cycles,
+            writes=self.__cycle_writes,
+            commits=self.__cycle_commits,
+            last_cycle_ms=self.__last_cycle_ms,
+            max_cycle_ms=self.__max_cycle_ms,
+        )
 
     def get_digital_input_value(self, pos: int) -> bool:
-        with self.__di_lock:
-            return self.__di_cache.get(pos, False)
+        return bool(self.__value("di", pos, False))
 
     def get_digital_output_value(self, pos: int) -> bool:
-        with self.__do_lock:
-            return self.__do_cache.get(pos, False)
+        # Within a cycle an output reads back what the cycle wrote to it
+        value = getattr(self.__cycle, "outputs", {}).get(pos)
+        if value is not None:
+            return value
+        return bool(self.__value("do", pos, False))
 
     def get_analog_input_value(self, pos: int) -> int:
-        with self.__ai_lock:
-            return self.__ai_cache.get(pos, 0)
+        return self.__value("ai", pos, 0)
 
     def get_analog_output_value(self, pos: int) -> int:
-        with self.__ao_lock:
-            return self.__ao_cache.get(pos, 0)
+        return self.__value("ao", pos, 0)
 
     def set_digital_output_value(self, pos: int, value: bool) -> None:
-        with self.__do_lock:
-            module = next((m for m in self.__do_modules if m.is_managed_pos(pos)), None)
-            if module:
-                module.set_value(pos, value)
+        point = self.__registry.point("do", pos)
+        if point is not None and getattr(self.__safety_delivery, "edge_at", None) is not None:
+            # Safety reaction: out now, and a running cycle must not write the old command back
+            with self.__locks["do"]:
+                point.module.set_value(point.local_index, value)
+            written_at = time.perf_counter()
+            self.__safety_written_at[pos] = written_at
+            self.__safety_delivery.writes += 1
+            self.__safety_delivery.written_at = written_at
+        elif point is not None and getattr(self.__cycle, "image", None) is not None:
+            self.__cycle.outputs[pos] = value
+            self.__cycle_writes += 1
+        elif point is not None:
+            with self.__locks["do"]:
+                point.module.set_value(point.local_index, value)
+
+    def set_digital_output_values(self, values: Mapping[int, bool]) -> None:
+        """Sets several outputs with one write per module."""
+        by_module: dict[int, tuple[DOModuleProtocol, dict[int, bool]]] = {}
+        for pos, value in values.items():
+            point = self.__registry.point("do", pos)
+            if point is not None:
+                by_module.setdefault(id(point.module), (point.module, {}))[1][point.local_index] = value
+        with self.__locks["do"]:
+            for module, module_values in by_module.values():
+                module.set_values(module_values)
 
     def set_analog_output_value(self, ao_pos: int, value: int) -> None:
         pass
 
     @staticmethod
-    def scan_channel(modules: list[IOModuleProtocol], cache: dict[int, bool | int], event_cls, dispatcher: EventDispatcherProtocol, lock: threading.RLock) -> None:
+    def diff_values(values: list[bool | int], offset: int, current: list[Optional[bool | int]], lock: threading.RLock) -> tuple[IOChange, ...]:
+        """
+        Compares the values of the points starting at offset with current and returns
+        the ones that changed, updating current.
+        """
+        end = min(offset + len(values), len(current))
+        values = values[:end - offset]
         with lock:
-            pos = 0
-            for module in modules:
-                for value in module.get_all_values():
-                    old = cache.get(pos)
-                    if old != value:  # covers old is None or different
-                        cache[pos] = value
-                        dispatcher.emit_async(event_cls(io_id=pos, value_old=old, value_new=value))
-                    pos += 1
+            if current[offset:end] == values:
+                return ()
+            changes = tuple(
+                IOChange(io_id=pos, value_old=current[pos], value_new=value)
+                for pos, value in enumerate(values, offset)
+                if current[pos] != value  # covers old is None or different
+            )
+            current[offset:end] = values
+            return changes
 
     def scan(self) -> None:
-        self.scan_channel(self.__di_modules, self.__di_cache, DIEvent, self.__event_dispatcher, self.__di_lock)
-        self.scan_channel(self.__do_modules, self.__do_cache, DOEvent, self.__event_dispatcher, self.__do_lock)
-        self.scan_channel(self.__ai_modules, self.__ai_cache, AIEvent, self.__event_dispatcher, self.__ai_lock)
-        self.scan_channel(self.__ao_modules, self.__ao_cache, AOEvent, self.__event_dispatcher, self.__ao_lock)
+        changes = {}
+        for kind, modules in self.__modules.items():
+            changes[kind] = tuple(change for module in modules for change in self.__diff_module(module))
+        self.__publish(**changes)
 
-    @staticmethod
-    def serialize_digital_modules(modules: list[DigitalModuleProtocol], lock: threading.RLock) -> list[DigitalIoDto]:
-        with lock:
-            result: list[DigitalIoDto] = []
-            pos = 0
-            for module in modules:
-                for value in module.get_all_values():
-                    result.append(DigitalIoDto(io_id=pos, value=value))
-                    pos += 1
-            return result
+    def scan_module(self, module: IOModuleProtocol) -> None:
+        """Reads one module and publishes its changes."""
+        kind, _ = self.__registry.slot_of(module)
+        self.__publish(**{kind: self.__diff_module(module)})
 
-    @staticmethod
-    def serialize_analog_modules(modules: list[AnalogModuleProtocol], lock: threading.RLock) -> list[AnalogIoDto]:
-        with lock:
-            result: list[AnalogIoDto] = []
-            pos = 0
-            for module in modules:
-                for value in module.get_all_values():
-                    result.append(AnalogIoDto(io_id=pos, raw_value=value, ma_value=round(utils.scale_value(value, 0, module.get_max_value(), 4, 20), 1)))
-                    pos += 1
-            return result
+    def set_ai_filter(self, ai_pos: int, chain: Optional[AnalogFilterChain]) -> None:
+        """Installs (or with None removes) the filter chain of an analog input."""
+        if chain is None:
+            self.__ai_filters.pop(ai_pos, None)
+        else:
+            self.__ai_filters[ai_pos] = chain
 
-    def to_serializable(self) -> SerializableProtocol:
-        di = self.serialize_digital_modules(self.__di_modules, self.__di_lock)
-        do = self.serialize_digital_modules(self.__do_modules, self.__do_lock)
-        ai = self.serialize_analog_modules(self.__ai_modules, self.__ai_lock)
-        ao = self.serialize_analog_modules(self.__ao_modules, self.__ao_lock)
+    def get_ai_filter_stats(self) -> dict[int, AnalogFilterStats]:
+        return {pos: chain.stats for pos, chain in self.__ai_filters.items()}
 
-        return IoStatusDto(di=di, do=do, ai=ai, ao=ao)
+    def set_debounce(self, kind: str, pos: int, seconds: float) -> None:
+        """Software debounce of a "di" or "do" point; 0 publishes edges after the coalescing window."""
+        self.__edge_queue.set_debounce((kind, pos), seconds)
+
+    def get_edge_stats(self) -> EdgeQueueStats:
+        return self.__edge_queue.stats
+
+    def set_safety(self, kind: str, pos: int, safety: bool = True) -> None:
+        """Delivers the edges of a "di" or "do" point synchronously on the edge thread."""
+        if safety:
+            self.__safety.add((kind, pos))
+        else:
+            self.__safety.discard((kind, pos))
+
+    def get_safety_stats(self) -> SafetyLatencyStats:
+        return self.__safety_latency.stats
 
-    def __on_di_change(self, di_pos: int, value: bool) -> None:
-        with self.__di_lock:
-            old_di = self.__di_cache.get(di_pos)
-            if (old_di is None) or (old_di != value):
-                self.__di_cache[di_pos] = value
-                self.__event_dispatcher.emit_async(DIEvent(io_id=di_pos, value_old=old_di, value_new=value))
+    def run_scan(self) -> None:
+        if self.__scheduler is not None and self.__scheduler.running:
+            return
+        if self.__thread_manager is None:
+            raise RuntimeError("IOService.run_scan needs a thread manager")
+        self.__edge_queue.start()
+        self.__scheduler = ScanScheduler(self.__thread_manager, self.scan_module)
+        for kind, modules in self.__modules.items():
+            for index, module in enumerate(modules):
+                self.__scheduler.add(f"{kind}{index}:{type(module).__name__}", module)
+        self.__scheduler.start()
 
-    def __on_do_change(self, do_pos: int, value: bool) -> None:
-        with self.__do_lock:
-            old_do = self.__do_cache.get(do_pos)
-            if (old_do is None) or (old_do != value):
-                self.__do_cache[do_pos] = value
-                self.__event_dispatcher.emit_async(DOEvent(io_id=do_pos, value_old=old_do, value_new=value))
+    def stop_scan(self) -> None:
+        if self.__scheduler is not None:
+            self.__scheduler.stop()
+        self.__edge_queue.stop()
+
+    def get_scan_stats(self) -> list[ModuleScanStats]:
+        return self.__scheduler.stats() if self.__scheduler is not None else []
+
+    def to_serializable(self) -> SerializableProtocol:
+        # Served from the scanned values, the hardware is not read again
+        di = [DigitalIoDto(io_id=pos, value=bool(value)) for pos, value in enumerate(self.__values["di"])]
+        do = [DigitalIoDto(io_id=pos, value=bool(value)) for pos, value in enumerate(self.__values["do"])]
+        ai = self.__serialize_analog("ai")
+        ao = self.__serialize_analog("ao")
+
+        return IoStatusDto(di=di, do=do, ai=ai, ao=ao)
 
     def get_ai_max_raw(self, ai_pos: int) -> int:
-        with self.__ai_lock:
-            module = next((m for m in self.__ai_modules if m.is_managed_pos(ai_pos)), None)
-            return module.get_max_value() if module else 0
+        point = self.__registry.point("ai", ai_pos)
+        return point.raw_max if point is not None else 0
 
     def get_ao_max_raw(self, ao_pos: int) -> int:
         return 0
 
     def get_ai_count(self) -> int:
-        with self.__ai_lock:
-            return self.get_io_count(self.__ai_modules)
+        return self.__registry.count("ai")
 
     def get_di_count(self) -> int:
-        with self.__di_lock:
-            return self.get_io_count(self.__di_modules)
+        return self.__registry.count("di")
 
     def get_ao_count(self) -> int:
-        with self.__ao_lock:
-            return self.get_io_count(self.__ao_modules)
+        return self.__registry.count("ao")
 
     def get_do_count(self) -> int:
-        with self.__do_lock:
-            return self.get_io_count(self.__do_modules)
+        return self.__registry.count("do")
 
     @property
     def di_emergency_stop(self) -> int:
-        return 9
+        return self.__registry.pos_of("station.estop")
 
-    @staticmethod
-    def get_io_count(modules: list[IOModuleProtocol]) -> int:
-        count = 0
-        for m in modules:
-            count += m.io_count
-        return count
\ No newline at end of file
+    # ---------- internals ----------
+
+    def __value(self, kind: str, pos: int, default: bool | int) -> bool | int:
+        image = getattr(self.__cycle, "image", None)
+        if image is not None:
+            value = image.get(kind, pos)
+            return default if value is None else type(default)(value)
+        values = self.__values[kind]
+        value = values[pos] if 0 <= pos < len(values) else None
+        return default if value is None else value
+
+    def __diff_module(self, module: IOModuleProtocol) -> tuple[IOChange, ...]:
+        kind, offset = self.__registry.slot_of(module)
+        started = time.perf_counter()
+        values = self.__read_analog_input(module, offset) if kind == "ai" else self.__read(module, module.get_all_values)
+        if kind in ("di", "do") and (self.__edge_queue.has_pending or self.__safety_edge_at):
+            # Chattering points keep their value until the edge queue settles them, and
+            # safety points that had an edge during the read keep the edge's level
+            current = self.__values[kind]
+            values = [current[pos] if self.__is_held(kind, pos, started) else value for pos, value in enumerate(values, offset)]
+            self.__prune_safety_edges(kind, offset, offset + len(values), started)
+        return self.diff_values(values, offset, self.__values[kind], self.__locks[kind])
+
+    def __prune_safety_edges(self, kind: str, start: int, end: int, read_started: float) -> None:
+        # This module's read started after these edges, so it saw their level: stop holding them.
+        # Only this module's points: another module's read may have started before the edge.
+        stale = [key for key, edge_at in list(self.__safety_edge_at.items()) if key[0] == kind and start <= key[1] < end and edge_at < read_started]
+        for key in stale:
+            self.__safety_edge_at.pop(key, None)
+
+    def __is_held(self, kind: str, pos: int, read_started: float) -> bool:
+        return self.__edge_queue.is_pending((kind, pos)) or self.__safety_edge_at.get((kind, pos), 0.0) >= read_started
+
+    def __read_analog_input(self, module: AIModuleProtocol, offset: int) -> list[int]:
+        values = []
+        for pos, samples in enumerate(self.__read(module, module.get_all_samples), offset):
+            chain = self.__ai_filters.get(pos)
+            if chain is not None:
+                value = chain.update(samples)
+            else:
+                value = samples[-1] if samples else None
+            # No new sample: keep what was published
+            values.append(value if value is not None else self.__value("ai", pos, 0))
+        return values
+
+    def __read(self, module: IOModuleProtocol, read: Callable[[], list]) -> list:
+        if module.blocking_io and self.__thread_manager is not None:
+            return self.__thread_manager.run_blocking(read)
+        return read()
+
+    def __publish(self, **changes: tuple[IOChange, ...]) -> None:
+        if self.__safety:
+            # Safety points found changed by a scan (missed callback, first scan) take the synchronous path too
+            for kind in ("di", "do"):
+                safety = tuple(change for change in changes.get(kind, ()) if (kind, change.io_id) in self.__safety)
+                if safety:
+                    changes[kind] = tuple(change for change in changes[kind] if change not in safety)
+                    for change in safety:
+                        self.__deliver_safety(kind, change, time.perf_counter())
+        if not any(changes.values()):
+            return
+        change_set = IOChangeSet(seq=next(self.__change_set_seq), timestamp=time.time(), **changes)
+        # Subscribers of the per-point events get them in the same batch
+        self.__event_dispatcher.emit_batch([change_set, *change_set.to_events()])
+
+    def __serialize_analog(self, kind: str) -> list[AnalogIoDto]:
+        result: list[AnalogIoDto] = []
+        for point, value in zip(self.__registry.points(kind), self.__values[kind]):
+            raw = value if value is not None else 0
+            result.append(AnalogIoDto(io_id=point.pos, raw_value=raw, ma_value=round(utils.scale_value(raw, 0, point.raw_max, 4, 20), 1)))
+        return result
+
+    def __on_edge(self, kind: str, offset: int, local_index: int, value: bool, tick: Optional[int] = None) -> None:
+        # Runs on the module's callback thread: record and queue only
+        pos = offset + local_index
+        if self.__soe is not None:
+            self.__soe.record(kind, pos, value, tick)
+        if (kind, pos) in self.__safety:
+            self.__on_safety_edge(kind, pos, value)
+            return
+        self.__edge_queue.push((kind, pos), value, tick)
+
+    def __on_safety_edge(self, kind: str, pos: int, value: bool) -> None:
+        edge_at = time.perf_counter()
+        self.__safety_edge_at[(kind, pos)] = edge_at
+        values = self.__values[kind]
+        with self.__locks[kind]:
+            if not 0 <= pos < len(values) or values[pos] == value:
+                return
+            old = values[pos]
+            values[pos] = value
+        self.__deliver_safety(kind, IOChange(io_id=pos, value_old=old, value_new=value), edge_at)
+
+    def __deliver_safety(self, kind: str, change: IOChange, edge_at: float) -> None:
+        # A subscriber of an earlier delivery may have yielded while a newer edge came in
+        if self.__values[kind][change.io_id] != change.value_new:
+            return
+        change_set = IOChangeSet(seq=next(self.__change_set_seq), timestamp=time.time(), **{kind: (change,)})
+        delivery = self.__safety_delivery
+        # Saved in case a subscriber's write causes another safety edge on this thread
+        outer = getattr(delivery, "edge_at", None), getattr(delivery, "writes", 0), getattr(delivery, "written_at", None)
+        delivery.edge_at, delivery.writes, delivery.written_at = edge_at, 0, None
+        try:
+            for event in change_set.to_events():
+                self.__event_dispatcher.emit(event)
+            writes, written_at = delivery.writes, delivery.written_at
+        finally:
+            delivery.edge_at, delivery.writes, delivery.written_at = outer
+        self.__safety_latency.add(written_at - edge_at if written_at is not None else None, writes)
+        # IOChangeSet submits block on a full pool; the edge thread must not wait for that
+        if self.__thread_manager is not None:
+            self.__thread_manager.start_background_task(self.__event_dispatcher.emit_async, change_set)
+        else:
+            self.__event_dispatcher.emit_async(change_set)
+
+    def __on_edge_settled(self, key: tuple[str, int], value: bool, tick: Optional[int]) -> bool:
+        kind, pos = key
+        values = self.__values[kind]
+        with self.__locks[kind]:
+            if not 0 <= pos < len(values):
+                return False
+            old = values[pos]
+            if old == value:
+                return False
+            values[pos] = value
+        self.__publish(**{kind: (IOChange(io_id=pos, value_old=old, value_new=value),)})
+        return True
@@ -1,6 +1,12 @@
-from typing import Protocol
+from typing import Protocol, Optional, Mapping
 
 from core.serializable_protocol import SerializableProtocol
+from services.io.edge_queue import EdgeQueueStats
+from services.io.filters.analog_filter_chain import AnalogFilterChain, AnalogFilterStats
+from services.io.io_registry import IORegistry
+from services.io.process_image import InputImage, ProcessImageStats
+from services.io.safety_latency import SafetyLatencyStats
+from services.io.scan_scheduler import ModuleScanStats
 
 
 class IOServiceProtocol(Protocol):
@@ -10,6 +16,8 @@ class IOServiceProtocol(Protocol):
 
     def set_digital_output_value(self, do_pos: int, value: bool) -> None: ...
 
+    def set_digital_output_values(self, values: Mapping[int, bool]) -> None: ...
+
     def get_analog_input_value(self, ai_pos: int) -> int: ...
 
     def get_analog_output_value(self, ao_pos: int) -> int: ...
@@ -35,4 +43,39 @@ class IOServiceProtocol(Protocol):
     @property
     def di_emergency_stop(self) -> int: ...
 
-    def run_scan(self) -> None: ...
\ No newline at end of file
+    @property
+    def registry(self) -> IORegistry:
+        """Every IO point by kind and position or by tag."""
+        ...
+
+    def run_scan(self) -> None:
+        """Starts scanning every module in the background at its own scan_period."""
+        ...
+
+    def stop_scan(self) -> None: ...
+
+    def get_scan_stats(self) -> list[ModuleScanStats]: ...
+
+    def set_ai_filter(self, ai_pos: int, chain: Optional[AnalogFilterChain]) -> None: ...
+
+    def get_ai_filter_stats(self) -> dict[int, AnalogFilterStats]: ...
+
+    def set_debounce(self, kind: str, pos: int, seconds: float) -> None: ...
+
+    def get_edge_stats(self) -> EdgeQueueStats: ...
+
+    def set_safety(self, kind: str, pos: int, safety: bool = True) -> None:
+        """Safety points bypass the edge queue: their events are emitted synchronously on the edge thread."""
+        ...
+
+    def get_safety_stats(self) -> SafetyLatencyStats: ...
+
+    def begin_cycle(self) -> InputImage:
+        """Freezes the inputs the calling thread reads until end_cycle(); its output writes are held until then."""
+        ...
+
+    def end_cycle(self) -> None:
+        """Writes the outputs set since begin_cycle() to the modules at once."""
+        ...
+
+    def get_cycle_stats(self) -> ProcessImageStats: ...
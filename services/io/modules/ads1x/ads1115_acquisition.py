@@ -0,0 +1,166 @@
+import importlib
+from typing import Optional
+
+from common.ring_buffer import RingBuffer
+from services.io.modules.ads1x.ads1115_channel_config import Ads1115ChannelConfig
+from services.io.modules.ads1x.ads1115_constants import (
+    REG_CONVERSION, REG_CONFIG, REG_LO_THRESH, REG_HI_THRESH,
+    CONFIG_MUX_SINGLE_ENDED, CONFIG_MUX_OFFSET, CONFIG_MODE_CONTINUOUS,
+    CONFIG_COMP_QUE_ONE, CONFIG_COMP_QUE_DISABLE, CONFIG_GAIN, CONFIG_DATA_RATE,
+    RDY_HI_THRESH, RDY_LO_THRESH,
+)
+from services.io.modules.ads1x.ads1115_registers_protocol import Ads1115RegistersProtocol
+
+try:
+    # The acquisition loop blocks on I2C, so it needs a real OS thread even when eventlet patched threading
+    from eventlet.patcher import original as _original
+except ImportError:
+    _original = importlib.import_module
+
+_threading = _original("threading")
+_time = _original("time")
+
+
+class Ads1115Acquisition:
+    """
+    Runs an ADS1115 in continuous-conversion mode on a native thread and stores the
+    samples of each enabled input in its own RingBuffer.
+
+    The inputs are sampled round-robin. With a single enabled input the mux never
+    changes and every conversion is a sample (up to 860 SPS). The conversion running
+    while the mux switches may still belong to the previous input, so one result is
+    skipped after each switch.
+
+    By default the loop paces itself with the conversion time of the channel's data
+    rate. With `use_ready_pin` the ALERT/RDY pin is configured as conversion-ready
+    and the loop waits for notify_ready() (e.g. a pigpio callback on its falling
+    edge) instead.
+    """
+    SETTLE_FACTOR = 1.1  # margin on the nominal conversion time when timer-paced
+    READY_TIMEOUT_FACTOR = 4.0
+
+    def __init__(self, registers: Ads1115RegistersProtocol, channels: dict[int, Ads1115ChannelConfig], buffer_size: int = 64, use_ready_pin: bool = False, name: str = "ads1115-acquisition"):
+        self.__registers = registers
+        self.__use_ready_pin = use_ready_pin
+        self.__name = name
+        self.__positions = tuple(pos for pos, config in sorted(channels.items()) if config.enabled)
+        self.__buffers = {pos: RingBuffer(buffer_size) for pos in self.__positions}
+        self.__configs = {pos: self.__config_word(pos, channels[pos], use_ready_pin) for pos in self.__positions}
+        self.__periods = {pos: 1.0 / channels[pos].data_rate for pos in self.__positions}
+
+        self.__ready = _threading.Event()
+        self.__running = False
+        self.__thread = None
+        self.__started_at = 0.0
+        self.__errors = 0
+
+    @property
+    def positions(self) -> tuple[int, ...]:
+        return self.__positions
+
+    @property
+    def running(self) -> bool:
+        return self.__running
+
+    @property
+    def errors(self) -> int:
+        return self.__errors
+
+    @property
+    def samples_per_second(self) -> float:
+        """Stored samples per second over all inputs since start()."""
+        elapsed = _time.monotonic() - self.__started_at
+        if not self.__running or elapsed <= 0:
+            return 0.0
+        return sum(buffer.count for buffer in self.__buffers.values()) / elapsed
+
+    def latest(self, pos: int) -> Optional[int]:
+        buffer = self.__buffers.get(pos)
+        return buffer.latest() if buffer is not None else None
+
+    def samples(self, pos: int, n: Optional[int] = None) -> list[int]:
+        buffer = self.__buffers.get(pos)
+        return buffer.values(n) if buffer is not None else []
+
+    def samples_since(self, pos: int, count: int) -> tuple[list[int], int]:
+        buffer = self.__buffers.get(pos)
+        return buffer.values_since(count) if buffer is not None else ([], count)
+
+    def start(self, first_sample_timeout: float = 1.0) -> None:
+        """Starts the acquisition thread and waits until every input has a sample."""
+        if self.__running or not self.__positions:
+            return
+        if self.__use_ready_pin:
+            self.__registers.write_register(REG_HI_THRESH, RDY_HI_THRESH)
+            self.__registers.write_register(REG_LO_THRESH, RDY_LO_THRESH)
+        for buffer in self.__buffers.values():
+            buffer.clear()
+
+        self.__running = True
+        self.__started_at = _time.monotonic()
+        self.__thread = _threading.Thread(target=self.__run, name=self.__name, daemon=True)
+        self.__thread.start()
+
+        deadline = _time.monotonic() + first_sample_timeout
+        while _time.monotonic() < deadline and any(buffer.count == 0 for buffer in self.__buffers.values()):
+            _time.sleep(0.001)
+
+    def stop(self) -> None:
+        self.__running = False
+        self.__ready.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout=1.0)
+            self.__thread = None
+
+    def notify_ready(self, *_) -> None:
+        """Conversion-ready signal, e.g. pigpio callback on the falling edge of ALERT/RDY."""
+        self.__ready.set()
+
+    # ---------- internals ----------
+
+    def __run(self) -> None:
+        registers = self.__registers
+        buffers = self.__buffers
+        current: Optional[int] = None
+
+        while self.__running:
+            for pos in self.__positions:
+                if not self.__running:
+                    break
+                try:
+                    if pos != current:
+                        registers.write_register(REG_CONFIG, self.__configs[pos])
+                        current = pos
+                        self.__wait_conversion(pos)
+                    self.__wait_conversion(pos)
+                    raw = registers.read_register(REG_CONVERSION)
+                except Exception as e:
+                    self.__errors += 1
+                    current = None
+                    print(f"[Ads1115Acquisition] {self.__name}: error reading input {pos}: {e}")
+                    _time.sleep(0.1)
+                    continue
+                buffers[pos].append(raw - 0x10000 if raw & 0x8000 else raw)
+
+    def __wait_conversion(self, pos: int) -> None:
+        period = self.__periods[pos]
+        if self.__use_ready_pin:
+            self.__ready.clear()
+            self.__ready.wait(period * self.READY_TIMEOUT_FACTOR)
+        else:
+            _time.sleep(period * self.SETTLE_FACTOR)
+
+    @staticmethod
+    def __config_word(pos: int, config: Ads1115ChannelConfig, use_ready_pin: bool) -> int:
+        if config.gain not in CONFIG_GAIN:
+            raise ValueError(f"Unsupported ADS1115 gain {config.gain} for input {pos}")
+        if config.data_rate not in CONFIG_DATA_RATE:
+            raise ValueError(f"Unsupported ADS1115 data rate {config.data_rate} for input {pos}")
+        return (
+            CONFIG_MUX_SINGLE_ENDED
+            | ((pos & 0x03) << CONFIG_MUX_OFFSET)
+            | CONFIG_GAIN[config.gain]
+            | CONFIG_MODE_CONTINUOUS
+            | CONFIG_DATA_RATE[config.data_rate]
+            | (CONFIG_COMP_QUE_ONE if use_ready_pin else CONFIG_COMP_QUE_DISABLE)
+        )
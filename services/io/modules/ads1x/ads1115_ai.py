@@ -1,52 +1,153 @@
 import traceback
 from typing import Optional
 
-import board
-from adafruit_mcp3xxx.analog_in import AnalogIn
+import pigpio
 
+from services.io.modules.ads1x.ads1115_acquisition import Ads1115Acquisition
+from services.io.modules.ads1x.ads1115_channel_config import Ads1115ChannelConfig
+from services.io.modules.ads1x.ads1115_registers_protocol import Ads1115RegistersProtocol
 from services.io.modules.ai_module_protocol import AIModuleProtocol
-from adafruit_ads1x15 import ADS1115, AnalogIn, ads1x15
+
+# I2C bus objects by bus number (None: the board's default bus), shared by every ADC on the bus
+_i2c_buses: dict[Optional[int], object] = {}
+
 
 class Ads1115_AI(AIModuleProtocol):
-    def __init__(self):
-        self.__channels: dict[int, AnalogIn] = {}
+    """
+    Single-ended inputs of one ADS1115, at `address` on I2C `bus`, sampled
+    continuously in the background by an Ads1115Acquisition. Reads return the latest
+    sample and never touch the bus.
+
+    Every ADC has its own acquisition thread, so the conversions of several chips
+    overlap; chips on the same bus share its I2C object, whose lock serializes their
+    register transactions only.
+
+    Pass `pi` and `alert_rdy_gpio` to pace the acquisition with the ALERT/RDY pin
+    instead of the conversion time.
+
+    Points are the enabled inputs in input order; `tags` names them by input number.
+
+    `registers` replaces the I2C bus, e.g. with a SimAds1115.
+    """
+    def __init__(
+            self,
+            channels: Optional[dict[int, Ads1115ChannelConfig]] = None,
+            address: int = 0x48,
+            bus: Optional[int] = None,
+            buffer_size: int = 64,
+            pi: Optional[pigpio.pi] = None,
+            alert_rdy_gpio: Optional[int] = None,
+            tags: Optional[dict[int, str]] = None,
+            registers: Optional[Ads1115RegistersProtocol] = None,
+    ):
+        self.__channel_configs = channels if channels is not None else {pos: Ads1115ChannelConfig() for pos in range(4)}
+        self.__inputs = tuple(pos for pos, config in sorted(self.__channel_configs.items()) if config.enabled)
+        self.__tags = tags if tags is not None else {}
+        self.__registers = registers
+        self.__address = address
+        self.__bus = bus
+        self.__buffer_size = buffer_size
+        self.__pi = pi
+        self.__alert_rdy_gpio = alert_rdy_gpio
+        self.__acquisition: Optional[Ads1115Acquisition] = None
+        self.__rdy_callback = None
+        # Sample count of each input at the previous get_all_samples()
+        self.__read_counts: dict[int, int] = {}
 
     def initialize(self) -> None:
+        self.__read_counts.clear()
         try:
-            # Create the I2C bus
-            i2c = board.I2C()
-
-            # Create the ADC object using the I2C bus
-            ads = ADS1115(i2c)
-
-            self.__channels: dict[int, AnalogIn] = {
-                0: AnalogIn(ads, ads1x15.Pin.A0),
-                1: AnalogIn(ads, ads1x15.Pin.A1),
-                2: AnalogIn(ads, ads1x15.Pin.A2),
-                3: AnalogIn(ads, ads1x15.Pin.A3)
-            }
+            use_ready_pin = self.__pi is not None and self.__alert_rdy_gpio is not None
+            acquisition = Ads1115Acquisition(
+                self.__registers if self.__registers is not None else self.__i2c_registers(),
+                self.__channel_configs,
+                buffer_size=self.__buffer_size,
+                use_ready_pin=use_ready_pin,
+                name=f"ads1115-{self.name}",
+            )
+            if use_ready_pin:
+                self.__pi.set_mode(self.__alert_rdy_gpio, pigpio.INPUT)
+                self.__pi.set_pull_up_down(self.__alert_rdy_gpio, pigpio.PUD_UP)
+                self.__rdy_callback = self.__pi.callback(self.__alert_rdy_gpio, pigpio.FALLING_EDGE, acquisition.notify_ready)
+            acquisition.start()
+            self.__acquisition = acquisition
         except Exception as e:
             print(f"Error: {e}")
             traceback.print_exc()
 
+    @property
+    def name(self) -> str:
+        bus = "default" if self.__bus is None else self.__bus
+        return f"i2c{bus}@{self.__address:#04x}"
+
+    def __i2c_registers(self) -> Ads1115RegistersProtocol:
+        # Imported here so the module loads without the Blinka board support (simulation)
+        from services.io.modules.ads1x.ads1115_registers import Ads1115Registers
+        i2c = _i2c_buses.get(self.__bus)
+        if i2c is None:
+            if self.__bus is None:
+                import board
+                i2c = board.I2C()
+            else:
+                from adafruit_extended_bus import ExtendedI2C
+                i2c = ExtendedI2C(self.__bus)
+            _i2c_buses[self.__bus] = i2c
+        return Ads1115Registers(i2c, self.__address)
+
+    def cleanup(self) -> None:
+        if self.__rdy_callback is not None:
+            self.__rdy_callback.cancel()
+            self.__rdy_callback = None
+        if self.__acquisition is not None:
+            self.__acquisition.stop()
+
+    @property
+    def addresses(self) -> list[int]:
+        return list(self.__inputs)
+
+    @property
+    def tags(self) -> dict[int, str]:
+        return {index: self.__tags[pos] for index, pos in enumerate(self.__inputs) if pos in self.__tags}
+
     def is_managed_pos(self, io_pos: int) -> bool:
-        return io_pos in self.__channels.keys()
+        return 0 <= io_pos < len(self.__inputs)
 
     def get_value(self, pos: int) -> Optional[int]:
-        chan = self.__channels.get(pos, None)
-        print(f"ai_pos: {pos}, value: {chan.value if chan else None}")
-        if not chan:
+        if self.__acquisition is None or not self.is_managed_pos(pos):
             return None
-        return chan.value
+        return self.__acquisition.latest(self.__inputs[pos])
 
     def get_all_values(self) -> list[int]:
-        return [chan.value for chan in self.__channels.values()]
+        if self.__acquisition is None:
+            return []
+        return [self.__acquisition.latest(pos) or 0 for pos in self.__acquisition.positions]
+
+    def get_all_samples(self) -> list[list[int]]:
+        if self.__acquisition is None:
+            return []
+        result = []
+        for pos in self.__acquisition.positions:
+            samples, self.__read_counts[pos] = self.__acquisition.samples_since(pos, self.__read_counts.get(pos, 0))
+            result.append(samples)
+        return result
+
+    def get_samples(self, pos: int, n: Optional[int] = None) -> list[int]:
+        """Buffered samples of an input, oldest first."""
+        return self.__acquisition.samples(pos, n) if self.__acquisition is not None else []
+
+    @property
+    def samples_per_second(self) -> float:
+        return self.__acquisition.samples_per_second if self.__acquisition is not None else 0.0
 
     def get_max_value(self) -> int:
-        # 24550~24729
+        # 24550~24729 (gain 1)
         return 24729
         # return 65535
 
     @property
     def io_count(self) -> int:
-        return 4
\ No newline at end of file
+        return len(self.__inputs)
+
+    @property
+    def scan_period(self) -> float:
+        return 0.25
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Ads1115ChannelConfig:
+    """
+    Acquisition settings of one single-ended ADS1115 input.
+
+    gain: PGA gain (2/3, 1, 2, 4, 8 or 16), full scale is 4.096 V / gain.
+    data_rate: samples per second (8, 16, 32, 64, 128, 250, 475 or 860).
+    """
+    gain: float = 1
+    data_rate: int = 860
+    enabled: bool = True
@@ -0,0 +1,38 @@
+# Register pointers
+REG_CONVERSION = 0x00
+REG_CONFIG = 0x01
+REG_LO_THRESH = 0x02
+REG_HI_THRESH = 0x03
+
+# Config register fields
+CONFIG_OS_SINGLE = 0x8000
+CONFIG_MUX_SINGLE_ENDED = 0x4000  # AINx vs GND is 0b100 + x in bits 14:12
+CONFIG_MUX_OFFSET = 12
+CONFIG_MODE_CONTINUOUS = 0x0000
+CONFIG_MODE_SINGLE = 0x0100
+CONFIG_COMP_QUE_ONE = 0x0000      # ALERT/RDY asserts after every conversion (with RDY thresholds)
+CONFIG_COMP_QUE_DISABLE = 0x0003
+
+CONFIG_GAIN = {
+    2 / 3: 0x0000,
+    1: 0x0200,
+    2: 0x0400,
+    4: 0x0600,
+    8: 0x0800,
+    16: 0x0A00,
+}
+
+CONFIG_DATA_RATE = {
+    8: 0x0000,
+    16: 0x0020,
+    32: 0x0040,
+    64: 0x0060,
+    128: 0x0080,
+    250: 0x00A0,
+    475: 0x00C0,
+    860: 0x00E0,
+}
+
+# Hi_thresh MSB = 1 and Lo_thresh MSB = 0 turn ALERT/RDY into a conversion-ready pin
+RDY_HI_THRESH = 0x8000
+RDY_LO_THRESH = 0x0000
@@ -0,0 +1,6 @@
+from typing import Optional
+
+# One entry per ADS1115: (I2C bus, None for the board's default bus, address) -> tags by input
+ADS1115_DEVICES: dict[tuple[Optional[int], int], dict[int, str]] = {
+    (None, 0x48): {0: "station.pressure"},
+}
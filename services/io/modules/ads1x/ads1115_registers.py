@@ -0,0 +1,25 @@
+from adafruit_bus_device.i2c_device import I2CDevice
+
+from services.io.modules.ads1x.ads1115_registers_protocol import Ads1115RegistersProtocol
+
+
+class Ads1115Registers(Ads1115RegistersProtocol):
+    """16-bit register access to one ADS1115 over I2C, without per-call allocations."""
+    def __init__(self, i2c, address: int = 0x48):
+        self.__device = I2CDevice(i2c, address)
+        self.__buffer = bytearray(3)
+
+    def write_register(self, register: int, value: int) -> None:
+        buffer = self.__buffer
+        buffer[0] = register
+        buffer[1] = (value >> 8) & 0xFF
+        buffer[2] = value & 0xFF
+        with self.__device as i2c:
+            i2c.write(buffer)
+
+    def read_register(self, register: int) -> int:
+        buffer = self.__buffer
+        buffer[0] = register
+        with self.__device as i2c:
+            i2c.write_then_readinto(buffer, buffer, out_end=1, in_start=1)
+        return (buffer[1] << 8) | buffer[2]
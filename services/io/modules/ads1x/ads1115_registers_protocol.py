@@ -0,0 +1,7 @@
+from typing import Protocol
+
+
+class Ads1115RegistersProtocol(Protocol):
+    def write_register(self, register: int, value: int) -> None: ...
+
+    def read_register(self, register: int) -> int: ...
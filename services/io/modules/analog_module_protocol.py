@@ -8,4 +8,11 @@ class AnalogModuleProtocol(IOModuleProtocol, Protocol):
 
     def get_all_values(self) -> list[int]: ...
 
-    def get_max_value(self) -> int: ...
\ No newline at end of file
+    def get_max_value(self) -> int: ...
+
+    def get_all_samples(self) -> list[list[int]]:
+        """
+        Per point, the samples acquired since the previous call (oldest first). Modules
+        without sample buffers return the current value as a one-sample batch.
+        """
+        return [[value] for value in self.get_all_values()]
\ No newline at end of file
@@ -2,6 +2,9 @@ from typing import Protocol, Optional, Callable, Tuple
 
 from services.io.modules.io_module_protocol import IOModuleProtocol
 
+# (local index, value, pigpio tick of the edge in microseconds or None)
+EdgeCallback = Callable[[int, bool, Optional[int]], None]
+
 
 class DigitalModuleProtocol(IOModuleProtocol, Protocol):
     def get_value(self, pos: int) -> Optional[bool]: ...
@@ -9,7 +12,12 @@ class DigitalModuleProtocol(IOModuleProtocol, Protocol):
     def get_all_values(self) -> list[bool]: ...
 
     @property
-    def callback(self) -> Optional[Callable[[int, bool], None]]: ...
+    def callback(self) -> Optional[EdgeCallback]: ...
 
     @callback.setter
-    def callback(self, value: Optional[Callable[[int, bool], None]]) -> None: ...
\ No newline at end of file
+    def callback(self, value: Optional[EdgeCallback]) -> None: ...
+
+    @property
+    def debounce(self) -> dict[int, float]:
+        """Software debounce in seconds by local index, applied to edges before they are published."""
+        return {}
\ No newline at end of file
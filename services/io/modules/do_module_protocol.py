@@ -1,8 +1,13 @@
-from typing import Protocol
+from typing import Protocol, Mapping
 
 from services.io.modules.digital_module_protocol import DigitalModuleProtocol
 
 
 
 class DOModuleProtocol(DigitalModuleProtocol, Protocol):
-    def set_value(self, do_pos: int, value: bool) -> None: ...
\ No newline at end of file
+    def set_value(self, do_pos: int, value: bool) -> None: ...
+
+    def set_values(self, values: Mapping[int, bool]) -> None:
+        """Writes several outputs at once; modules that cannot batch write them one by one."""
+        for do_pos, value in values.items():
+            self.set_value(do_pos, value)
\ No newline at end of file
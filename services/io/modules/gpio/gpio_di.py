@@ -1,7 +1,7 @@
 from typing import Optional
 import pigpio
 
-from services.io.modules.gpio.gpio_map import GPIO_DI_MAP
+from services.io.modules.gpio.gpio_map import GPIO_DI_MAP, GPIO_DI_TAGS, GPIO_DI_DEBOUNCE
 from services.io.modules.di_module_protocol import DIModuleProtocol
 from services.io.modules.gpio.gpio_dio import GpioDio
 
@@ -14,6 +14,28 @@ class GPIO_DI(DIModuleProtocol, GpioDio):
     def dio_map(self) -> dict[int, int]:
         return GPIO_DI_MAP
 
+    @property
+    def tag_map(self) -> dict[int, str]:
+        return GPIO_DI_TAGS
+
+    @property
+    def debounce_map(self) -> dict[int, float]:
+        return GPIO_DI_DEBOUNCE
+
+    @property
+    def active_low(self) -> bool:
+        # Inputs are pulled up and switched to ground
+        return True
+
+    @property
+    def scan_period(self) -> float:
+        # Edges arrive through the pigpio callbacks, the scan only catches missed ones
+        return 0.1
+
+    @property
+    def scan_priority(self) -> int:
+        return 10
+
     def handle_pin_status(self, gpio: int, level: int, tick) -> None:
         # print(f"GPIO {gpio} changed to {level}")
         if self.callback is None:
@@ -21,19 +43,7 @@ class GPIO_DI(DIModuleProtocol, GpioDio):
         di_pos = self.dio_map.get(gpio, None)
         if di_pos is None:
             return
-        self.callback(di_pos, level == 0)
-
-    def get_all_values(self) -> list[bool]:
-        result: list[bool] = []
-        for gpio, di in self.dio_map.items():
-            result.append(not bool(self.pi.read(gpio)))
-        return result
-
-    def get_value(self, pos: int) -> Optional[bool]:
-        for gpio, di in self.dio_map.items():
-            if di == pos:
-                return not bool(self.pi.read(gpio))
-        return None
+        self.callback(di_pos, level == 0, tick)
 
     def initialize(self) -> None:
         for gpio_pin in self.dio_map.keys():
@@ -1,33 +1,71 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Callable
+from typing import Optional, Mapping
 
 import pigpio
 
-from services.io.modules.digital_module_protocol import DigitalModuleProtocol
+from services.io.modules.digital_module_protocol import DigitalModuleProtocol, EdgeCallback
 
 
 class GpioDio(DigitalModuleProtocol, ABC):
+    """
+    Digital points on Raspberry Pi GPIOs 0-31 (bank 1).
+
+    All points are read with one read_bank_1() call and decoded through bit masks
+    precomputed from dio_map, in dio_map order. Writes are grouped into at most one
+    set_bank_1() and one clear_bank_1() call.
+    """
     def __init__(self, pi: pigpio.pi):
         self.__pi = pi
-        self.__callback: Optional[Callable[[int, bool], None]] = None
+        self.__callback: Optional[EdgeCallback] = None
 
         self.__gpio_callbacks = []
 
+        # (pos, mask) in dio_map order, and pos -> mask
+        self.__masks: tuple[tuple[int, int], ...] = tuple((pos, 1 << gpio) for gpio, pos in self.dio_map.items())
+        self.__mask_by_pos: dict[int, int] = dict(self.__masks)
+
     @property
     @abstractmethod
     def dio_map(self) -> dict[int, int]:
         pass
 
+    @property
+    def tag_map(self) -> dict[int, str]:
+        """Tags of the points by GPIO."""
+        return {}
+
+    @property
+    def debounce_map(self) -> dict[int, float]:
+        """Software debounce in seconds by GPIO."""
+        return {}
+
+    @property
+    def debounce(self) -> dict[int, float]:
+        return {self.dio_map[gpio]: seconds for gpio, seconds in self.debounce_map.items() if gpio in self.dio_map}
+
+    @property
+    def addresses(self) -> list[int]:
+        return list(self.dio_map.keys())
+
+    @property
+    def tags(self) -> dict[int, str]:
+        return {self.dio_map[gpio]: tag for gpio, tag in self.tag_map.items() if gpio in self.dio_map}
+
+    @property
+    def active_low(self) -> bool:
+        """True if a low level means the point is on."""
+        return False
+
     @property
     def pi(self) -> pigpio.pi:
         return self.__pi
 
     @property
-    def callback(self) -> Optional[Callable[[int, bool], None]]:
+    def callback(self) -> Optional[EdgeCallback]:
         return self.__callback
 
     @callback.setter
-    def callback(self, value: Optional[Callable[[int, bool], None]]) -> None:
+    def callback(self, value: Optional[EdgeCallback]) -> None:
         self.__callback = value
 
     def add_gpio_callback(self, gpio, edge=pigpio.EITHER_EDGE, steady=5000):
@@ -41,24 +79,41 @@ class GpioDio(DigitalModuleProtocol, ABC):
         pass
 
     def get_all_values(self) -> list[bool]:
-        result: list[bool] = []
-        for gpio, di in self.dio_map.items():
-            result.append(bool(self.pi.read(gpio)))
-        return result
+        levels = self.pi.read_bank_1()
+        if self.active_low:
+            return [not (levels & mask) for _, mask in self.__masks]
+        return [bool(levels & mask) for _, mask in self.__masks]
 
     @property
     def io_count(self) -> int:
         return len(self.dio_map)
 
     def get_value(self, pos: int) -> Optional[bool]:
-        for gpio, di in self.dio_map.items():
-            if di == pos:
-                return bool(self.pi.read(gpio))
-        return None
+        mask = self.__mask_by_pos.get(pos)
+        if mask is None:
+            return None
+        return bool(self.pi.read_bank_1() & mask) != self.active_low
+
+    def write_values(self, values: Mapping[int, bool]) -> None:
+        """Writes several points with at most one set_bank_1 and one clear_bank_1 call."""
+        high = 0
+        low = 0
+        for pos, value in values.items():
+            mask = self.__mask_by_pos.get(pos)
+            if mask is None:
+                continue
+            if bool(value) != self.active_low:
+                high |= mask
+            else:
+                low |= mask
+        if high:
+            self.pi.set_bank_1(high)
+        if low:
+            self.pi.clear_bank_1(low)
 
     def cleanup(self) -> None:
         for gpio_callback in self.__gpio_callbacks:
             gpio_callback.cancel()
 
     def is_managed_pos(self, io_pos: int) -> bool:
-        return io_pos in self.dio_map.values()
\ No newline at end of file
+        return io_pos in self.__mask_by_pos
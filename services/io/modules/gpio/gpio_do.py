@@ -1,6 +1,8 @@
+from typing import Mapping
+
 import pigpio
 
-from services.io.modules.gpio.gpio_map import GPIO_DO_MAP
+from services.io.modules.gpio.gpio_map import GPIO_DO_MAP, GPIO_DO_TAGS
 from services.io.modules.do_module_protocol import DOModuleProtocol
 from services.io.modules.gpio.gpio_dio import GpioDio
 
@@ -14,6 +16,18 @@ class GPIO_DO(DOModuleProtocol, GpioDio):
     def dio_map(self) -> dict[int, int]:
         return GPIO_DO_MAP
 
+    @property
+    def tag_map(self) -> dict[int, str]:
+        return GPIO_DO_TAGS
+
+    @property
+    def scan_period(self) -> float:
+        return 0.2
+
+    @property
+    def scan_priority(self) -> int:
+        return 5
+
     def initialize(self) -> None:
         for gpio_pin in GPIO_DO_MAP.keys():
             self.pi.write(gpio_pin, 0)
@@ -22,11 +36,10 @@ class GPIO_DO(DOModuleProtocol, GpioDio):
             self.add_gpio_callback(gpio_pin)
 
     def set_value(self, do_pos: int, value: bool) -> None:
-        for gpio, di in self.dio_map.items():
-            if di == do_pos:
-                # print(f"Set GPIO DO: {do_pos}, Value: {value}")
-                self.pi.write(gpio, value)
-                return
+        self.write_values({do_pos: value})
+
+    def set_values(self, values: Mapping[int, bool]) -> None:
+        self.write_values(values)
 
     def handle_pin_status(self, gpio: int, level: int, tick) -> None:
         # print(f"GPIO {gpio} changed to {level}")
@@ -35,4 +48,4 @@ class GPIO_DO(DOModuleProtocol, GpioDio):
         di_pos = self.dio_map.get(gpio, None)
         if di_pos is None:
             return
-        self.callback(di_pos, level == 1)
\ No newline at end of file
+        self.callback(di_pos, level == 1, tick)
\ No newline at end of file
@@ -16,3 +16,34 @@ GPIO_DO_MAP: dict[int, int] = {
     24: 1,  # Cmd pump 2 Run
     25: 2,  # Cmd pump 3 Run
 }
+
+
+# Tags of the points by GPIO, see IORegistry
+GPIO_DI_TAGS: dict[int, str] = {
+    17: "pump1.run_fb",
+    27: "pump2.run_fb",
+    22: "pump3.run_fb",
+    5: "pump1.hand",
+    6: "pump1.auto",
+    26: "pump2.hand",
+    16: "pump2.auto",
+    20: "pump3.hand",
+    21: "pump3.auto",
+    4: "station.estop",
+}
+
+# Software debounce (s) by GPIO on top of the pigpio glitch filter, see EdgeQueue
+GPIO_DI_DEBOUNCE: dict[int, float] = {
+    5: 0.05,   # Pump 1 Hand
+    6: 0.05,   # Pump 1 Auto
+    26: 0.05,  # Pump 2 Hand
+    16: 0.05,  # Pump 2 Auto
+    20: 0.05,  # Pump 3 Hand
+    21: 0.05,  # Pump 3 Auto
+}
+
+GPIO_DO_TAGS: dict[int, str] = {
+    23: "pump1.run_cmd",
+    24: "pump2.run_cmd",
+    25: "pump3.run_cmd",
+}
@@ -14,3 +14,28 @@ class IOModuleProtocol(Protocol):
     def get_value(self, pos: int) -> Optional[bool] | Optional[int]: ...
 
     def get_all_values(self) -> list[bool] | list[int]: ...
+
+    @property
+    def addresses(self) -> list[int]:
+        """Hardware address of each point (GPIO number, ADC input, ...), in get_all_values() order."""
+        return list(range(self.io_count))
+
+    @property
+    def tags(self) -> dict[int, str]:
+        """Names of points by index in get_all_values(), e.g. {0: "pump1.run_fb"}."""
+        return {}
+
+    @property
+    def scan_period(self) -> float:
+        """Seconds between two scans of this module by the ScanScheduler."""
+        return 0.5
+
+    @property
+    def scan_priority(self) -> int:
+        """Higher values are scanned first when the periods of several modules coincide."""
+        return 0
+
+    @property
+    def blocking_io(self) -> bool:
+        """True if reads block the calling OS thread (e.g. I2C), so they run off the event loop."""
+        return False
@@ -0,0 +1,132 @@
+import importlib
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+try:
+    # Stepped from the native ADS1115 acquisition thread as well as from green threads
+    from eventlet.patcher import original as _original
+except ImportError:
+    _original = importlib.import_module
+
+_threading = _original("threading")
+_time = _original("time")
+
+# Demand flow (m3/h at nominal pressure) by seconds since the model started
+DemandProfile = Callable[[float], float]
+
+
+def constant_demand(flow: float) -> DemandProfile:
+    return lambda elapsed: flow
+
+
+def sine_demand(base: float, peak: float, period: float = 600.0) -> DemandProfile:
+    """Demand swinging between base and peak once per period (a compressed day)."""
+    return lambda elapsed: base + (peak - base) * 0.5 * (1.0 - math.cos(2.0 * math.pi * elapsed / period))
+
+
+def step_demand(steps: list[tuple[float, float]]) -> DemandProfile:
+    """Demand of the last (start second, flow) step reached; 0 before the first one."""
+    ordered = sorted(steps)
+
+    def demand(elapsed: float) -> float:
+        flow = 0.0
+        for start, value in ordered:
+            if elapsed < start:
+                break
+            flow = value
+        return flow
+    return demand
+
+
+@dataclass(frozen=True)
+class HydraulicModelConfig:
+    pump_count: int = 3
+    pump_flow: float = 30.0          # m3/h of one pump at zero pressure
+    shutoff_pressure: float = 100.0  # pressure at which a pump delivers nothing
+    nominal_pressure: float = 50.0   # pressure at which the demand profile flows
+    capacitance: float = 10.0        # m3/h of imbalance that moves the pressure by 1 unit/s
+    start_delay: float = 0.5         # s from run command to running feedback
+    stop_delay: float = 0.3          # s from stop command to feedback dropping
+    initial_pressure: float = 0.0
+    full_scale: float = 100.0        # pressure reported as the sensor's full scale
+    demand: DemandProfile = field(default=constant_demand(25.0))
+    max_step: float = 0.05           # s, integration step
+
+
+class HydraulicModel:
+    """
+    Pressure of a network fed by the station pumps, for the simulated IO modules.
+
+    Each running pump delivers pump_flow * (1 - P / shutoff_pressure), the network
+    draws demand * sqrt(P / nominal_pressure), and the imbalance charges or drains the
+    network's capacitance. A pump reports running start_delay after its run command
+    and stops reporting stop_delay after the command drops, like a contactor
+    auxiliary contact.
+
+    The model integrates up to the current time whenever it is read or commanded, so
+    it needs no thread of its own.
+    """
+    def __init__(self, config: Optional[HydraulicModelConfig] = None, clock: Callable[[], float] = _time.monotonic):
+        self.__config = config if config is not None else HydraulicModelConfig()
+        self.__clock = clock
+        self.__lock = _threading.Lock()
+        self.__started_at = clock()
+        self.__stepped_at = self.__started_at
+        self.__pressure = self.__config.initial_pressure
+        self.__commands = [False] * self.__config.pump_count
+        # Time of the last change of each run command
+        self.__changed_at = [self.__started_at] * self.__config.pump_count
+
+    @property
+    def config(self) -> HydraulicModelConfig:
+        return self.__config
+
+    @property
+    def pressure(self) -> float:
+        with self.__lock:
+            self.__step(self.__clock())
+            return self.__pressure
+
+    @property
+    def demand(self) -> float:
+        return self.__config.demand(self.__clock() - self.__started_at)
+
+    def set_command(self, pump: int, run: bool) -> None:
+        if not 0 <= pump < len(self.__commands):
+            return
+        with self.__lock:
+            now = self.__clock()
+            self.__step(now)
+            if self.__commands[pump] != run:
+                self.__commands[pump] = run
+                self.__changed_at[pump] = now
+
+    def command(self, pump: int) -> bool:
+        return 0 <= pump < len(self.__commands) and self.__commands[pump]
+
+    def is_running(self, pump: int) -> bool:
+        if not 0 <= pump < len(self.__commands):
+            return False
+        return self.__running_at(pump, self.__clock())
+
+    # ---------- internals ----------
+
+    def __running_at(self, pump: int, now: float) -> bool:
+        elapsed = now - self.__changed_at[pump]
+        if self.__commands[pump]:
+            return elapsed >= self.__config.start_delay
+        return elapsed < self.__config.stop_delay and self.__changed_at[pump] != self.__started_at
+
+    def __step(self, now: float) -> None:
+        config = self.__config
+        t = self.__stepped_at
+        while t < now:
+            dt = min(config.max_step, now - t)
+            t += dt
+            pressure = max(self.__pressure, 0.0)
+            running = sum(1 for pump in range(len(self.__commands)) if self.__running_at(pump, t))
+            inflow = running * config.pump_flow * max(0.0, 1.0 - pressure / config.shutoff_pressure)
+            outflow = config.demand(t - self.__started_at) * math.sqrt(pressure / config.nominal_pressure)
+            self.__pressure = max(0.0, pressure + (inflow - outflow) / config.capacitance * dt)
+        self.__stepped_at = max(self.__stepped_at, now)
@@ -0,0 +1,66 @@
+import random
+from typing import Callable, Optional
+
+from services.io.modules.ads1x.ads1115_constants import REG_CONVERSION, REG_CONFIG, CONFIG_MUX_OFFSET
+from services.io.modules.ads1x.ads1115_registers_protocol import Ads1115RegistersProtocol
+from services.io.modules.sim.hydraulic_model import HydraulicModel
+
+
+class SimAds1115(Ads1115RegistersProtocol):
+    """
+    ADS1115 registers backed by a HydraulicModel, for Ads1115_AI(registers=...).
+
+    Input `pressure_input` (None for none) reads the model pressure over
+    raw_full_scale counts. With `inverted` (the
+    default, matching Sensor, which scales ai_min..ai_max to value_scaled_max..
+    value_scaled_min) zero pressure reads raw_full_scale and full_scale reads 0;
+    otherwise the other way round. Other inputs read the counts returned by their entry in
+    `sources`, or 0. Every conversion gets gaussian noise of noise_counts.
+    """
+    def __init__(
+            self,
+            model: HydraulicModel,
+            raw_full_scale: int = 24729,
+            noise_counts: float = 8.0,
+            sources: Optional[dict[int, Callable[[], int]]] = None,
+            seed: Optional[int] = None,
+            inverted: bool = True,
+            pressure_input: Optional[int] = 0,
+    ):
+        self.__model = model
+        self.__raw_full_scale = raw_full_scale
+        self.__noise_counts = noise_counts
+        self.__inverted = inverted
+        self.__sources: dict[int, Callable[[], int]] = {} if pressure_input is None else {pressure_input: self.__pressure_counts}
+        if sources:
+            self.__sources.update(sources)
+        self.__random = random.Random(seed)
+        self.__registers: dict[int, int] = {}
+        self.__input = 0
+        self.__conversions = 0
+
+    @property
+    def conversions(self) -> int:
+        return self.__conversions
+
+    def write_register(self, register: int, value: int) -> None:
+        self.__registers[register] = value & 0xFFFF
+        if register == REG_CONFIG:
+            self.__input = (value >> CONFIG_MUX_OFFSET) & 0x03
+
+    def read_register(self, register: int) -> int:
+        if register != REG_CONVERSION:
+            return self.__registers.get(register, 0)
+        self.__conversions += 1
+        source = self.__sources.get(self.__input)
+        counts = source() if source is not None else 0
+        if self.__noise_counts:
+            counts += round(self.__random.gauss(0.0, self.__noise_counts))
+        counts = max(-0x8000, min(0x7FFF, counts))
+        return counts & 0xFFFF
+
+    def __pressure_counts(self) -> int:
+        fraction = self.__model.pressure / self.__model.config.full_scale
+        if self.__inverted:
+            fraction = 1.0 - fraction
+        return round(fraction * self.__raw_full_scale)
@@ -0,0 +1,57 @@
+from typing import Optional
+
+from services.io.modules.di_module_protocol import DIModuleProtocol
+from services.io.modules.gpio.gpio_map import GPIO_DI_MAP, GPIO_DI_TAGS, GPIO_DI_DEBOUNCE
+from services.io.modules.sim.hydraulic_model import HydraulicModel
+from services.io.modules.sim.sim_gpio_dio import SimGpioDio
+
+
+class SimGpioDI(DIModuleProtocol, SimGpioDio):
+    """
+    Simulated GPIO_DI. "pump<N>.run_fb" points follow the model's delayed contactor
+    feedback and are picked up by the scan. Every other point is a switch set with
+    set_input(), which also fires the edge callback like a pigpio callback would.
+    "pump<N>.auto" switches start on, everything else off.
+    """
+    def __init__(
+            self,
+            model: HydraulicModel,
+            dio_map: Optional[dict[int, int]] = None,
+            tag_map: Optional[dict[int, str]] = None,
+            debounce_map: Optional[dict[int, float]] = None,
+    ):
+        super().__init__(
+            model,
+            GPIO_DI_MAP if dio_map is None else dio_map,
+            GPIO_DI_TAGS if tag_map is None else tag_map,
+            GPIO_DI_DEBOUNCE if debounce_map is None else debounce_map,
+        )
+        tags = self.tags
+        # Local index -> pump whose feedback it reports
+        self.__feedback = {pos: pump for pos, tag in tags.items() if (pump := self._pump_of(tag, "run_fb")) is not None}
+        self.__switches = [self._pump_of(tags.get(pos), "auto") is not None for pos in range(self.io_count)]
+        self.__index_by_tag = {tag: pos for pos, tag in tags.items()}
+
+    @property
+    def scan_period(self) -> float:
+        return 0.1
+
+    @property
+    def scan_priority(self) -> int:
+        return 10
+
+    def get_all_values(self) -> list[bool]:
+        values = list(self.__switches)
+        for pos, pump in self.__feedback.items():
+            values[pos] = self.model.is_running(pump)
+        return values
+
+    def set_input(self, point: int | str, value: bool) -> None:
+        """Sets a switch by local index or tag, e.g. set_input("station.estop", True)."""
+        pos = self.__index_by_tag[point] if isinstance(point, str) else point
+        if not self.is_managed_pos(pos) or pos in self.__feedback:
+            raise ValueError(f"Input {point} is not a simulated switch")
+        if self.__switches[pos] == value:
+            return
+        self.__switches[pos] = value
+        self._notify(pos, value)
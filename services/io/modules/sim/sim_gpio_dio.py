@@ -0,0 +1,81 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from services.io.modules.digital_module_protocol import DigitalModuleProtocol, EdgeCallback
+from services.io.modules.sim.hydraulic_model import HydraulicModel
+
+
+class SimGpioDio(DigitalModuleProtocol, ABC):
+    """
+    Digital points laid out like GpioDio (dio_map of GPIO -> local index, tag_map of
+    GPIO -> tag) whose levels come from a HydraulicModel instead of pigpio.
+    """
+    def __init__(self, model: HydraulicModel, dio_map: dict[int, int], tag_map: Optional[dict[int, str]] = None, debounce_map: Optional[dict[int, float]] = None):
+        self.__model = model
+        self.__dio_map = dict(dio_map)
+        self.__tag_map = dict(tag_map) if tag_map else {}
+        self.__debounce_map = dict(debounce_map) if debounce_map else {}
+        self.__callback: Optional[EdgeCallback] = None
+
+    @property
+    def model(self) -> HydraulicModel:
+        return self.__model
+
+    @property
+    def dio_map(self) -> dict[int, int]:
+        return self.__dio_map
+
+    @property
+    def addresses(self) -> list[int]:
+        return list(self.__dio_map.keys())
+
+    @property
+    def tags(self) -> dict[int, str]:
+        return {self.__dio_map[gpio]: tag for gpio, tag in self.__tag_map.items() if gpio in self.__dio_map}
+
+    @property
+    def debounce(self) -> dict[int, float]:
+        return {self.__dio_map[gpio]: seconds for gpio, seconds in self.__debounce_map.items() if gpio in self.__dio_map}
+
+    @property
+    def callback(self) -> Optional[EdgeCallback]:
+        return self.__callback
+
+    @callback.setter
+    def callback(self, value: Optional[EdgeCallback]) -> None:
+        self.__callback = value
+
+    @property
+    def io_count(self) -> int:
+        return len(self.__dio_map)
+
+    def initialize(self) -> None:
+        pass
+
+    def cleanup(self) -> None:
+        pass
+
+    def is_managed_pos(self, io_pos: int) -> bool:
+        return 0 <= io_pos < self.io_count
+
+    def get_value(self, pos: int) -> Optional[bool]:
+        if not self.is_managed_pos(pos):
+            return None
+        return self.get_all_values()[pos]
+
+    @abstractmethod
+    def get_all_values(self) -> list[bool]:
+        pass
+
+    def _notify(self, pos: int, value: bool) -> None:
+        # Same contract as the pigpio edge callbacks, without a tick
+        if self.__callback is not None:
+            self.__callback(pos, value, None)
+
+    @staticmethod
+    def _pump_of(tag: Optional[str], suffix: str) -> Optional[int]:
+        """0-based pump of a "pump<N>.<suffix>" tag."""
+        if tag is None or not tag.startswith("pump") or not tag.endswith("." + suffix):
+            return None
+        number = tag[len("pump"):-len(suffix) - 1]
+        return int(number) - 1 if number.isdigit() else None
@@ -0,0 +1,49 @@
+from typing import Optional, Mapping
+
+from services.io.modules.do_module_protocol import DOModuleProtocol
+from services.io.modules.gpio.gpio_map import GPIO_DO_MAP, GPIO_DO_TAGS
+from services.io.modules.sim.hydraulic_model import HydraulicModel
+from services.io.modules.sim.sim_gpio_dio import SimGpioDio
+
+
+class SimGpioDO(DOModuleProtocol, SimGpioDio):
+    """
+    Simulated GPIO_DO. "pump<N>.run_cmd" points drive the model's pumps; writes are
+    counted so benchmarks can compare them with the pigpio round trips they replace.
+    """
+    def __init__(self, model: HydraulicModel, dio_map: Optional[dict[int, int]] = None, tag_map: Optional[dict[int, str]] = None):
+        super().__init__(model, GPIO_DO_MAP if dio_map is None else dio_map, GPIO_DO_TAGS if tag_map is None else tag_map)
+        # Local index -> pump it commands
+        self.__commands = {pos: pump for pos, tag in self.tags.items() if (pump := self._pump_of(tag, "run_cmd")) is not None}
+        self.__values = [False] * self.io_count
+        self.__writes = 0
+
+    @property
+    def writes(self) -> int:
+        """set_value()/set_values() calls, each standing for one bank write."""
+        return self.__writes
+
+    @property
+    def scan_period(self) -> float:
+        return 0.2
+
+    @property
+    def scan_priority(self) -> int:
+        return 5
+
+    def get_all_values(self) -> list[bool]:
+        return list(self.__values)
+
+    def set_value(self, do_pos: int, value: bool) -> None:
+        self.set_values({do_pos: value})
+
+    def set_values(self, values: Mapping[int, bool]) -> None:
+        self.__writes += 1
+        for pos, value in values.items():
+            if not self.is_managed_pos(pos) or self.__values[pos] == value:
+                continue
+            self.__values[pos] = value
+            pump = self.__commands.get(pos)
+            if pump is not None:
+                self.model.set_command(pump, value)
+            self._notify(pos, value)
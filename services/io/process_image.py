@@ -0,0 +1,41 @@
+from array import array
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+
+@dataclass(frozen=True)
+class InputImage:
+    """
+    Values of every IO point frozen at the start of a control cycle, by kind and
+    global position. Never changes after it is taken, so it is read without a lock.
+    """
+    seq: int
+    timestamp: float
+    di: array
+    do: array
+    ai: array
+    ao: array
+
+    @staticmethod
+    def freeze(seq: int, timestamp: float, values: dict[str, Sequence[Optional[bool | int]]]) -> "InputImage":
+        return InputImage(
+            seq=seq,
+            timestamp=timestamp,
+            di=array("b", (bool(v) for v in values["di"])),
+            do=array("b", (bool(v) for v in values["do"])),
+            ai=array("l", (v or 0 for v in values["ai"])),
+            ao=array("l", (v or 0 for v in values["ao"])),
+        )
+
+    def get(self, kind: str, pos: int) -> Optional[int]:
+        values: array = getattr(self, kind)
+        return values[pos] if 0 <= pos < len(values) else None
+
+
+@dataclass(frozen=True)
+class ProcessImageStats:
+    cycles: int
+    writes: int              # set_digital_output_value calls deferred to the output image
+    commits: int             # cycles that wrote at least one output
+    last_cycle_ms: float
+    max_cycle_ms: float
@@ -0,0 +1,63 @@
+import collections
+import dataclasses
+from typing import Optional
+
+
+@dataclasses.dataclass(frozen=True)
+class SafetyLatencyStats:
+    edges: int = 0          # safety edges delivered on the edge thread
+    writes: int = 0         # digital output writes made while delivering them
+    samples: int = 0        # edges in the percentiles (the last `window` that wrote an output)
+    last_ms: float = 0.0
+    max_ms: float = 0.0
+    p50_ms: float = 0.0
+    p99_ms: float = 0.0
+
+
+class SafetyLatency:
+    """Edge-to-output latencies of safety edges: from the edge callback to the last output it wrote."""
+    def __init__(self, window: int = 1024):
+        self.__samples: collections.deque[float] = collections.deque(maxlen=window)
+        self.__edges = 0
+        self.__writes = 0
+        self.__last = 0.0
+        self.__max = 0.0
+
+    @property
+    def stats(self) -> SafetyLatencyStats:
+        samples = sorted(self.__samples)
+        return SafetyLatencyStats(
+            edges=self.__edges,
+            writes=self.__writes,
+            samples=len(samples),
+            last_ms=self.__last,
+            max_ms=self.__max,
+            p50_ms=self.percentile(samples, 50.0),
+            p99_ms=self.percentile(samples, 99.0),
+        )
+
+    def reset(self) -> None:
+        self.__samples.clear()
+        self.__edges = 0
+        self.__writes = 0
+        self.__last = 0.0
+        self.__max = 0.0
+
+    def add(self, latency: Optional[float], writes: int) -> None:
+        """One delivered edge; latency in seconds to its last output write, None if it wrote nothing."""
+        self.__edges += 1
+        self.__writes += writes
+        if latency is None:
+            return
+        ms = latency * 1000.0
+        self.__samples.append(ms)
+        self.__last = ms
+        self.__max = max(self.__max, ms)
+
+    @staticmethod
+    def percentile(samples: list[float], percent: float) -> float:
+        """Nearest-rank percentile of sorted samples, 0 when empty."""
+        if not samples:
+            return 0.0
+        rank = max(1, -(-len(samples) * percent // 100))
+        return samples[int(rank) - 1]
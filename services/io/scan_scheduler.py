@@ -0,0 +1,119 @@
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from core.thread_manager_protocol import ThreadManagerProtocol
+from services.io.modules.io_module_protocol import IOModuleProtocol
+
+
+@dataclass(frozen=True)
+class ModuleScanStats:
+    name: str
+    period: float
+    priority: int
+    scans: int = 0
+    overruns: int = 0
+    errors: int = 0
+    last_duration_ms: float = 0.0
+    max_duration_ms: float = 0.0
+    avg_duration_ms: float = 0.0
+
+
+@dataclass
+class _ScanJob:
+    name: str
+    module: IOModuleProtocol
+    period: float
+    priority: int
+    phase: float = 0.0
+    scans: int = 0
+    overruns: int = 0
+    errors: int = 0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+
+    def stats(self) -> ModuleScanStats:
+        return ModuleScanStats(
+            name=self.name,
+            period=self.period,
+            priority=self.priority,
+            scans=self.scans,
+            overruns=self.overruns,
+            errors=self.errors,
+            last_duration_ms=self.last_duration * 1000.0,
+            max_duration_ms=self.max_duration * 1000.0,
+            avg_duration_ms=(self.total_duration / self.scans) * 1000.0 if self.scans else 0.0,
+        )
+
+
+class ScanScheduler:
+    """
+    Scans every IO module in its own background task at the module's scan_period,
+    independent of the station control tick.
+
+    Deadlines are kept on a fixed grid (no drift). A scan that takes longer than
+    its period counts as an overrun and the missed periods are skipped instead of
+    being caught up. Modules are staggered by `PRIORITY_STAGGER` per priority rank,
+    so where periods coincide the higher priority module is read first.
+    """
+    PRIORITY_STAGGER = 0.002
+
+    def __init__(self, thread_manager: ThreadManagerProtocol, scan: Callable[[IOModuleProtocol], None]):
+        self.__thread_manager = thread_manager
+        self.__scan = scan
+        self.__jobs: list[_ScanJob] = []
+        self.__running = False
+
+    @property
+    def running(self) -> bool:
+        return self.__running
+
+    def add(self, name: str, module: IOModuleProtocol) -> None:
+        if self.__running:
+            raise RuntimeError("Modules must be added before the scheduler starts")
+        self.__jobs.append(_ScanJob(name=name, module=module, period=module.scan_period, priority=module.scan_priority))
+
+    def start(self) -> None:
+        if self.__running:
+            return
+        self.__running = True
+        self.__jobs.sort(key=lambda j: j.priority, reverse=True)
+        epoch = time.monotonic()
+        for rank, job in enumerate(self.__jobs):
+            job.phase = rank * self.PRIORITY_STAGGER
+            self.__thread_manager.start_background_task(self.__run, job, epoch)
+
+    def stop(self) -> None:
+        self.__running = False
+
+    def stats(self) -> list[ModuleScanStats]:
+        return [job.stats() for job in self.__jobs]
+
+    def __run(self, job: _ScanJob, epoch: float) -> None:
+        next_due = epoch + job.phase
+        while self.__running:
+            delay = next_due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            start = time.monotonic()
+            try:
+                self.__scan(job.module)
+            except Exception as e:
+                job.errors += 1
+                print(f"[ScanScheduler] Error scanning {job.name}: {e}")
+            end = time.monotonic()
+
+            duration = end - start
+            job.scans += 1
+            job.last_duration = duration
+            job.max_duration = max(job.max_duration, duration)
+            job.total_duration += duration
+
+            next_due += job.period
+            if end > next_due:
+                job.overruns += 1
+                # Skip the missed periods, stay on the grid
+                missed = int((end - next_due) // job.period) + 1
+                next_due += missed * job.period
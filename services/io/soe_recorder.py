@@ -0,0 +1,210 @@
+import collections
+import json
+import os
+import time
+from array import array
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Optional, Callable, Any
+
+from core.thread_manager_protocol import ThreadManagerProtocol
+from services.io.io_registry import IO_KINDS
+
+_TICK_WRAP = 1 << 32  # pigpio ticks are 32-bit microseconds (wrap every ~71.6 min)
+_KIND_INDEX = {kind: index for index, kind in enumerate(IO_KINDS)}
+
+
+@dataclass(frozen=True)
+class SoeRecord:
+    seq: int
+    tick: int          # pigpio tick in us, unwrapped to 64 bits; -1 if the edge had none
+    timestamp: float   # wall clock when the edge was recorded
+    kind: str
+    io_id: int
+    level: bool
+
+
+@dataclass(frozen=True)
+class SoeTrigger:
+    trigger_id: int
+    reason: str
+    seq: int           # sequence number of the record that fired it (or the next one)
+    timestamp: float
+
+
+@dataclass(frozen=True)
+class SoeWindow:
+    trigger: Optional[SoeTrigger]
+    records: tuple[SoeRecord, ...]
+    path: Optional[str] = None
+
+
+class SoeRecorder:
+    """
+    Sequence-of-events recorder of every digital edge.
+
+    record() runs on the edge callback thread. It stores the edge's pigpio tick, the
+    wall clock, the point and its level in preallocated arrays used as a ring of the
+    last `capacity` edges, with no allocation and no lock (one writer at a time).
+
+    Edges registered with add_trigger() (e.g. the e-stop going active) and manual
+    trigger() calls (e.g. a fail-to-start) fire a trigger. `post_trigger` seconds
+    later the flusher task copies the records from `pre_trigger` seconds before to
+    `post_trigger` seconds after it, keeps the window for query() and writes it to
+    `directory` as JSON. Nothing touches the disk without a trigger.
+    """
+    def __init__(
+            self,
+            capacity: int = 4096,
+            directory: str | os.PathLike = "soe",
+            pre_trigger: float = 2.0,
+            post_trigger: float = 1.0,
+            keep_windows: int = 16,
+            thread_manager: Optional[ThreadManagerProtocol] = None,
+            run_blocking: Optional[Callable[..., Any]] = None,
+    ):
+        self.__capacity = capacity
+        self.__directory = Path(directory)
+        self.__pre_trigger = pre_trigger
+        self.__post_trigger = post_trigger
+        self.__thread_manager = thread_manager
+        self.__run_blocking = run_blocking
+
+        self.__ticks = array("q", [0]) * capacity
+        self.__timestamps = array("d", [0.0]) * capacity
+        self.__kinds = array("b", [0]) * capacity
+        self.__io_ids = array("l", [0]) * capacity
+        self.__levels = array("b", [0]) * capacity
+        self.__count = 0
+        self.__last_tick = 0
+        self.__tick_wraps = 0
+
+        # (kind index, io_id, level) -> reason
+        self.__triggers: dict[tuple[int, int, bool], str] = {}
+        self.__fired: collections.deque[SoeTrigger] = collections.deque()
+        self.__trigger_ids = 0
+        self.__windows: collections.deque[SoeWindow] = collections.deque(maxlen=keep_windows)
+        self.__running = False
+
+    @property
+    def count(self) -> int:
+        """Edges recorded since creation."""
+        return self.__count
+
+    @property
+    def running(self) -> bool:
+        return self.__running
+
+    def add_trigger(self, kind: str, io_id: int, level: bool, reason: str) -> None:
+        """Fires a trigger whenever the point changes to level."""
+        self.__triggers[(_KIND_INDEX[kind], io_id, bool(level))] = reason
+
+    def record(self, kind: str, io_id: int, level: bool, tick: Optional[int] = None) -> None:
+        kind_index = _KIND_INDEX[kind]
+        level = bool(level)
+        now = time.time()
+        if tick is not None:
+            if tick < self.__last_tick and self.__last_tick - tick > _TICK_WRAP // 2:
+                self.__tick_wraps += 1
+            self.__last_tick = tick
+            tick += self.__tick_wraps * _TICK_WRAP
+        else:
+            tick = -1
+
+        seq = self.__count
+        slot = seq % self.__capacity
+        self.__ticks[slot] = tick
+        self.__timestamps[slot] = now
+        self.__kinds[slot] = kind_index
+        self.__io_ids[slot] = io_id
+        self.__levels[slot] = level
+        self.__count = seq + 1
+
+        reason = self.__triggers.get((kind_index, io_id, level))
+        if reason is not None:
+            self.__fire(reason, seq, now)
+
+    def trigger(self, reason: str) -> None:
+        """Fires a trigger now, for conditions that are not an edge (fail-to-start, ...)."""
+        self.__fire(reason, self.__count, time.time())
+
+    def query(self, trigger_id: Optional[int] = None) -> Optional[SoeWindow]:
+        """The saved window of a trigger (default: the latest one), None if unknown."""
+        windows = list(self.__windows)
+        if trigger_id is None:
+            return windows[-1] if windows else None
+        return next((window for window in windows if window.trigger.trigger_id == trigger_id), None)
+
+    def window(self, around: Optional[float] = None, pre: Optional[float] = None, post: Optional[float] = None) -> SoeWindow:
+        """The records still in the ring from pre seconds before to post seconds after around (default: now)."""
+        around = time.time() if around is None else around
+        pre = self.__pre_trigger if pre is None else pre
+        post = self.__post_trigger if post is None else post
+        return SoeWindow(trigger=None, records=self.__records_between(around - pre, around + post))
+
+    def start(self) -> None:
+        if self.__running:
+            return
+        if self.__thread_manager is None:
+            raise RuntimeError("SoeRecorder.start needs a thread manager")
+        self.__running = True
+        self.__thread_manager.start_background_task(self.__worker)
+
+    def stop(self) -> None:
+        self.__running = False
+
+    # ---------- internals ----------
+
+    def __fire(self, reason: str, seq: int, timestamp: float) -> None:
+        self.__trigger_ids += 1
+        self.__fired.append(SoeTrigger(trigger_id=self.__trigger_ids, reason=reason, seq=seq, timestamp=timestamp))
+
+    def __worker(self) -> None:
+        while self.__running:
+            while self.__fired and time.time() >= self.__fired[0].timestamp + self.__post_trigger:
+                self.__save(self.__fired.popleft())
+            time.sleep(0.1)
+
+    def __save(self, trigger: SoeTrigger) -> None:
+        records = self.__records_between(trigger.timestamp - self.__pre_trigger, trigger.timestamp + self.__post_trigger)
+        name = time.strftime("%Y%m%d-%H%M%S", time.localtime(trigger.timestamp))
+        path = self.__directory / f"soe_{name}_{trigger.trigger_id:04d}_{trigger.reason}.json"
+        document = {"trigger": asdict(trigger), "records": [asdict(record) for record in records]}
+        try:
+            if self.__run_blocking is not None:
+                self.__run_blocking(self.__write, path, document)
+            else:
+                self.__write(path, document)
+        except OSError as e:
+            print(f"[SoeRecorder] Error writing {path}: {e}")
+            path = None
+        self.__windows.append(SoeWindow(trigger=trigger, records=records, path=str(path) if path is not None else None))
+        print(f"[SoeRecorder] Trigger {trigger.trigger_id} ({trigger.reason}): {len(records)} edges")
+
+    @staticmethod
+    def __write(path: Path, document: dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def __records_between(self, start: float, end: float) -> tuple[SoeRecord, ...]:
+        count = self.__count
+        first = max(0, count - self.__capacity)
+        records = []
+        for seq in range(first, count):
+            slot = seq % self.__capacity
+            timestamp = self.__timestamps[slot]
+            if start <= timestamp <= end:
+                records.append(SoeRecord(
+                    seq=seq,
+                    tick=self.__ticks[slot],
+                    timestamp=timestamp,
+                    kind=IO_KINDS[self.__kinds[slot]],
+                    io_id=self.__io_ids[slot],
+                    level=bool(self.__levels[slot]),
+                ))
+        return tuple(records)
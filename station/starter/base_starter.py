@@ -1,21 +1,41 @@
 from abc import ABC, abstractmethod
 from typing import Sequence, Optional
 
+from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
 from device.base.device_status import EDeviceStatus
 from device.sensor.sensor_protocol import SensorProtocol
 from device.system.system_protocol import SystemProtocol
+from dto.application.application_dto import ApplicationDto
 from services.application.application_service_protocol import ApplicationServiceProtocol
+from services.application.events.app_config_changed_event import AppConfigChangedEvent
 from station.starter.starter_protocol import StarterProtocol
 
 
 class BaseStarter(StarterProtocol, ABC):
-    def __init__(self, app_service: ApplicationServiceProtocol, sensor: SensorProtocol, systems: Sequence[SystemProtocol]):
+    def __init__(self, app_service: ApplicationServiceProtocol, sensor: SensorProtocol, systems: Sequence[SystemProtocol], event_dispatcher: Optional[EventDispatcherProtocol] = None):
         self.__app_service = app_service
         self.__sensor = sensor
         self.__systems = systems
         self.__start_call_time = 0.0
         self.__stop_call_time = 0.0
 
+        # Settings are cached and refreshed from AppConfigChangedEvent when a dispatcher is given
+        self.__settings: Optional[ApplicationDto] = None
+        if event_dispatcher is not None:
+            self.__settings = app_service.config
+            event_dispatcher.subscribe(AppConfigChangedEvent, self.handle_app_config_changed)
+
+    def handle_app_config_changed(self, event: AppConfigChangedEvent) -> None:
+        self.__settings = event.config_new
+        # New thresholds: restart the start/stop delays from the next evaluation
+        if "level_set_point" in event.changed or "level_offset" in event.changed:
+            self.start_call_time = 0.0
+            self.stop_call_time = 0.0
+
+    @property
+    def settings(self) -> ApplicationDto:
+        return self.__settings if self.__settings is not None else self.app_service.config
+
     @property
     def app_service(self) -> ApplicationServiceProtocol:
         return self.__app_service
@@ -46,19 +66,19 @@ class BaseStarter(StarterProtocol, ABC):
 
     @property
     def set_point(self) -> float:
-        return self.app_service.level_set_point
+        return self.settings.level_set_point
 
     @property
     def offset(self) -> float:
-        return self.app_service.level_offset
+        return self.settings.level_offset
 
     @property
     def start_delay(self) -> int:
-        return self.app_service.start_pump_delay
+        return self.settings.start_pump_delay
 
     @property
     def stop_delay(self) -> int:
-        return self.app_service.stop_pump_delay
+        return self.settings.stop_pump_delay
 
     @abstractmethod
     def should_start(self) -> bool:
@@ -1,6 +1,7 @@
 import time
-from typing import Sequence
+from typing import Sequence, Optional
 
+from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
 from device.sensor.sensor_protocol import SensorProtocol
 from device.system.system_protocol import SystemProtocol
 from services.application.application_service_protocol import ApplicationServiceProtocol
@@ -8,8 +9,8 @@ from station.starter.base_starter import BaseStarter
 
 
 class IncBasicStarter(BaseStarter):
-    def __init__(self, app_service: ApplicationServiceProtocol, sensor: SensorProtocol, systems: Sequence[SystemProtocol]):
-        super().__init__(app_service, sensor, systems)
+    def __init__(self, app_service: ApplicationServiceProtocol, sensor: SensorProtocol, systems: Sequence[SystemProtocol], event_dispatcher: Optional[EventDispatcherProtocol] = None):
+        super().__init__(app_service, sensor, systems, event_dispatcher)
 
     def should_start(self) -> bool:
         call_time = time.perf_counter()
@@ -1,8 +1,6 @@
 from typing import Optional, Sequence
 import threading
 
-from sqlalchemy import false
-
 from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
 from core.thread_manager_protocol import ThreadManagerProtocol
 from device.sensor.sensor_protocol import SensorProtocol
@@ -14,6 +12,7 @@ from dto.station_dto import StationDto
 from services.application.application_service_protocol import ApplicationServiceProtocol
 from services.io.events.di_event import DIEvent
 from services.io.io_service_protocol import IOServiceProtocol
+from services.io.soe_recorder import SoeRecorder
 from station.alternatator.alternator_protocol import AlternatorProtocol
 from station.starter.starter_protocol import StarterProtocol
 from station.station_protocol import StationProtocol
@@ -32,6 +31,7 @@ class Station(StationProtocol):
             sensor_pressure: SensorProtocol,
             systems: Sequence[SystemProtocol],
             sensor_additional: Optional[SensorProtocol] = None,
+            soe: Optional[SoeRecorder] = None,
     ) -> None:
         self.__thread_manager = thread_manager
         self.__event_dispatcher = event_dispatcher
@@ -47,7 +47,10 @@ class Station(StationProtocol):
 
         self.__emergency_stop: bool = False
 
-        event_dispatcher.subscribe(DIEvent, self.handle_di_change)
+        self.__soe = soe
+        self.__fail_to_start: dict[int, bool] = {}
+
+        event_dispatcher.subscribe(DIEvent, self.handle_di_change, key=io_service.di_emergency_stop)
 
     def handle_di_change(self, event: DIEvent):
         match event.io_id:
@@ -89,28 +92,47 @@ class Station(StationProtocol):
 
     def __worker(self):
         while not self.__abort_event.is_set():
-            self.__io_service.scan()
-
-            if not self.__emergency_stop:
-                self.__alternator.alternate()
-                self.__starter.execute()
-
+            # The whole tick sees one input image; outputs are written once at its end
+            self.__io_service.begin_cycle()
+            try:
+                if not self.__emergency_stop:
+                    self.__alternator.alternate()
+                    self.__starter.execute()
+
+                self.__check_fail_to_start()
+            finally:
+                self.__io_service.end_cycle()
+
+            # Outside the cycle: neither reads inputs, and both can yield (fsync, socket emit)
+            for sys in self.systems:
+                sys.checkpoint_run_time()
             self.__emit_update()
 
             self.__abort_event.wait(0.5)
 
     def start(self):
         self.__abort_event.clear()
+        self.__io_service.run_scan()
         self.__thread_manager.start_background_task(self.__worker)
 
     def stop(self):
         self.__abort_event.set()
+        self.__io_service.stop_scan()
 
     def handle_emergency_stop(self, value: bool) -> None:
         self.__emergency_stop = value
         for sys in self.systems:
             sys.set_emergency_stop(value)
 
+    def __check_fail_to_start(self) -> None:
+        if self.__soe is None:
+            return
+        for sys in self.systems:
+            alarm = sys.alarm_fail_to_start
+            if alarm and not self.__fail_to_start.get(sys.device_id, False):
+                self.__soe.trigger(f"{sys.device_name}.fail_to_start")
+            self.__fail_to_start[sys.device_id] = alarm
+
     def __emit_update(self):
         systems_dto = [s.to_serializable() for s in self.systems]
         station_dto = StationDto(
@@ -0,0 +1,25 @@
+import threading
+
+import pytest
+
+from core.thread_manager_protocol import ThreadManagerProtocol
+
+
+class ThreadingThreadManager(ThreadManagerProtocol):
+    """Runs background tasks on daemon threads, like the threading async mode."""
+    def __init__(self):
+        self.threads: list[threading.Thread] = []
+
+    def start_background_task(self, target, *args, **kwargs):
+        thread = threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+        return thread
+
+    def run_blocking(self, target, *args, **kwargs):
+        return target(*args, **kwargs)
+
+
+@pytest.fixture
+def thread_manager() -> ThreadingThreadManager:
+    return ThreadingThreadManager()
@@ -0,0 +1,121 @@
+import threading
+import time
+
+from core.dispatcher.dispatch_pool import DispatchPool, EOverflowPolicy
+
+
+def wait_until(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+class LaneProbe:
+    """Records the runs of every key and counts runs that overlap on a key."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.runs: dict = {}
+        self.active: set = set()
+        self.overlaps = 0
+
+    def task(self, key, index: int, duration: float = 0.0) -> None:
+        with self.lock:
+            if key in self.active:
+                self.overlaps += 1
+            self.active.add(key)
+        time.sleep(duration)
+        with self.lock:
+            self.active.discard(key)
+            self.runs.setdefault(key, []).append(index)
+
+
+def test_tasks_of_a_key_run_one_at_a_time_in_submit_order(thread_manager):
+    pool = DispatchPool(thread_manager, workers=4)
+    probe = LaneProbe()
+    pool.start()
+    for index in range(50):
+        for key in ("a", "b", "c"):
+            pool.submit(probe.task, key, index, 0.0005, event_name="E", key=key)
+    assert wait_until(lambda: pool.stats.completed == 150)
+    pool.stop()
+
+    assert probe.overlaps == 0
+    assert all(runs == list(range(50)) for runs in probe.runs.values())
+
+
+def test_drop_newest_refuses_tasks_over_the_bound(thread_manager):
+    pool = DispatchPool(thread_manager, workers=1, max_queue=2, default_policy=EOverflowPolicy.DROP_NEWEST)
+    ran = []
+    assert pool.submit(ran.append, 1, event_name="E")
+    assert pool.submit(ran.append, 2, event_name="E")
+    assert not pool.submit(ran.append, 3, event_name="E")
+    pool.start()
+    assert wait_until(lambda: pool.stats.completed == 2)
+    pool.stop()
+
+    assert ran == [1, 2]
+    assert pool.stats.dropped_by_event == {"E": 1}
+
+
+def test_drop_oldest_evicts_the_oldest_task_of_the_same_event(thread_manager):
+    pool = DispatchPool(thread_manager, workers=1, max_queue=2)
+    pool.set_policy("Level", EOverflowPolicy.DROP_OLDEST)
+    ran = []
+    pool.submit(ran.append, "level 1", event_name="Level")
+    pool.submit(ran.append, "alarm", event_name="Alarm")
+    assert pool.submit(ran.append, "level 2", event_name="Level")
+    # Nothing of its own type to evict
+    assert not pool.submit(ran.append, "other", event_name="Other")
+    pool.start()
+    assert wait_until(lambda: pool.stats.completed == 2)
+    pool.stop()
+
+    assert ran == ["alarm", "level 2"]
+
+
+def test_block_submit_from_a_worker_is_queued_past_the_bound(thread_manager):
+    pool = DispatchPool(thread_manager, workers=1, max_queue=1, block_timeout=5.0)
+    ran = []
+    release = threading.Event()
+
+    def emitting_subscriber() -> None:
+        # The lane is full and this worker is the one that would drain it
+        pool.submit(release.wait, event_name="E")
+        started = time.monotonic()
+        ran.append(pool.submit(ran.append, "nested", event_name="E"))
+        ran.append(time.monotonic() - started < 1.0)
+        release.set()
+
+    pool.start()
+    pool.submit(emitting_subscriber, event_name="E")
+    assert wait_until(lambda: pool.stats.completed == 3)
+    pool.stop()
+
+    assert ran == [True, True, "nested"]
+    assert pool.stats.over_limit == 1
+
+
+def test_restart_before_the_workers_exit_keeps_one_task_per_lane(thread_manager):
+    pool = DispatchPool(thread_manager, workers=2)
+    probe = LaneProbe()
+    submitted = 0
+    for round_ in range(10):
+        pool.start()
+        for key in ("a", "b", "c"):
+            pool.submit(probe.task, key, round_, 0.002, event_name="E", key=key)
+            submitted += 1
+        pool.stop()
+    pool.start()
+    assert wait_until(lambda: pool.stats.completed == submitted)
+    # Only the last generation is left
+    assert wait_until(lambda: pool.stats.workers == 2)
+    pool.stop()
+
+    for thread in thread_manager.threads:
+        thread.join(1.0)
+    assert not any(thread.is_alive() for thread in thread_manager.threads)
+    assert probe.overlaps == 0
+    assert all(runs == list(range(10)) for runs in probe.runs.values())
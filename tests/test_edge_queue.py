@@ -0,0 +1,104 @@
+import time
+
+from services.io.edge_queue import EdgeQueue
+
+
+class Point:
+    """Sink that keeps the level of every point and records the transitions."""
+    def __init__(self):
+        self.levels: dict = {}
+        self.published: list = []
+
+    def __call__(self, key, value, tick) -> bool:
+        if self.levels.get(key, False) == value:
+            return False
+        self.levels[key] = value
+        self.published.append((key, value, tick))
+        return True
+
+
+def wait_until(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def test_without_consumer_edges_go_straight_to_the_sink(thread_manager):
+    sink = Point()
+    queue = EdgeQueue(thread_manager, sink)
+    queue.push("di_1", True, tick=7)
+    assert sink.published == [("di_1", True, 7)]
+
+
+def test_burst_within_the_window_is_one_transition(thread_manager):
+    sink = Point()
+    queue = EdgeQueue(thread_manager, sink, window=0.05)
+    queue.start()
+    try:
+        for value in (True, False, True):
+            queue.push("di_1", value)
+        assert wait_until(lambda: not queue.has_pending and queue.stats.received == 3 and sink.published)
+    finally:
+        queue.stop()
+    assert sink.published == [("di_1", True, None)]
+    assert queue.stats.coalesced == 2
+
+
+def test_chatter_that_comes_back_is_not_published(thread_manager):
+    sink = Point()
+    queue = EdgeQueue(thread_manager, sink, window=0.05)
+    queue.start()
+    try:
+        queue.push("di_1", True)
+        queue.push("di_1", False)
+        assert wait_until(lambda: queue.stats.bounced == 1)
+    finally:
+        queue.stop()
+    assert sink.published == []
+
+
+def test_debounced_point_settles_after_its_quiet_time(thread_manager):
+    sink = Point()
+    queue = EdgeQueue(thread_manager, sink, window=0.001)
+    queue.set_debounce("di_1", 0.2)
+    queue.start()
+    try:
+        queue.push("di_1", True)
+        time.sleep(0.05)
+        assert queue.is_pending("di_1") and sink.published == []
+        assert wait_until(lambda: sink.published)
+    finally:
+        queue.stop()
+    assert sink.published == [("di_1", True, None)]
+
+
+def test_stop_publishes_what_is_still_pending(thread_manager):
+    sink = Point()
+    queue = EdgeQueue(thread_manager, sink, window=10.0)
+    queue.set_debounce("di_2", 10.0)
+    queue.start()
+    queue.push("di_1", True)
+    queue.push("di_2", True)
+    queue.stop()
+    assert sorted(key for key, _, _ in sink.published) == ["di_1", "di_2"]
+
+
+def test_restart_retires_the_old_consumer(thread_manager):
+    sink = Point()
+    queue = EdgeQueue(thread_manager, sink, window=0.01)
+    for round_ in range(20):
+        queue.start()
+        queue.push(("di", round_), True)
+        queue.stop()
+    queue.start()
+    queue.push("last", True)
+    assert wait_until(lambda: ("last", True, None) in sink.published)
+    queue.stop()
+
+    assert len(sink.published) == 21
+    for thread in thread_manager.threads:
+        thread.join(1.0)
+    assert not any(thread.is_alive() for thread in thread_manager.threads)
@@ -0,0 +1,125 @@
+import dataclasses
+import threading
+import time
+
+from core.dispatcher.async_loop import AsyncLoop
+from core.dispatcher.dispatch_pool import DispatchPool
+from core.dispatcher.event_dispatcher import EventDispatcher
+
+
+@dataclasses.dataclass
+class PointEvent:
+    io_id: int
+    value: int
+
+    @property
+    def routing_key(self) -> int:
+        return self.io_id
+
+
+@dataclasses.dataclass
+class StationEvent:
+    value: int
+
+
+def wait_until(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def test_keyed_subscribers_only_get_their_routing_key(thread_manager):
+    dispatcher = EventDispatcher(thread_manager)
+    everything, point_1 = [], []
+    dispatcher.subscribe(PointEvent, everything.append)
+    dispatcher.subscribe(PointEvent, point_1.append, key=1)
+
+    dispatcher.emit(PointEvent(1, 10))
+    dispatcher.emit(PointEvent(2, 20))
+
+    assert [event.io_id for event in everything] == [1, 2]
+    assert [event.io_id for event in point_1] == [1]
+
+
+def test_unsubscribe_removes_only_that_subscription(thread_manager):
+    dispatcher = EventDispatcher(thread_manager)
+    first, second = [], []
+    dispatcher.subscribe(PointEvent, first.append, key=1)
+    dispatcher.subscribe(PointEvent, second.append, key=1)
+    dispatcher.unsubscribe(PointEvent, first.append, key=1)
+    # Not subscribed under this key: no change
+    dispatcher.unsubscribe(PointEvent, second.append, key=2)
+
+    dispatcher.emit(PointEvent(1, 10))
+
+    assert first == []
+    assert [event.value for event in second] == [10]
+
+
+def test_failing_subscriber_does_not_stop_the_others(thread_manager):
+    dispatcher = EventDispatcher(thread_manager)
+    received = []
+
+    def failing(event) -> None:
+        raise RuntimeError("boom")
+
+    dispatcher.subscribe(StationEvent, failing)
+    dispatcher.subscribe(StationEvent, received.append)
+    dispatcher.emit(StationEvent(1))
+
+    assert [event.value for event in received] == [1]
+
+
+def test_emit_batch_queues_each_point_on_its_own_lane_in_order(thread_manager):
+    pool = DispatchPool(thread_manager, workers=4)
+    dispatcher = EventDispatcher(thread_manager, pool=pool)
+    lock = threading.Lock()
+    received: dict[int, list[int]] = {}
+
+    def on_point(event: PointEvent) -> None:
+        time.sleep(0.001)
+        with lock:
+            received.setdefault(event.io_id, []).append(event.value)
+
+    dispatcher.subscribe(PointEvent, on_point)
+    pool.start()
+    for value in range(20):
+        dispatcher.emit_batch([PointEvent(io_id, value) for io_id in range(4)])
+    assert wait_until(lambda: sum(len(values) for values in received.values()) == 80)
+    pool.stop()
+
+    assert received == {io_id: list(range(20)) for io_id in range(4)}
+    # One task per point and batch, not one per batch
+    assert pool.stats.submitted == 80
+
+
+def test_coroutine_subscribers_run_with_and_without_the_loop(thread_manager):
+    received = []
+
+    async def on_station(event: StationEvent) -> None:
+        received.append((event.value, threading.get_ident()))
+
+    without_loop = EventDispatcher(thread_manager)
+    without_loop.subscribe(StationEvent, on_station)
+    without_loop.emit(StationEvent(1))
+    assert received == [(1, threading.get_ident())]
+
+    loop = AsyncLoop()
+    with_loop = EventDispatcher(thread_manager, async_loop=loop)
+    with_loop.subscribe(StationEvent, on_station)
+    loop.start()
+    try:
+        with_loop.emit(StationEvent(2))
+        assert wait_until(lambda: len(received) == 2)
+    finally:
+        with_loop.stop()
+    # Scheduled on the loop's thread
+    assert received[1][0] == 2 and received[1][1] != threading.get_ident()
+
+    # The same function unsubscribes, coroutine or not
+    with_loop.unsubscribe(StationEvent, on_station)
+    with_loop.emit(StationEvent(3))
+    assert len(received) == 2
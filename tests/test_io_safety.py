@@ -0,0 +1,155 @@
+import threading
+from typing import Callable, Optional
+
+from core.dispatcher.event_dispatcher import EventDispatcher
+from services.io.events.di_event import DIEvent
+from services.io.events.io_change_set import IOChangeSet
+from services.io.io_service import IOService
+from services.io.modules.di_module_protocol import DIModuleProtocol
+from services.io.modules.digital_module_protocol import EdgeCallback
+from services.io.modules.do_module_protocol import DOModuleProtocol
+
+ESTOP = 0
+PUMP = 0
+
+
+class FakeDigital:
+    def __init__(self, count: int = 2):
+        self.values = [False] * count
+        self.__callback: Optional[EdgeCallback] = None
+
+    @property
+    def callback(self) -> Optional[EdgeCallback]:
+        return self.__callback
+
+    @callback.setter
+    def callback(self, value: Optional[EdgeCallback]) -> None:
+        self.__callback = value
+
+    def initialize(self) -> None:
+        pass
+
+    def cleanup(self) -> None:
+        pass
+
+    def is_managed_pos(self, io_pos: int) -> bool:
+        return 0 <= io_pos < len(self.values)
+
+    @property
+    def io_count(self) -> int:
+        return len(self.values)
+
+    def get_value(self, pos: int) -> Optional[bool]:
+        return self.values[pos]
+
+    def get_all_values(self) -> list[bool]:
+        return list(self.values)
+
+
+class FakeDI(FakeDigital, DIModuleProtocol):
+    """Inputs whose level is set by the test; edge() also reports it like a GPIO callback."""
+    def __init__(self, count: int = 2):
+        super().__init__(count)
+        # Called in the middle of get_all_values(), after the levels were read
+        self.during_read: Optional[Callable[[], None]] = None
+
+    def get_all_values(self) -> list[bool]:
+        values = super().get_all_values()
+        if self.during_read is not None:
+            self.during_read()
+        return values
+
+    def edge(self, pos: int, value: bool) -> None:
+        self.values[pos] = value
+        self.callback(pos, value, None)
+
+
+class FakeDO(FakeDigital, DOModuleProtocol):
+    def set_value(self, do_pos: int, value: bool) -> None:
+        self.values[do_pos] = value
+
+
+class Station:
+    """IOService with one e-stop safety input whose subscriber stops the pump output."""
+    def __init__(self, thread_manager):
+        self.dispatcher = EventDispatcher(thread_manager)
+        self.di = FakeDI()
+        self.do = FakeDO()
+        self.io = IOService(self.dispatcher, di_modules=[self.di], do_modules=[self.do], thread_manager=thread_manager)
+        self.io.set_safety("di", ESTOP)
+        self.io.scan()
+        self.estop_events: list[tuple[bool, int]] = []
+        self.change_sets: list[IOChangeSet] = []
+        self.dispatcher.subscribe(DIEvent, self.on_estop, key=ESTOP)
+        self.dispatcher.subscribe(IOChangeSet, self.change_sets.append)
+
+    def on_estop(self, event: DIEvent) -> None:
+        self.estop_events.append((event.value_new, threading.get_ident()))
+        if event.value_new:
+            self.io.set_digital_output_value(PUMP, False)
+
+
+def test_safety_edge_is_handled_before_the_callback_returns(thread_manager):
+    station = Station(thread_manager)
+    station.do.values[PUMP] = True
+    # The first scan delivered the e-stop's initial level, without writes
+    edges = station.io.get_safety_stats().edges
+
+    station.di.edge(ESTOP, True)
+
+    assert station.estop_events == [(True, threading.get_ident())]
+    assert station.do.values[PUMP] is False
+    stats = station.io.get_safety_stats()
+    assert (stats.edges - edges, stats.writes, stats.samples) == (1, 1, 1)
+
+
+def test_safety_change_found_by_a_scan_is_delivered_synchronously(thread_manager):
+    station = Station(thread_manager)
+    station.do.values[PUMP] = True
+
+    # Missed callback: only the scan sees the new level
+    station.di.values[ESTOP] = True
+    station.io.scan()
+
+    assert station.estop_events == [(True, threading.get_ident())]
+    assert station.do.values[PUMP] is False
+    assert station.io.get_digital_input_value(ESTOP) is True
+
+
+def test_scan_read_older_than_a_safety_edge_does_not_undo_it(thread_manager):
+    station = Station(thread_manager)
+
+    # The edge comes in while the scan is reading the module: the read has the old level
+    station.di.during_read = lambda: station.di.edge(ESTOP, True)
+    station.io.scan()
+    station.di.during_read = None
+
+    assert station.io.get_digital_input_value(ESTOP) is True
+    assert station.estop_events == [(True, threading.get_ident())]
+
+    # A read started after the edge is not held: the release is found by the scan
+    station.di.values[ESTOP] = False
+    station.io.scan()
+    assert station.io.get_digital_input_value(ESTOP) is False
+    assert [value for value, _ in station.estop_events] == [True, False]
+
+
+def test_cycle_does_not_commit_an_output_the_safety_path_wrote(thread_manager):
+    station = Station(thread_manager)
+
+    station.io.begin_cycle()
+    station.io.set_digital_output_value(PUMP, True)
+    station.di.edge(ESTOP, True)
+    station.io.end_cycle()
+
+    assert station.do.values[PUMP] is False
+
+
+def test_safety_change_set_still_reaches_observers(thread_manager):
+    station = Station(thread_manager)
+
+    station.di.edge(ESTOP, True)
+    for thread in thread_manager.threads:
+        thread.join(1.0)
+
+    assert [change_set.di[0].value_new for change_set in station.change_sets] == [True]
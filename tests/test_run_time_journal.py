@@ -0,0 +1,94 @@
+import os
+
+from services.device.run_time_journal import RunTimeJournal
+
+
+def open_journal(directory, **kwargs) -> RunTimeJournal:
+    return RunTimeJournal(directory, checkpoint_interval=0.0, **kwargs)
+
+
+def test_stopped_runs_survive_reload(tmp_path):
+    journal = open_journal(tmp_path)
+    journal.record_stop("pump_1", 10.0)
+    assert journal.record_stop("pump_1", 5.0) == 15.0
+    journal.close()
+
+    reloaded = open_journal(tmp_path)
+    assert reloaded.get_total("pump_1") == 15.0
+    assert reloaded.get_last("pump_1") == 5.0
+
+
+def test_power_cut_closes_the_run_at_its_last_checkpoint(tmp_path):
+    journal = open_journal(tmp_path)
+    journal.record_stop("pump_1", 10.0)
+    journal.checkpoint("pump_1", 3.0)
+    journal.checkpoint("pump_1", 7.0)
+    journal.close()
+
+    reloaded = open_journal(tmp_path)
+    assert reloaded.get_total("pump_1") == 17.0
+    assert reloaded.get_last("pump_1") == 7.0
+
+    # Folded once: the next boot does not add it again
+    reloaded.close()
+    assert open_journal(tmp_path).get_total("pump_1") == 17.0
+
+
+def test_reset_total_drops_the_open_run(tmp_path):
+    journal = open_journal(tmp_path)
+    journal.record_stop("pump_1", 10.0)
+    journal.checkpoint("pump_1", 30.0)
+    journal.set_times("pump_1", total=0.0)
+    journal.close()
+
+    assert open_journal(tmp_path).get_total("pump_1") == 0.0
+
+
+def test_corrupt_tail_is_discarded(tmp_path):
+    journal = open_journal(tmp_path)
+    journal.record_stop("pump_1", 10.0)
+    journal.record_stop("pump_1", 5.0)
+    journal.close()
+
+    path = tmp_path / "run_times.journal"
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    path.write_text(lines[0] + lines[1][:-8] + "\n", encoding="utf-8")
+
+    assert open_journal(tmp_path).get_total("pump_1") == 10.0
+
+
+def test_compaction_keeps_totals_and_empties_the_journal(tmp_path):
+    journal = open_journal(tmp_path, compact_after=3)
+    for _ in range(3):
+        journal.record_stop("pump_1", 2.0)
+    assert (tmp_path / "run_times.journal").read_text(encoding="utf-8") == ""
+    journal.record_stop("pump_2", 4.0)
+    journal.close()
+
+    reloaded = open_journal(tmp_path)
+    assert reloaded.get_total("pump_1") == 6.0
+    assert reloaded.get_total("pump_2") == 4.0
+
+
+def test_clean_boot_does_not_compact(tmp_path):
+    open_journal(tmp_path).close()
+    assert not (tmp_path / "run_times.snapshot.json").exists()
+
+
+def test_every_fsync_goes_through_run_blocking(tmp_path, monkeypatch):
+    blocking = []
+
+    def run_blocking(target, *args):
+        blocking.append(target)
+        return target(*args)
+
+    fsyncs = []
+    monkeypatch.setattr(os, "fsync", lambda fd: fsyncs.append(fd))
+    journal = open_journal(tmp_path, run_blocking=run_blocking)
+    journal.record_stop("pump_1", 10.0)
+    journal.compact()
+    journal.close()
+
+    # The append, the snapshot and the journal truncate
+    assert len(fsyncs) == 3
+    assert len(blocking) == 3
@@ -10,4 +10,9 @@ class EAppEvents(str, Enum):
 
     SYSTEM_SET_MODE = "system:set_mode"
 
-    SENSOR_SET_CONFIG = "sensor:set_config"
\ No newline at end of file
+    SENSOR_SET_CONFIG = "sensor:set_config"
+
+    SOE_QUERY = "soe:query"
+
+    DISPATCHER_METRICS = "dispatcher:metrics"
+    DISPATCHER_SET_METRICS = "dispatcher:set_metrics"
@@ -0,0 +1,100 @@
+from typing import Optional
+
+from flask import Flask, Response
+from flask_socketio import SocketIO
+
+from common import utils
+from core.dispatcher.dispatch_pool import DispatchPoolStats
+from core.dispatcher.dispatcher_metrics import DispatcherMetrics, HistogramSnapshot
+from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
+from dto.diagnostics.dispatcher_metrics_dto import DispatcherMetricsDto, EventMetricsDto, SubscriberMetricsDto, HistogramDto, DispatchPoolDto
+from dto.string_dto import StringDto
+from web.events.app_events import EAppEvents
+from web.handlers.base_handler import BaseHandler
+
+
+class DiagnosticsHandler(BaseHandler):
+    """Dispatcher metrics over Socket.IO and as plain text on GET /metrics."""
+    def __init__(self, dispatcher: EventDispatcherProtocol, socketio: SocketIO, flask_app: Flask):
+        super().__init__(dispatcher, socketio)
+        self.__flask_app = flask_app
+
+    @property
+    def metrics(self) -> Optional[DispatcherMetrics]:
+        return self.dispatcher.get_metrics()
+
+    def register(self):
+        self.socketio.on_event(EAppEvents.DISPATCHER_METRICS, self.handle_metrics)
+        self.socketio.on_event(EAppEvents.DISPATCHER_SET_METRICS, self.handle_set_metrics)
+        self.__flask_app.add_url_rule("/metrics", "metrics", self.handle_metrics_text)
+
+    @BaseHandler.safe(error_message="Error reading the dispatcher metrics.")
+    def handle_metrics(self, data=None):
+        if self.metrics is None:
+            return self.fail(StringDto("Dispatcher metrics are not available."))
+        return self.ok(self.to_dto(self.metrics, self.dispatcher.get_dispatch_stats()))
+
+    @BaseHandler.safe(error_message="Error configuring the dispatcher metrics.")
+    def handle_set_metrics(self, data):
+        """{"enabled": bool, "slow_threshold_ms": n, "reset": bool}, every key optional."""
+        if self.metrics is None:
+            return self.fail(StringDto("Dispatcher metrics are not available."))
+        data = data or {}
+        if data.get("enabled") is not None:
+            self.metrics.enabled = utils.get_bool(data, "enabled")
+        if data.get("slow_threshold_ms") is not None:
+            self.metrics.slow_threshold = float(data["slow_threshold_ms"]) / 1000.0
+        if data.get("reset"):
+            self.metrics.reset()
+        return self.ok(self.to_dto(self.metrics, self.dispatcher.get_dispatch_stats()))
+
+    def handle_metrics_text(self):
+        if self.metrics is None:
+            return Response("dispatcher metrics are not available\n", status=404, mimetype="text/plain")
+        return Response(self.metrics.to_text(), mimetype="text/plain; version=0.0.4")
+
+    @staticmethod
+    def to_dto(metrics: DispatcherMetrics, pool: Optional[DispatchPoolStats] = None) -> DispatcherMetricsDto:
+        snapshot = metrics.snapshot()
+        return DispatcherMetricsDto(
+            enabled=snapshot.enabled,
+            slow_threshold_ms=snapshot.slow_threshold_ms,
+            sample_every=snapshot.sample_every,
+            events=[
+                EventMetricsDto(event_name=e.event_name, emitted=e.emitted, errors=e.errors, wait=DiagnosticsHandler.histogram_dto(e.wait))
+                for e in snapshot.events
+            ],
+            subscribers=[
+                SubscriberMetricsDto(
+                    event_name=s.event_name,
+                    subscriber=s.subscriber,
+                    samples=s.samples,
+                    errors=s.errors,
+                    slow_calls=s.slow_calls,
+                    slow=s.slow,
+                    run=DiagnosticsHandler.histogram_dto(s.run),
+                )
+                for s in snapshot.subscribers
+            ],
+            pool=DispatchPoolDto(
+                workers=pool.workers,
+                queue_depth=pool.queue_depth,
+                max_queue_depth=pool.max_queue_depth,
+                lane_depths=list(pool.lane_depths),
+                max_lag_ms=pool.max_lag_ms,
+                submitted=pool.submitted,
+                completed=pool.completed,
+                dropped=pool.dropped,
+                dropped_by_event=dict(pool.dropped_by_event),
+            ) if pool is not None else None,
+        )
+
+    @staticmethod
+    def histogram_dto(histogram: HistogramSnapshot) -> HistogramDto:
+        return HistogramDto(
+            buckets_ms=[bound if bound != float("inf") else None for bound in histogram.buckets],
+            counts=list(histogram.counts),
+            count=histogram.count,
+            avg_ms=histogram.avg_ms,
+            max_ms=histogram.max_ms,
+        )
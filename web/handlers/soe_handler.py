@@ -0,0 +1,53 @@
+from dataclasses import asdict
+
+from flask_socketio import SocketIO
+
+from common import utils
+from core.dispatcher.event_dispatcher_protocol import EventDispatcherProtocol
+from dto.io.soe_dto import SoeWindowDto, SoeRecordDto
+from dto.string_dto import StringDto
+from services.io.soe_recorder import SoeRecorder, SoeWindow
+from web.events.app_events import EAppEvents
+from web.handlers.base_handler import BaseHandler
+
+
+class SoeHandler(BaseHandler):
+    def __init__(self, dispatcher: EventDispatcherProtocol, socketio: SocketIO, recorder: SoeRecorder):
+        super().__init__(dispatcher, socketio)
+        self.__recorder = recorder
+
+    @property
+    def recorder(self) -> SoeRecorder:
+        return self.__recorder
+
+    def register(self):
+        self.socketio.on_event(EAppEvents.SOE_QUERY, self.handle_query)
+
+    @BaseHandler.safe(error_message="Error querying the sequence of events.")
+    def handle_query(self, data):
+        """
+        {"trigger_id": n} returns the saved window of trigger n (latest if omitted);
+        {"around": wall time, "pre": s, "post": s} returns what the ring still holds.
+        """
+        data = data or {}
+        if data.get("around") is not None:
+            pre = float(data["pre"]) if data.get("pre") is not None else None
+            post = float(data["post"]) if data.get("post") is not None else None
+            window = self.recorder.window(float(data["around"]), pre, post)
+        else:
+            trigger_id = utils.get_int(data, "trigger_id") if data.get("trigger_id") is not None else None
+            window = self.recorder.query(trigger_id)
+            if window is None:
+                return self.fail(StringDto("No sequence of events recorded."))
+        return self.ok(self.to_dto(window))
+
+    @staticmethod
+    def to_dto(window: SoeWindow) -> SoeWindowDto:
+        trigger = window.trigger
+        return SoeWindowDto(
+            trigger_id=trigger.trigger_id if trigger is not None else None,
+            reason=trigger.reason if trigger is not None else None,
+            timestamp=trigger.timestamp if trigger is not None else None,
+            records=[SoeRecordDto(**asdict(record)) for record in window.records],
+            path=window.path,
+        )